@@ -0,0 +1,360 @@
+# device_host.py
+# Host nhiều thiết bị: MỖI thiết bị một worker process (capture + dò ô đổi + resize + encode JPEG),
+# front-end asyncio (server.py) chỉ fan-out. Thêm thiết bị = thêm process => encode dàn ra nhiều core.
+# - Worker -> front-end: frame đã encode ghi vào FrameRing (shared memory), pipe chỉ mang metadata
+# - Front-end gửi thẳng memoryview của slot ra WebSocket (không copy), gửi xong mới trả slot
+# - Giao thức pipe (tuple pickle nhỏ):
+#     front -> worker: ("render", req_id, codec, scale, quality, base) | ("input", req_id, [InputEvent]) | ("stop",)
+#     worker -> front: ("frame", seq, captured_at, (w, h), frames_captured, grabbed_at)
+#                      ("rendered", req_id, result, encode_s)
+#                      ("applied", req_id, applied_at | None)   None: source không nhận input / lỗi
+#       result: None | ("slot", slot, nbytes, seq, captured_at, scale) | ("inline", data, seq, captured_at, scale)
+#
+#   python backend/device/server.py --multiprocess --source synthetic
+
+import asyncio
+import itertools
+import multiprocessing as mp
+import signal
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from frame_source import source_factory
+from input_channel import InputEvent
+from shm_ring import FrameRing
+from stream_hub import (
+    BaseDeviceStream, Frame, Rendition, StreamHub, Viewer, choose_scale, render_job,
+)
+from tile_codec import DEFAULT_TILE
+
+_ctx = mp.get_context("spawn")  # không fork process đang chạy event loop + thread pool
+
+
+# --------------------------- Worker process ---------------------------
+
+def worker_main(device_id: str, source_name: str, source_opts: dict, ring_name: str, slots: int,
+                slot_size: int, conn, tile: int):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C do front-end xử lý rồi gửi "stop"
+    source = source_factory(source_name, **source_opts)(device_id)
+    ring = FrameRing.attach(ring_name, slots, slot_size)
+    asyncio.run(source.start())
+
+    full = Rendition(1.0, tile)
+    renditions: Dict[float, Rendition] = {1.0: full}
+    interval = 1.0 / source.fps
+    next_at = last_at = time.monotonic()
+    seq = captured = 0
+
+    def capture():
+        nonlocal seq, captured
+        grabbed_at = time.time()
+        pixels = np.asarray(source.grab().convert("RGB"))
+        captured_at = time.time()
+        captured += 1
+        if full.tracker.update(pixels, seq + 1):
+            seq += 1
+            full.latest = Frame(seq, captured_at, pixels)
+            conn.send(("frame", seq, captured_at, full.tracker.size, captured, grabbed_at))
+        # Rendition không ai xin trong 5 s thì bỏ
+        cutoff = time.monotonic() - 5.0
+        for s in [s for s, r in renditions.items() if r is not full and r.used_at < cutoff]:
+            del renditions[s]
+
+    def render(req_id, codec, scale, quality, base):
+        if full.latest is None:
+            conn.send(("rendered", req_id, None, 0.0))
+            return
+        t0 = time.perf_counter()
+        rend = renditions.get(scale)
+        if rend is None:
+            rend = renditions[scale] = Rendition(scale, tile)
+        frame = rend.update(full.latest)
+        job = render_job(rend, codec, quality, base)
+        if job is None:
+            conn.send(("rendered", req_id, None, 0.0))
+            return
+        data = job[1]()
+        meta = (frame.seq, frame.captured_at, frame.scale)
+        slot = ring.acquire() if len(data) <= ring.slot_size else None
+        if slot is None:
+            result = ("inline", data, *meta)  # ring đầy / frame quá lớn: chậm hơn nhưng không mất frame
+        else:
+            ring.write(slot, data)
+            result = ("slot", slot, len(data), *meta)
+        conn.send(("rendered", req_id, result, time.perf_counter() - t0))
+
+    def apply_input(req_id, events):
+        nonlocal next_at
+        applied_at = None
+        if source.supports_input:
+            try:
+                source.inject(events)
+                applied_at = time.time()
+                # Chụp sớm để thấy phản hồi (như FrameSource.expedite, tối đa gấp đôi fps)
+                next_at = min(next_at, max(last_at + 0.5 * interval, time.monotonic()))
+            except Exception:
+                pass
+        conn.send(("applied", req_id, applied_at))
+
+    try:
+        while True:
+            now = time.monotonic()
+            if now >= next_at:
+                next_at = max(next_at + interval, now)
+                last_at = now
+                capture()
+            # Xử lý yêu cầu render tới giờ chụp khung kế tiếp
+            while conn.poll(max(0.0, next_at - time.monotonic())):
+                msg = conn.recv()
+                if msg[0] == "stop":
+                    return
+                if msg[0] == "render":
+                    render(*msg[1:])
+                elif msg[0] == "input":
+                    apply_input(*msg[1:])
+                if time.monotonic() >= next_at:
+                    break
+    except (EOFError, BrokenPipeError):
+        pass  # front-end đã đóng pipe
+    finally:
+        asyncio.run(source.close())
+        ring.close()
+
+
+# --------------------------- Front-end ---------------------------
+
+class _Render:
+    """
+    Một yêu cầu render gửi sang worker (dùng chung cho mọi viewer cùng key).
+    Slot ring chỉ được trả khi: không còn trong cache (đã có frame mới), không viewer nào
+    đang chờ kết quả, và mọi lần gửi memoryview của slot đã xong.
+    """
+
+    __slots__ = ("fut", "slot", "cached", "waiters", "refs")
+
+    def __init__(self, fut: asyncio.Future):
+        self.fut = fut
+        self.slot: Optional[int] = None
+        self.cached = True
+        self.waiters = 0
+        self.refs = 0
+
+
+class ProcessDeviceStream(BaseDeviceStream):
+    """Cùng interface với DeviceStream, nhưng capture/encode chạy ở worker process riêng."""
+
+    RESTART_DELAY = 1.0
+
+    def __init__(self, device_id: str, source_name: str, source_opts: dict, quality: int = 70,
+                 idle_timeout: float = 10.0, tile: int = DEFAULT_TILE, slots: int = 32, slot_size: int = 2 << 20):
+        super().__init__(device_id, quality, idle_timeout, tile)
+        self.source_name = source_name
+        self.source_opts = source_opts
+        self.slots = slots
+        self.slot_size = slot_size
+        self.restarts = 0
+        self._latest: Optional[Frame] = None
+        self._size: Optional[Tuple[int, int]] = None
+        self._ring: Optional[FrameRing] = None
+        self._conn = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, _Render] = {}  # req_id -> render chờ worker trả lời
+        self._renders: Dict[tuple, _Render] = {}  # cache theo key, chỉ cho frame mới nhất
+        self._out: Dict[int, Tuple[memoryview, _Render]] = {}  # id(view) -> (view, render) đang gửi
+        self._applying: Dict[int, asyncio.Future] = {}  # req_id -> Future[applied_at | None]
+
+    @property
+    def latest(self) -> Optional[Frame]:
+        return self._latest
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        return self._size
+
+    async def _run(self):
+        while await self._wait_for_viewers():
+            exitcode = await self._run_worker()
+            if exitcode == 0:
+                return  # dừng vì hết người xem
+            if not self.viewers:
+                continue
+            # Worker chết khi vẫn còn người xem: dựng lại (thiết bị rớt kết nối, source lỗi...)
+            self.restarts += 1
+            await asyncio.sleep(self.RESTART_DELAY)
+
+    async def _run_worker(self) -> Optional[int]:
+        loop = asyncio.get_running_loop()
+        ring = FrameRing.create(self.slots, self.slot_size)
+        conn, child = _ctx.Pipe()
+        proc = _ctx.Process(
+            target=worker_main, name=f"device-worker:{self.device_id}", daemon=True,
+            args=(self.device_id, self.source_name, self.source_opts, ring.name, self.slots, self.slot_size,
+                  child, self.tile),
+        )
+        proc.start()
+        child.close()
+        self._ring, self._conn = ring, conn
+        loop.add_reader(conn.fileno(), self._on_readable)
+        companions = self._start_companions()
+        try:
+            while proc.is_alive():
+                if not self.viewers and not await self._wait_for_viewers():
+                    conn.send(("stop",))
+                    break
+                await asyncio.sleep(0.25)
+            await loop.run_in_executor(None, proc.join, 5.0)
+            return proc.exitcode
+        finally:
+            self._stop_companions(companions)
+            loop.remove_reader(conn.fileno())
+            if proc.is_alive():
+                proc.kill()
+            self._reset()
+            conn.close()
+            try:
+                ring.close()
+            except BufferError:
+                ring.shm.unlink()  # còn view chưa nhả: ít nhất không để rò segment
+            self._ring = self._conn = None
+            self._latest = None  # seq của worker mới bắt đầu lại từ 1
+            for v in self.viewers:
+                v.base, v.scale_sent = 0, None
+
+    def _reset(self):
+        for r in self._pending.values():
+            if not r.fut.done():
+                r.fut.set_result(None)
+        self._pending.clear()
+        for fut in self._applying.values():
+            if not fut.done():
+                fut.set_result(None)
+        self._applying.clear()
+        self._drop_renders()
+        for view, _ in self._out.values():
+            try:
+                view.release()
+            except BufferError:
+                pass  # đang nằm trong một lần gửi bị huỷ dở
+        self._out.clear()
+
+    def _on_readable(self):
+        try:
+            while self._conn.poll():
+                self._on_message(self._conn.recv())
+        except (EOFError, OSError):
+            asyncio.get_running_loop().remove_reader(self._conn.fileno())
+
+    def _on_message(self, msg):
+        kind = msg[0]
+        if kind == "frame":
+            _, seq, captured_at, size, captured, grabbed_at = msg
+            self._seq = seq
+            self._size = size
+            self.frames_captured = captured
+            self._latest = Frame(seq, captured_at, None)
+            self._drop_renders()
+            self._publish(self._latest, grabbed_at)
+        elif kind == "applied":
+            _, req_id, applied_at = msg
+            fut = self._applying.pop(req_id, None)
+            if fut is not None and not fut.done():
+                fut.set_result(applied_at)
+        elif kind == "rendered":
+            _, req_id, result, encode_s = msg
+            r = self._pending.pop(req_id, None)
+            if result is None:
+                value = None
+            elif result[0] == "inline":
+                _, data, seq, captured_at, scale = result
+                value = (Frame(seq, captured_at, None, scale), data)
+            else:
+                _, slot, nbytes, seq, captured_at, scale = result
+                value = (Frame(seq, captured_at, None, scale), nbytes)
+                if r is None:
+                    self._ring.release(slot)  # yêu cầu đã bị huỷ (worker restart...)
+                else:
+                    r.slot = slot
+            if result is not None:
+                self.frames_encoded += 1
+                self.encode_s += encode_s
+            if r is not None and not r.fut.done():
+                r.fut.set_result(value)
+                # Render của frame đã cũ mà không ai chờ nữa -> trả slot luôn
+                self._maybe_free(r)
+
+    def _drop_renders(self):
+        # Frame mới: bỏ cache render cũ. Render còn viewer chờ / đang gửi vẫn giữ slot tới khi xong
+        for r in self._renders.values():
+            r.cached = False
+            self._maybe_free(r)
+        self._renders.clear()
+
+    def _maybe_free(self, r: _Render):
+        if r.slot is not None and not r.cached and not r.waiters and not r.refs:
+            if self._ring is not None:
+                self._ring.release(r.slot)
+            r.slot = None
+
+    async def _apply_input(self, events: List[InputEvent]) -> Optional[float]:
+        if self._conn is None:
+            return None
+        req_id = next(self._ids)
+        fut = self._applying[req_id] = asyncio.get_running_loop().create_future()
+        self._conn.send(("input", req_id, events))
+        return await fut
+
+    async def render(self, viewer: Viewer):
+        full = self._latest
+        if full is None or full.seq <= viewer.base or self._conn is None:
+            return None
+        scale = choose_scale(self._size, viewer)
+        base = viewer.base if viewer.scale_sent == scale else 0
+        key = (viewer.codec, scale, viewer.quality, full.seq, base)
+        r = self._renders.get(key)
+        if r is None:
+            req_id = next(self._ids)
+            r = self._renders[key] = self._pending[req_id] = _Render(asyncio.get_running_loop().create_future())
+            self._conn.send(("render", req_id, viewer.codec, scale, viewer.quality, base))
+        r.waiters += 1
+        try:
+            value = await asyncio.shield(r.fut)
+        finally:
+            r.waiters -= 1
+        if value is None or r.slot is None:
+            self._maybe_free(r)
+            return value  # None hoặc (frame, bytes) gửi inline
+        frame, nbytes = value
+        r.refs += 1
+        view = self._ring.view(r.slot, nbytes)
+        self._out[id(view)] = (view, r)
+        return frame, view
+
+    def release(self, data):
+        entry = self._out.pop(id(data), None)
+        if entry is not None:
+            view, r = entry
+            view.release()
+            r.refs -= 1
+            self._maybe_free(r)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "worker_restarts": self.restarts,
+                "slots_sending": len({r.slot for _, r in self._out.values()})}
+
+
+class ProcessStreamHub(StreamHub):
+    """StreamHub với mỗi thiết bị là một worker process. Source phải tạo được từ tên + options (pickle được)."""
+
+    def __init__(self, source_name: str, source_opts: Optional[dict] = None, slots: int = 32,
+                 slot_size: int = 2 << 20, **kwargs):
+        self.source_name = source_name
+        self.source_opts = source_opts or {}
+        self.slots = slots
+        self.slot_size = slot_size
+        super().__init__(source_factory(source_name, **self.source_opts), **kwargs)
+
+    def _new_stream(self, device_id: str) -> BaseDeviceStream:
+        return ProcessDeviceStream(device_id, self.source_name, self.source_opts, self.quality, self.idle_timeout,
+                                   self.tile, self.slots, self.slot_size)
@@ -0,0 +1,211 @@
+# frame_source.py
+# Nguồn khung hình cho device stream server (đứng thay điện thoại thật khi dev/test)
+# - FrameSource: interface chung — read() trả PIL.Image RGB, tự giữ nhịp theo fps
+# - SyntheticSource: màn hình điện thoại giả (status bar + đồng hồ + khối chuyển động)
+# - ScreenCaptureSource: chụp màn hình máy local bằng PIL.ImageGrab (cần display)
+# - FakeDeviceSource: SyntheticSource nhận được input (tap/vuốt/phím, xem input_channel.py) và
+#   vẽ lại phản hồi lên màn hình — đứng thay điện thoại thật khi test kênh điều khiển
+# Thêm nguồn mới: subclass FrameSource, cài grab() (+ inject() nếu điều khiển được), rồi register_source("tên", cls)
+
+import abc
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+if TYPE_CHECKING:
+    from input_channel import InputEvent
+
+
+class FrameSource(abc.ABC):
+    """
+    Một thiết bị = một FrameSource. grab() là hàm blocking (chụp/vẽ 1 khung),
+    read() chạy grab() trên thread pool và chờ đủ 1/fps giữa hai khung.
+    Nguồn điều khiển được (supports_input) cài inject(): blocking, áp lô InputEvent theo đúng thứ tự.
+    """
+
+    supports_input = False
+
+    def __init__(self, device_id: str, fps: float = 15.0):
+        self.device_id = device_id
+        self.fps = fps
+        self._next_at = 0.0
+        self._last_at = 0.0
+        self.grabbed_at = 0.0  # time.time() lúc bắt đầu chụp khung gần nhất
+        self._expedite = asyncio.Event()
+
+    async def start(self):
+        self._next_at = time.monotonic()
+
+    async def close(self):
+        pass
+
+    @abc.abstractmethod
+    def grab(self) -> Image.Image:
+        """Chụp một khung (blocking, chạy trên thread)."""
+
+    def inject(self, events: List["InputEvent"]):
+        raise NotImplementedError(f"{type(self).__name__} không nhận input")
+
+    def expedite(self):
+        """Vừa áp input: chụp khung kế tiếp sớm (tối đa gấp đôi fps) để thấy phản hồi nhanh hơn."""
+        self._next_at = min(self._next_at, max(self._last_at + 0.5 / self.fps, time.monotonic()))
+        self._expedite.set()
+
+    async def read(self) -> Image.Image:
+        while (delay := self._next_at - time.monotonic()) > 0:
+            self._expedite.clear()
+            try:
+                await asyncio.wait_for(self._expedite.wait(), delay)
+            except asyncio.TimeoutError:
+                break
+        # Encode/gửi chậm hơn fps thì không dồn khung để "đuổi" — nhịp mới tính từ bây giờ
+        self._last_at = time.monotonic()
+        self._next_at = max(self._next_at + 1.0 / self.fps, self._last_at)
+        self.grabbed_at = time.time()
+        return await asyncio.to_thread(self.grab)
+
+
+class SyntheticSource(FrameSource):
+    """Màn hình giả kích thước size. animate=False: chỉ đồng hồ status bar đổi (màn hình tĩnh)."""
+
+    BG = (15, 23, 42)
+    BAR = (2, 6, 23)
+    ACCENT = (34, 211, 238)
+
+    def __init__(self, device_id: str, fps: float = 15.0, size: Tuple[int, int] = (360, 640), animate: bool = True):
+        super().__init__(device_id, fps)
+        self.size = size
+        self.animate = animate
+        self._font = ImageFont.load_default()
+        self._n = 0
+
+    def grab(self) -> Image.Image:
+        w, h = self.size
+        img = Image.new("RGB", self.size, self.BG)
+        draw = ImageDraw.Draw(img)
+
+        # Status bar
+        draw.rectangle([0, 0, w, 24], fill=self.BAR)
+        draw.text((10, 6), time.strftime("%H:%M:%S"), fill=(148, 163, 184), font=self._font)
+        draw.text((w - 80, 6), self.device_id[:12], fill=(148, 163, 184), font=self._font)
+
+        # Nội dung tĩnh: vài "thẻ" giống danh sách app
+        for i in range(6):
+            y = 48 + i * 70
+            draw.rounded_rectangle([16, y, w - 16, y + 56], radius=10, fill=(30, 41, 59))
+            draw.text((32, y + 20), f"Item {i + 1}", fill=(226, 232, 240), font=self._font)
+
+        if self.animate:
+            # Khối chạy ngang + số khung: có vùng đổi liên tục mỗi khung
+            x = int((self._n * 6) % max(1, w - 40))
+            draw.ellipse([x, h - 120, x + 40, h - 80], fill=self.ACCENT)
+            draw.text((16, h - 40), f"frame {self._n}", fill=(226, 232, 240), font=self._font)
+        self._n += 1
+        return img
+
+
+class FakeDeviceSource(SyntheticSource):
+    """
+    Điện thoại giả điều khiển được: vệt ngón tay khi chạm/vuốt, thẻ được tap sáng lên,
+    phím gõ hiện ở ô nhập. log giữ mọi sự kiện đã áp (theo thứ tự) để test kiểm tra.
+    """
+
+    supports_input = True
+    KEYS = {62: " ", 66: "\n", 67: "\b"}  # Android KEYCODE_SPACE / ENTER / DEL
+    KEYS.update({29 + i: chr(ord("a") + i) for i in range(26)})
+    KEYS.update({7 + i: str(i) for i in range(10)})
+
+    def __init__(self, device_id: str, fps: float = 15.0, size: Tuple[int, int] = (360, 640), animate: bool = False):
+        super().__init__(device_id, fps, size, animate)
+        self.log: List["InputEvent"] = []
+        self._lock = threading.Lock()
+        self._touches: Dict[int, List[Tuple[int, int]]] = {}  # ngón đang chạm -> vệt
+        self._selected: Optional[int] = None
+        self._text = ""
+
+    def inject(self, events: List["InputEvent"]):
+        from input_channel import DOWN, KEY, KEY_UP, MOVE, TAP, UP
+        with self._lock:
+            for e in events:
+                self.log.append(e)
+                if e.kind == KEY:
+                    if e.pointer != KEY_UP:
+                        ch = self.KEYS.get(e.code, "")
+                        self._text = self._text[:-1] if ch == "\b" else (self._text + ch)[-40:]
+                    continue
+                x, y = e.position(self.size)
+                if e.kind == DOWN:
+                    self._touches[e.pointer] = [(x, y)]
+                elif e.kind == MOVE:
+                    self._touches.setdefault(e.pointer, []).append((x, y))
+                elif e.kind == UP:
+                    self._touches.pop(e.pointer, None)
+                if e.kind in (TAP, UP):
+                    hit = (y - 48) // 70
+                    self._selected = hit if 0 <= hit < 6 and (y - 48) % 70 <= 56 else None
+
+    def grab(self) -> Image.Image:
+        img = super().grab()
+        w, h = self.size
+        draw = ImageDraw.Draw(img)
+        with self._lock:
+            if self._selected is not None:
+                y = 48 + self._selected * 70
+                draw.rounded_rectangle([16, y, w - 16, y + 56], radius=10, outline=self.ACCENT, width=3)
+            draw.rectangle([16, h - 70, w - 16, h - 50], fill=(30, 41, 59))
+            draw.text((22, h - 66), self._text.replace("\n", " ")[-(w // 7):], fill=(226, 232, 240), font=self._font)
+            for trail in self._touches.values():
+                if len(trail) > 1:
+                    draw.line(trail[-32:], fill=self.ACCENT, width=4)
+                x, y = trail[-1]
+                draw.ellipse([x - 14, y - 14, x + 14, y + 14], outline=self.ACCENT, width=3)
+        return img
+
+
+class ScreenCaptureSource(FrameSource):
+    """Chụp màn hình local, thu nhỏ về tối đa max_size (giữ tỉ lệ)."""
+
+    def __init__(self, device_id: str, fps: float = 10.0, max_size: Tuple[int, int] = (720, 1280), bbox=None):
+        super().__init__(device_id, fps)
+        self.max_size = max_size
+        self.bbox = bbox
+
+    def grab(self) -> Image.Image:
+        from PIL import ImageGrab  # chỉ khi thật sự dùng (Linux cần X11/xdisplay)
+        img = ImageGrab.grab(bbox=self.bbox).convert("RGB")
+        img.thumbnail(self.max_size)
+        return img
+
+
+# --------------------------- Registry ---------------------------
+
+SOURCES: Dict[str, Callable[..., FrameSource]] = {
+    "synthetic": SyntheticSource,
+    "static": lambda device_id, **kw: SyntheticSource(device_id, animate=False, **kw),
+    "screen": ScreenCaptureSource,
+    "fake": FakeDeviceSource,
+}
+
+
+def register_source(name: str, factory: Callable[..., FrameSource]):
+    SOURCES[name] = factory
+
+
+def source_factory(name: str, **options) -> Callable[[str], FrameSource]:
+    """device_id -> FrameSource mới, dùng cho StreamHub."""
+    try:
+        factory = SOURCES[name]
+    except KeyError:
+        raise ValueError(f"Không có frame source '{name}' (có: {', '.join(SOURCES)})") from None
+    return lambda device_id: factory(device_id, **options)
+
+
+def parse_size(text: Optional[str]) -> Optional[Tuple[int, int]]:
+    """'360x640' -> (360, 640)"""
+    if not text:
+        return None
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
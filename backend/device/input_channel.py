@@ -0,0 +1,188 @@
+# input_channel.py
+# Kênh điều khiển thiết bị (tap / vuốt / phím) đi chung WebSocket của Device View
+# - Client gửi message BINARY, mỗi message là một lô sự kiện (gom theo requestAnimationFrame)
+# - InputQueue: hàng đợi MỘT cho mỗi thiết bị -> mọi viewer vào chung một thứ tự;
+#   MOVE liên tiếp của cùng một ngón trong hàng đợi được gộp (chỉ giữ vị trí mới nhất)
+# - InputLatency: đo input -> frame đầu tiên được chụp SAU khi input đã áp vào thiết bị
+#
+# Message (little-endian):
+#   0  4s  magic b"DVI1"
+#   4  u16 count      6 u16 (dự phòng)
+#   8  count x 16 byte:
+#        u8 kind   u8 pointer (ngón tay; KEY: action)   u16 x   u16 y   (chuẩn hoá 0..65535 theo màn hình)
+#        u16 code (KEY: Android keycode)   u32 id (client tự tăng)   u32 t (ms đồng hồ client, để client tự đo)
+# Vuốt = DOWN, MOVE..., UP. TAP = DOWN + UP tại một điểm. Toạ độ chuẩn hoá nên không phụ thuộc
+# scale frame client đang nhận (xem stream_hub.SCALES).
+#
+# Server trả text JSON sau frame đầu tiên phản ánh lô input của viewer:
+#   {"type": "input", "id": <id cuối của lô>, "t": <t của nó>, "seq": <frame>, "ms": <server nhận -> chụp>}
+# client lấy (đồng hồ hiện tại - t) khi vẽ xong frame đó = độ trễ input -> màn hình trọn vòng.
+
+import asyncio
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+MAGIC = b"DVI1"
+HEADER = struct.Struct("<4sHxx")
+EVENT = struct.Struct("<BBHHHII")
+
+DOWN, MOVE, UP, TAP, KEY = 1, 2, 3, 4, 5
+KINDS = {DOWN: "down", MOVE: "move", UP: "up", TAP: "tap", KEY: "key"}
+KEY_PRESS, KEY_DOWN, KEY_UP = 0, 1, 2  # pointer của sự kiện KEY
+MAX_BATCH = 256
+
+
+@dataclass
+class InputEvent:
+    kind: int
+    pointer: int
+    x: int
+    y: int
+    code: int = 0
+    id: int = 0
+    t: int = 0
+    received_at: float = 0.0  # time.time() lúc server nhận (không đi trên dây)
+
+    def position(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """Toạ độ pixel trên màn hình (width, height) của thiết bị."""
+        w, h = size
+        return round(self.x * (w - 1) / 0xFFFF), round(self.y * (h - 1) / 0xFFFF)
+
+
+def encode_batch(events: List[InputEvent]) -> bytes:
+    out = bytearray(HEADER.pack(MAGIC, len(events)))
+    for e in events:
+        out += EVENT.pack(e.kind, e.pointer, e.x, e.y, e.code, e.id & 0xFFFFFFFF, e.t & 0xFFFFFFFF)
+    return bytes(out)
+
+
+def decode_batch(data: bytes) -> List[InputEvent]:
+    if len(data) < HEADER.size:
+        raise ValueError("message input quá ngắn")
+    magic, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("không phải message input (DVI1)")
+    if count > MAX_BATCH or len(data) != HEADER.size + count * EVENT.size:
+        raise ValueError("độ dài message input không khớp count")
+    now = time.time()
+    events = []
+    for fields in EVENT.iter_unpack(memoryview(data)[HEADER.size:]):
+        e = InputEvent(*fields, received_at=now)
+        if e.kind not in KINDS:
+            raise ValueError(f"loại sự kiện lạ: {e.kind}")
+        events.append(e)
+    return events
+
+
+class InputQueue:
+    """
+    Thứ tự input của MỘT thiết bị. Phần tử: (viewer, event).
+    Chỉ gộp MOVE với phần tử CUỐI hàng đợi (cùng viewer, cùng ngón) nên không bao giờ đảo thứ tự
+    với DOWN/UP/KEY: thiết bị chậm chỉ bỏ các vị trí trung gian của đường vuốt.
+    """
+
+    def __init__(self, limit: int = 1024):
+        self.limit = limit
+        self._items: Deque[Tuple[object, InputEvent]] = deque()
+        self._ready = asyncio.Event()
+        self.received = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, viewer, events: List[InputEvent]):
+        for e in events:
+            self.received += 1
+            if e.kind == MOVE and self._items:
+                last_viewer, last = self._items[-1]
+                if last_viewer is viewer and last.kind == MOVE and last.pointer == e.pointer:
+                    # giữ received_at của MOVE cũ: độ trễ tính từ lúc ngón tay bắt đầu chờ
+                    e.received_at = last.received_at
+                    self._items[-1] = (viewer, e)
+                    self.coalesced += 1
+                    continue
+            if len(self._items) >= self.limit:
+                self._items.popleft()  # thiết bị treo: bỏ input cũ nhất thay vì phình bộ nhớ
+                self.dropped += 1
+            self._items.append((viewer, e))
+        if self._items:
+            self._ready.set()
+
+    async def get_batch(self) -> List[Tuple[object, InputEvent]]:
+        """Chờ tới khi có input rồi lấy HẾT (một lần áp vào thiết bị)."""
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        items = list(self._items)
+        self._items.clear()
+        return items
+
+    def clear(self):
+        self._items.clear()
+
+
+class InputLatency:
+    """
+    Ghép input đã áp vào thiết bị với frame đầu tiên bắt đầu chụp SAU thời điểm áp.
+    Input không làm đổi màn hình thì không có frame mới -> quá TIMEOUT giây thì bỏ (no_effect).
+    """
+
+    WINDOW = 256
+    TIMEOUT = 5.0
+
+    def __init__(self):
+        self._waiting: List[Tuple[object, InputEvent, float]] = []  # (viewer, event cuối của lô, applied_at)
+        self._ms: Deque[float] = deque(maxlen=self.WINDOW)
+        self.applied = 0
+        self.no_effect = 0
+
+    def applied_batch(self, batch: List[Tuple[object, InputEvent]], applied_at: float):
+        self.expire(applied_at)
+        self.applied += len(batch)
+        last = {}
+        for viewer, e in batch:
+            last[viewer] = e
+        self._waiting.extend((v, e, applied_at) for v, e in last.items())
+
+    def on_frame(self, seq: int, grabbed_at: float) -> List[Tuple[object, dict]]:
+        """Frame `seq` bắt đầu chụp lúc grabbed_at -> [(viewer, note JSON)] cho các input nó phản ánh."""
+        if not self._waiting:
+            return []
+        notes, still = {}, []
+        for viewer, e, applied_at in self._waiting:
+            if applied_at <= grabbed_at:
+                ms = (grabbed_at - e.received_at) * 1000
+                self._ms.append(ms)
+                # Một note/viewer/frame: id cuối cùng đã bao hàm các lô trước của viewer đó
+                notes[viewer] = {"type": "input", "id": e.id, "t": e.t, "seq": seq, "ms": round(ms, 1)}
+            else:
+                still.append((viewer, e, applied_at))
+        self._waiting = still
+        return list(notes.items())
+
+    def expire(self, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        n = len(self._waiting)
+        self._waiting = [w for w in self._waiting if now - w[2] <= self.TIMEOUT]
+        self.no_effect += n - len(self._waiting)
+
+    def forget(self, viewer):
+        self._waiting = [w for w in self._waiting if w[0] is not viewer]
+
+    def stats(self) -> dict:
+        self.expire()
+        lat = sorted(self._ms)
+        return {
+            "applied": self.applied,
+            "no_effect": self.no_effect,
+            "input_to_frame_ms": {
+                "p50": round(lat[len(lat) // 2], 1),
+                "p95": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))], 1),
+                "max": round(lat[-1], 1),
+            } if lat else None,
+        }
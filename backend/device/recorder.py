@@ -0,0 +1,224 @@
+# recorder.py
+# Ghi lại phiên xem thiết bị để xem lại sau (không phải chụp lại thiết bị)
+# - Recorder: MỘT thread ghi nền + hàng đợi có giới hạn. Event loop chỉ put_nowait: đĩa chậm
+#   thì bỏ frame (đếm dropped), fan-out cho viewer không bao giờ phải chờ
+# - Mỗi thiết bị một thư mục, cắt segment theo thời gian:
+#     <root>/<device>/seg-<epoch_ms>.mjpeg   các JPEG nối tiếp (ffplay -f mjpeg đọc được)
+#     <root>/<device>/seg-<epoch_ms>.idx     bản ghi cố định INDEX (captured_at f64, offset u64, length u32)
+# - RecordingReader: chọn segment theo tên, tìm frame theo timestamp bằng bisect trên .idx
+#   (đọc ~log2(n) bản ghi 20 byte rồi seek thẳng tới offset, không quét file .mjpeg)
+#
+#   python backend/device/server.py --record recordings --segment-seconds 60
+
+import bisect
+import os
+import queue
+import re
+import struct
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+INDEX = struct.Struct("<dQI")
+_CLOSE = object()
+
+
+def device_dir(root: str, device_id: str) -> str:
+    """Thư mục của thiết bị, luôn là thư mục con trực tiếp của root; id không hợp lệ -> ValueError."""
+    if not isinstance(device_id, str) or not device_id:
+        raise ValueError("deviceId phải là chuỗi khác rỗng")
+    name = re.sub(r"[^\w.-]", "_", device_id)
+    if not name.strip("."):
+        raise ValueError(f"deviceId không hợp lệ: {device_id!r}")  # "." / ".." trỏ ra ngoài root
+    base = os.path.realpath(root)
+    folder = os.path.realpath(os.path.join(base, name))
+    if os.path.dirname(folder) != base:
+        raise ValueError(f"deviceId không hợp lệ: {device_id!r}")  # symlink trỏ ra ngoài root
+    return folder
+
+
+class _Segment:
+    def __init__(self, folder: str, start: float):
+        self.start = start
+        base = os.path.join(folder, f"seg-{int(start * 1000)}")
+        self.data = open(base + ".mjpeg", "ab")
+        self.index = open(base + ".idx", "ab")
+        self.offset = self.data.tell()
+
+    def write(self, captured_at: float, data: bytes):
+        self.data.write(data)
+        # Index ghi SAU dữ liệu: crash giữa chừng thì index chỉ thiếu frame cuối, không trỏ vào rác
+        self.index.write(INDEX.pack(captured_at, self.offset, len(data)))
+        self.offset += len(data)
+
+    def flush(self):
+        self.data.flush()
+        self.index.flush()
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+
+class Recorder:
+    """Thread ghi nền dùng chung cho mọi thiết bị của hub."""
+
+    def __init__(self, root: str, segment_seconds: float = 60.0, max_queue: int = 256):
+        self.root = root
+        self.segment_seconds = segment_seconds
+        self.frames = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue: "queue.Queue" = queue.Queue(max_queue)
+        self._segments: Dict[str, _Segment] = {}
+        self._thread = threading.Thread(target=self._run, name="device-recorder", daemon=True)
+        self._thread.start()
+
+    # ---- phía event loop (không bao giờ chờ) ----
+    def put(self, device_id: str, captured_at: float, data: bytes) -> bool:
+        try:
+            self._queue.put_nowait((device_id, captured_at, data))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def end(self, device_id: str):
+        """Thiết bị dừng stream: đóng segment đang mở (lần sau mở segment mới)."""
+        try:
+            self._queue.put_nowait((device_id, _CLOSE, None))
+        except queue.Full:
+            pass  # segment sẽ được đóng khi cắt theo thời gian hoặc khi close()
+
+    def close(self, timeout: float = 5.0):
+        """Blocking: ghi nốt hàng đợi rồi đóng file (gọi qua to_thread từ event loop)."""
+        self._queue.put((None, _CLOSE, None))
+        self._thread.join(timeout)
+
+    # ---- thread ghi ----
+    def _run(self):
+        while True:
+            device_id, captured_at, data = self._queue.get()
+            try:
+                if device_id is None:
+                    break
+                if captured_at is _CLOSE:
+                    seg = self._segments.pop(device_id, None)
+                    if seg:
+                        seg.close()
+                    continue
+                self._write(device_id, captured_at, data)
+            except Exception:
+                # đĩa đầy / mất quyền / deviceId không hợp lệ: bỏ frame, thread ghi và live vẫn chạy
+                self.errors += 1
+            if self._queue.empty():
+                for seg in self._segments.values():
+                    seg.flush()
+        for seg in self._segments.values():
+            seg.close()
+        self._segments.clear()
+
+    def _write(self, device_id: str, captured_at: float, data: bytes):
+        seg = self._segments.get(device_id)
+        if seg is not None and captured_at - seg.start >= self.segment_seconds:
+            seg.close()
+            seg = None
+        if seg is None:
+            folder = device_dir(self.root, device_id)
+            os.makedirs(folder, exist_ok=True)
+            seg = self._segments[device_id] = _Segment(folder, captured_at)
+        seg.write(captured_at, data)
+        self.frames += 1
+        self.bytes += len(data)
+
+    def stats(self) -> dict:
+        return {
+            "root": self.root,
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queued": self._queue.qsize(),
+            "open_segments": len(self._segments),
+        }
+
+
+class _IndexTimes:
+    """Dãy captured_at của một file .idx, đọc từng bản ghi khi bisect cần (không nạp cả file)."""
+
+    def __init__(self, f):
+        self.f = f
+        self.n = os.fstat(f.fileno()).st_size // INDEX.size  # bỏ bản ghi cuối nếu ghi dở
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i: int) -> float:
+        return self.record(i)[0]
+
+    def record(self, i: int) -> Tuple[float, int, int]:
+        self.f.seek(i * INDEX.size)
+        return INDEX.unpack(self.f.read(INDEX.size))
+
+
+class RecordingReader:
+    """Đọc bản ghi của một thiết bị. Frame = (captured_at, jpeg bytes)."""
+
+    def __init__(self, root: str, device_id: str):
+        self.folder = device_dir(root, device_id)
+
+    def segments(self) -> List[Tuple[float, str]]:
+        """[(start, đường dẫn không đuôi)] tăng dần theo start."""
+        try:
+            names = os.listdir(self.folder)
+        except FileNotFoundError:
+            return []
+        out = []
+        for name in names:
+            m = re.fullmatch(r"seg-(\d+)\.idx", name)
+            if m:
+                out.append((int(m.group(1)) / 1000, os.path.join(self.folder, name[:-4])))
+        return sorted(out)
+
+    def describe(self) -> List[dict]:
+        """Tóm tắt từng segment (chỉ stat file, không đọc nội dung)."""
+        return [{
+            "start": start,
+            "frames": os.path.getsize(base + ".idx") // INDEX.size,
+            "bytes": os.path.getsize(base + ".mjpeg"),
+        } for start, base in self.segments()]
+
+    def frame_at(self, ts: float) -> Optional[Tuple[float, bytes]]:
+        """Frame đang hiển thị tại thời điểm ts (frame cuối có captured_at <= ts)."""
+        segs = self.segments()
+        i = bisect.bisect_right([start for start, _ in segs], ts) - 1
+        # ts rơi vào trước frame đầu của segment (start làm tròn ms) -> lùi về segment trước
+        while i >= 0:
+            found = self._lookup(segs[i][1], ts)
+            if found is not None:
+                return found
+            i -= 1
+        return None
+
+    def iter_from(self, ts: float) -> Iterator[Tuple[float, bytes]]:
+        """Các frame từ ts trở đi, qua nhiều segment."""
+        segs = self.segments()
+        i = max(0, bisect.bisect_right([start for start, _ in segs], ts) - 1)
+        for _, base in segs[i:]:
+            with open(base + ".idx", "rb") as idx, open(base + ".mjpeg", "rb") as data:
+                times = _IndexTimes(idx)
+                for k in range(bisect.bisect_left(times, ts), len(times)):
+                    captured_at, offset, length = times.record(k)
+                    data.seek(offset)
+                    yield captured_at, data.read(length)
+
+    def _lookup(self, base: str, ts: float) -> Optional[Tuple[float, bytes]]:
+        with open(base + ".idx", "rb") as idx:
+            times = _IndexTimes(idx)
+            k = bisect.bisect_right(times, ts) - 1
+            if k < 0:
+                return None
+            captured_at, offset, length = times.record(k)
+        with open(base + ".mjpeg", "rb") as data:
+            data.seek(offset)
+            return captured_at, data.read(length)
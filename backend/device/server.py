@@ -0,0 +1,226 @@
+# server.py
+# Device stream server cho component DevicePreview (Test_device_ui.txt)
+#   POST /api/device/connect   body (tuỳ chọn): {"deviceId": "R3CN1234"}
+#        -> {"sessionId": "...", "viewerWsUrl": "ws://host/ws/device/<sessionId>"}
+#   WS   /ws/device/<sessionId> -> mỗi message binary là một JPEG
+#        ?ack=N: client gửi text "ack" sau mỗi frame đã vẽ, server giữ tối đa N frame chưa ack
+#        (viewer chậm bị bỏ frame cũ, độ trễ không tăng dần)
+#        ?codec=tiles: message DVT1 chỉ chứa các ô đã đổi (xem tile_codec.py); mặc định jpeg
+#        ?vw=&vh=: kích thước canvas (px thiết bị) -> server thu nhỏ vừa đủ; ?kbps=: bitrate mục tiêu
+#        text JSON {"type": "viewport", "width", "height"} / {"type": "bitrate", "kbps"} để đổi giữa chừng;
+#        {"type": "keyframe"}: client vẽ hỏng frame, xin frame đầy đủ ở lần gửi sau
+#        message BINARY từ client = lô input DVI1 (tap/vuốt/phím, xem input_channel.py); server gửi
+#        lại text {"type": "input", "id", "t", "seq", "ms"} ngay sau frame đầu tiên phản ánh lô đó
+#   GET  /api/device/stats     -> session, frame encode, sent/dropped + độ trễ từng viewer
+#   GET  /api/device/recordings/<deviceId>             -> các segment đã ghi (khi chạy với --record)
+#   GET  /api/device/recordings/<deviceId>/frame?at=ts -> JPEG đang hiển thị lúc ts (epoch giây)
+#
+#   python backend/device/server.py --source synthetic --fps 15
+#   python backend/device/server.py --source screen --port 8000
+#   python backend/device/server.py --source fake     # thiết bị giả nhận input, để thử kênh điều khiển
+#   python backend/device/server.py --multiprocess   # mỗi thiết bị một worker process (device_host.py)
+#   python backend/device/server.py --record recordings   # ghi phiên ra segment MJPEG (recorder.py)
+# pip install fastapi uvicorn pillow
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import JSONResponse, Response
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from frame_source import SOURCES, parse_size, source_factory
+from input_channel import decode_batch
+from recorder import Recorder, RecordingReader
+from stream_hub import CODECS, StreamHub, Viewer
+from tile_codec import DEFAULT_TILE
+
+
+# adb serial / "ip:port" / tên tự đặt; không nhận id toàn dấu chấm (dùng làm tên thư mục ghi phiên)
+DEVICE_ID_RE = re.compile(r"(?!\.+$)[\w.:-]{1,64}")
+
+
+def apply_control(viewer: Viewer, text: str):
+    """Message điều khiển dạng JSON từ client; message lạ/hỏng thì bỏ qua."""
+    try:
+        msg = json.loads(text)
+        kind = msg.get("type")
+        if kind == "viewport":
+            w, h = int(msg["width"]), int(msg["height"])
+            viewer.viewport = (w, h) if w > 0 and h > 0 else None
+        elif kind == "bitrate":
+            viewer.target_kbps = float(msg["kbps"]) if msg.get("kbps") else None
+        elif kind == "keyframe":
+            # client vẽ hỏng một frame: lần gửi sau là frame đầy đủ thay vì phần chênh
+            viewer.base, viewer.scale_sent = 0, None
+    except (ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+
+def create_app(hub: StreamHub) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await hub.close()
+
+    app = FastAPI(title="Device stream", lifespan=lifespan)
+    app.state.hub = hub
+
+    @app.post("/api/device/connect")
+    async def connect(request: Request):
+        body = await request.body()
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return JSONResponse({"error": "body không phải JSON"}, status_code=400)
+        if not isinstance(payload, dict):
+            return JSONResponse({"error": "body phải là object JSON"}, status_code=400)
+        device_id = payload.get("deviceId")
+        if device_id is not None and not (isinstance(device_id, str) and DEVICE_ID_RE.fullmatch(device_id)):
+            return JSONResponse({"error": "deviceId không hợp lệ (chuỗi [A-Za-z0-9_.:-], tối đa 64 ký tự)"},
+                                status_code=400)
+        session = hub.create_session(device_id)
+        scheme = "wss" if request.url.scheme == "https" else "ws"
+        return {
+            "sessionId": session.session_id,
+            "deviceId": session.device_id,
+            "viewerWsUrl": f"{scheme}://{request.url.netloc}/ws/device/{session.session_id}",
+        }
+
+    @app.get("/api/device/stats")
+    async def stats():
+        return hub.stats()
+
+    @app.get("/api/device/recordings/{device_id}")
+    async def recordings(device_id: str):
+        if hub.recorder is None:
+            return JSONResponse({"error": "server không bật ghi phiên (--record)"}, status_code=404)
+        try:
+            reader = RecordingReader(hub.recorder.root, device_id)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return {"segments": await asyncio.to_thread(reader.describe)}
+
+    @app.get("/api/device/recordings/{device_id}/frame")
+    async def recorded_frame(device_id: str, at: float):
+        if hub.recorder is None:
+            return JSONResponse({"error": "server không bật ghi phiên (--record)"}, status_code=404)
+        try:
+            reader = RecordingReader(hub.recorder.root, device_id)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        found = await asyncio.to_thread(reader.frame_at, at)
+        if found is None:
+            return JSONResponse({"error": "không có frame trước thời điểm này"}, status_code=404)
+        captured_at, data = found
+        return Response(data, media_type="image/jpeg", headers={"X-Captured-At": f"{captured_at:.3f}"})
+
+    @app.websocket("/ws/device/{session_id}")
+    async def viewer_ws(ws: WebSocket, session_id: str):
+        session = hub.session(session_id)
+        if session is None:
+            await ws.close(code=4404)
+            return
+        q = ws.query_params
+        codec = q.get("codec", "jpeg")
+        try:
+            window = max(0, int(q.get("ack", 0)))
+            viewport = (int(q["vw"]), int(q["vh"])) if "vw" in q and "vh" in q else None
+            target_kbps = float(q["kbps"]) if q.get("kbps") else None
+        except ValueError:
+            codec = None
+        if codec not in CODECS:
+            await ws.close(code=4400)
+            return
+        await ws.accept()
+        viewer = Viewer(window, codec, viewport, target_kbps, hub.quality)
+        stream = hub.attach(session, viewer)
+
+        async def send_loop():
+            while True:
+                await viewer.get()
+                rendered = await stream.render(viewer)
+                if rendered is None:
+                    continue
+                frame, data = rendered
+                nbytes = len(data)
+                try:
+                    await ws.send_bytes(data)
+                finally:
+                    stream.release(data)
+                viewer.mark_sent(frame, nbytes)
+                viewer.adapt()
+                for note in viewer.take_input_notes(frame.seq):
+                    await ws.send_text(json.dumps(note))
+
+        async def recv_loop():
+            # Đọc cả khi client không gửi gì: để biết khi nào nó đóng kết nối
+            while True:
+                msg = await ws.receive()
+                if msg["type"] == "websocket.disconnect":
+                    return
+                data = msg.get("bytes")
+                if data:
+                    try:
+                        stream.send_input(viewer, decode_batch(data))
+                    except ValueError:
+                        pass  # lô hỏng: bỏ cả lô, không áp một nửa
+                    continue
+                text = msg.get("text")
+                if text == "ack":
+                    viewer.ack()
+                elif text:
+                    apply_control(viewer, text)
+
+        tasks = [asyncio.create_task(send_loop()), asyncio.create_task(recv_loop())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            hub.detach(session, viewer)
+
+    return app
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Device stream server (JPEG qua WebSocket)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--source", default="synthetic", choices=sorted(SOURCES))
+    ap.add_argument("--fps", type=float, default=15.0)
+    ap.add_argument("--size", help="kích thước màn hình giả, vd 360x640 (synthetic/static/fake)")
+    ap.add_argument("--quality", type=int, default=70, help="JPEG quality")
+    ap.add_argument("--tile", type=int, default=DEFAULT_TILE, help="cạnh ô (px) cho codec tiles, nên là bội của 16")
+    ap.add_argument("--device", default="local", help="deviceId mặc định khi client không gửi")
+    ap.add_argument("--multiprocess", action="store_true",
+                    help="mỗi thiết bị một worker process, frame qua shared memory (nhiều thiết bị, nhiều core)")
+    ap.add_argument("--slot-size", type=int, default=2 << 20, help="byte tối đa mỗi frame trong shared memory")
+    ap.add_argument("--record", metavar="DIR", help="ghi mọi phiên xem vào DIR (segment MJPEG + index)")
+    ap.add_argument("--segment-seconds", type=float, default=60.0, help="độ dài mỗi segment ghi phiên")
+    args = ap.parse_args(argv)
+
+    options = {"fps": args.fps}
+    if args.size and args.source in ("synthetic", "static", "fake"):
+        options["size"] = parse_size(args.size)
+    common = {"default_device": args.device, "quality": args.quality, "tile": args.tile}
+    if args.record:
+        common["recorder"] = Recorder(args.record, args.segment_seconds)
+    if args.multiprocess:
+        from device_host import ProcessStreamHub
+        hub = ProcessStreamHub(args.source, options, slot_size=args.slot_size, **common)
+    else:
+        hub = StreamHub(source_factory(args.source, **options), **common)
+
+    import uvicorn
+    uvicorn.run(create_app(hub), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# shm_ring.py
+# Ring các slot cố định trong MỘT segment multiprocessing.shared_memory, để worker process
+# (capture + encode) trao frame đã encode cho front-end asyncio mà không pickle qua pipe.
+#
+# Layout: [state: 1 byte/slot][đệm tới bội 64][slot 0][slot 1]...  (mỗi slot slot_size byte)
+#   state 0 = trống, 1 = worker đã ghi và front-end đang giữ.
+# Worker chỉ đổi 0 -> 1 (acquire), front-end chỉ đổi 1 -> 0 (release) => không cần lock
+# giữa hai process. Độ dài payload đi kèm message trên pipe, không nằm trong segment.
+
+from multiprocessing import shared_memory
+from typing import Optional
+
+
+class FrameRing:
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, slot_size: int, owner: bool):
+        self.shm = shm
+        self.slots = slots
+        self.slot_size = slot_size
+        self.owner = owner
+        self._data_at = (slots + 63) // 64 * 64
+        self._cursor = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, slots: int = 32, slot_size: int = 2 << 20) -> "FrameRing":
+        """Front-end tạo (và unlink khi close). Trang nhớ chỉ thật sự cấp khi slot được ghi."""
+        header = (slots + 63) // 64 * 64
+        shm = shared_memory.SharedMemory(create=True, size=header + slots * slot_size)
+        shm.buf[:slots] = bytes(slots)
+        return cls(shm, slots, slot_size, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, slots: int, slot_size: int) -> "FrameRing":
+        # Worker (spawn) dùng chung resource_tracker với front-end nên đăng ký lại ở đây vô hại;
+        # segment chỉ bị unlink bởi front-end (owner)
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, slots, slot_size, owner=False)
+
+    # ---- phía worker ----
+    def acquire(self) -> Optional[int]:
+        """Slot trống tiếp theo (vòng tròn) và đánh dấu đã dùng; None nếu front-end đang giữ hết."""
+        state = self.shm.buf
+        for i in range(self.slots):
+            slot = (self._cursor + i) % self.slots
+            if state[slot] == 0:
+                state[slot] = 1
+                self._cursor = slot + 1
+                return slot
+        return None
+
+    def write(self, slot: int, data: bytes):
+        off = self._data_at + slot * self.slot_size
+        self.shm.buf[off:off + len(data)] = data
+
+    # ---- phía front-end ----
+    def view(self, slot: int, nbytes: int) -> memoryview:
+        """memoryview trỏ thẳng vào slot (không copy). Phải release() view trước khi close ring."""
+        off = self._data_at + slot * self.slot_size
+        return self.shm.buf[off:off + nbytes]
+
+    def release(self, slot: int):
+        self.shm.buf[slot] = 0
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
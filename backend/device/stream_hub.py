@@ -0,0 +1,611 @@
+# stream_hub.py
+# Lõi của device stream server (không phụ thuộc web framework)
+# - DeviceStream: MỘT vòng capture cho mỗi thiết bị; bản encode được cache theo
+#   (codec, seq, base) nên mọi viewer cùng trạng thái dùng chung 1 lần encode
+# - codec "jpeg": nguyên khung JPEG (client cũ); "tiles": chỉ các ô đã đổi (tile_codec.py).
+#   Màn hình đứng yên -> không có frame mới -> không encode, không gửi gì
+# - Mỗi viewer có viewport + bitrate mục tiêu: chọn mức thu nhỏ (SCALES) và JPEG quality
+#   (QUALITIES) theo thông lượng đo được; rendition thu nhỏ được dựng lười, dùng chung
+#   giữa các viewer, cache encode theo (codec, scale, quality, seq, base)
+# - Mỗi viewer có mailbox 1 slot (Viewer): viewer chậm bị bỏ frame cũ thay vì dồn hàng đợi;
+#   client gửi "ack" thì số frame trên đường truyền cũng bị giới hạn (độ trễ bị chặn)
+# - Vòng lặp chạy khi có viewer, dừng (đóng source) sau idle_timeout giây không còn ai xem
+# - Input (input_channel.py): mọi viewer của một thiết bị vào chung InputQueue, một task áp
+#   lần lượt từng lô vào source; frame đầu tiên chụp sau đó báo lại độ trễ cho viewer đã gửi
+# - Ghi phiên (recorder.py, tuỳ chọn): một viewer "ngầm" codec jpeg nhận frame như mọi viewer
+#   (mailbox 1 slot, không giữ thiết bị chạy) và đẩy bản encode sang thread ghi nền
+# - StreamHub: session (POST /api/device/connect) -> device_id -> DeviceStream
+
+import abc
+import asyncio
+import io
+import logging
+import secrets
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from PIL import Image
+
+from frame_source import FrameSource
+from input_channel import DOWN, UP, InputEvent, InputLatency, InputQueue
+from recorder import Recorder
+from tile_codec import DEFAULT_TILE, TileTracker, encode_tiles
+
+CODECS = ("jpeg", "tiles")
+log = logging.getLogger("device-stream")
+
+SCALES = (1.0, 0.75, 0.5, 0.375, 0.25)  # giảm dần; viewer cùng bucket dùng chung rendition
+QUALITIES = (35, 50, 65, 80)
+ADAPT_INTERVAL = 1.0  # s giữa hai lần chỉnh quality/scale của một viewer
+
+
+def encode_jpeg(img: Image.Image, quality: int = 70) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+@dataclass(frozen=True)
+class Frame:
+    seq: int
+    captured_at: float  # time.time() lúc chụp
+    pixels: Optional[np.ndarray]  # HxWx3 uint8; None ở front-end của device_host (pixel nằm bên worker)
+    scale: float = 1.0  # so với khung gốc của thiết bị
+
+
+class Viewer:
+    """
+    Một kết nối WebSocket, nhận frame qua mailbox 1 slot: push() khi frame trước chưa gửi
+    thì ghi đè (đếm dropped) -> viewer chậm chỉ nhận frame mới nhất, không dồn backlog.
+
+    window > 0 (client gửi "ack" sau mỗi frame đã vẽ): chỉ cho tối đa window frame chưa ack
+    trên đường truyền. Không có ack thì buffer TCP (vài MB) vẫn có thể giữ hàng chục frame cũ,
+    nên độ trễ glass-to-glass chỉ thật sự bị chặn khi client ack. latency_ms khi đó là
+    capture -> client vẽ xong; không ack thì là capture -> ghi xong vào socket.
+
+    viewport (px thiết bị của canvas) + target_kbps: adapt() mỗi ADAPT_INTERVAL giây so bitrate
+    đã gửi và tỉ lệ frame bị bỏ: nghẽn / vượt mục tiêu -> hạ quality rồi mới hạ độ phân giải;
+    còn dư -> nâng độ phân giải về mức hợp viewport rồi mới nâng quality.
+    """
+
+    LATENCY_WINDOW = 256
+
+    def __init__(self, window: int = 0, codec: str = "jpeg", viewport: Optional[Tuple[int, int]] = None,
+                 target_kbps: Optional[float] = None, quality: int = 70):
+        self.window = window
+        self.codec = codec
+        self.viewport = viewport
+        self.target_kbps = target_kbps
+        self.q_idx = min(range(len(QUALITIES)), key=lambda i: abs(QUALITIES[i] - quality))
+        self.extra_down = 0  # số bậc SCALES hạ thêm so với mức hợp viewport
+        self.base = 0  # seq của frame gần nhất đã gửi (codec tiles gửi phần chênh so với base)
+        self.scale_sent = None  # scale của frame gần nhất đã gửi; đổi scale -> gửi lại keyframe
+        self.kbps = 0.0
+        self._adapt_at = time.monotonic()
+        self._adapt_snap = (0, 0, 0)  # (bytes_sent, sent, dropped) lúc adapt lần trước
+        self._slot: Optional[Frame] = None
+        self._ready = asyncio.Event()
+        self._in_flight: Deque[Frame] = deque()
+        self._credit = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+        self._latency: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+        self.pointers_down: Set[int] = set()  # ngón đang chạm (viewer rời đi giữa chừng -> nhấc hộ)
+        self._input_notes: List[Tuple[int, dict]] = []  # (seq frame, note JSON) chờ gửi kèm frame
+
+    def push(self, frame: Frame):
+        if self._slot is not None:
+            self.dropped += 1
+        self._slot = frame
+        self._ready.set()
+
+    async def get(self) -> Frame:
+        # Chờ credit TRƯỚC rồi mới lấy mailbox: frame lấy ra là frame mới nhất tại lúc được phép gửi
+        while self.window and len(self._in_flight) >= self.window:
+            self._credit.clear()
+            await self._credit.wait()
+        await self._ready.wait()
+        self._ready.clear()
+        frame, self._slot = self._slot, None
+        return frame
+
+    @property
+    def quality(self) -> int:
+        return QUALITIES[self.q_idx]
+
+    def mark_sent(self, frame: Frame, nbytes: int):
+        self.sent += 1
+        self.bytes_sent += nbytes
+        self.base = frame.seq
+        self.scale_sent = frame.scale
+        if self.window:
+            self._in_flight.append(frame)
+        else:
+            self._latency.append(time.time() - frame.captured_at)
+
+    def adapt(self):
+        now = time.monotonic()
+        dt = now - self._adapt_at
+        if dt < ADAPT_INTERVAL:
+            return
+        nbytes, sent, dropped = (a - b for a, b in zip((self.bytes_sent, self.sent, self.dropped), self._adapt_snap))
+        self._adapt_at = now
+        self._adapt_snap = (self.bytes_sent, self.sent, self.dropped)
+        self.kbps = nbytes * 8 / 1000 / dt
+        congested = dropped > 0.25 * (sent + dropped)
+        target = self.target_kbps
+        if congested or (target and self.kbps > target * 1.1):
+            if self.q_idx > 0:
+                self.q_idx -= 1
+            elif self.extra_down < len(SCALES) - 1:
+                self.extra_down += 1
+        elif not dropped and (not target or self.kbps < target * 0.6):
+            if self.extra_down:
+                self.extra_down -= 1
+            elif self.q_idx < len(QUALITIES) - 1:
+                self.q_idx += 1
+
+    def add_input_note(self, seq: int, note: dict):
+        self._input_notes.append((seq, note))
+
+    def take_input_notes(self, seq: int) -> List[dict]:
+        """Note của các input mà frame `seq` (vừa gửi) đã phản ánh."""
+        if not self._input_notes:
+            return []
+        ready = [n for s, n in self._input_notes if s <= seq]
+        self._input_notes = [(s, n) for s, n in self._input_notes if s > seq]
+        return ready
+
+    def ack(self):
+        if self._in_flight:
+            frame = self._in_flight.popleft()
+            self._latency.append(time.time() - frame.captured_at)
+            self._credit.set()
+
+    def stats(self) -> dict:
+        lat = sorted(self._latency)
+        ms = lambda s: round(s * 1000, 1)
+        return {
+            "codec": self.codec,
+            "viewport": self.viewport,
+            "target_kbps": self.target_kbps,
+            "scale": self.scale_sent,
+            "quality": self.quality,
+            "kbps": round(self.kbps, 1),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "bytes_sent": self.bytes_sent,
+            "in_flight": len(self._in_flight),
+            "latency": "capture->ack" if self.window else "capture->sent",
+            "latency_ms": {
+                "avg": ms(sum(lat) / len(lat)),
+                "p95": ms(lat[min(len(lat) - 1, int(len(lat) * 0.95))]),
+                "max": ms(lat[-1]),
+            } if lat else None,
+        }
+
+
+class Rendition:
+    """Một mức phân giải của thiết bị: khung đã thu nhỏ + TileTracker riêng (scale 1.0 = khung gốc)."""
+
+    def __init__(self, scale: float, tile: int):
+        self.scale = scale
+        self.tracker = TileTracker(tile)
+        self.latest: Optional[Frame] = None
+        self.used_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def update(self, frame: Frame) -> Frame:
+        """Đưa rendition lên `frame` (blocking: resize + dò ô đổi). Trả về frame của rendition."""
+        self.used_at = time.monotonic()
+        if self.latest is None or self.latest.seq < frame.seq:
+            pixels = self._resize(frame.pixels)
+            self.tracker.update(pixels, frame.seq)
+            self.latest = Frame(frame.seq, frame.captured_at, pixels, self.scale)
+        return self.latest
+
+    async def sync(self, frame: Frame) -> Frame:
+        """update() trên thread pool; viewer gọi đồng thời chỉ resize 1 lần."""
+        self.used_at = time.monotonic()
+        async with self._lock:
+            if self.latest is None or self.latest.seq < frame.seq:
+                await asyncio.to_thread(self.update, frame)
+        return self.latest
+
+    def _resize(self, pixels: np.ndarray) -> np.ndarray:
+        if self.scale == 1.0:
+            return pixels
+        h, w = pixels.shape[:2]
+        size = (max(2, round(w * self.scale / 2) * 2), max(2, round(h * self.scale / 2) * 2))
+        return np.asarray(Image.fromarray(pixels).resize(size, Image.BILINEAR, reducing_gap=2.0))
+
+
+def choose_scale(size: Optional[Tuple[int, int]], viewer: Viewer) -> float:
+    """Mức nhỏ nhất vẫn phủ kín viewport (không để client phải phóng to), rồi hạ thêm extra_down bậc."""
+    i = 0
+    if viewer.viewport and size:
+        fit = min(viewer.viewport[0] / size[0], viewer.viewport[1] / size[1])
+        i = max(j for j, s in enumerate(SCALES) if s >= fit or j == 0)
+    return SCALES[min(i + viewer.extra_down, len(SCALES) - 1)]
+
+
+def render_job(rend: Rendition, codec: str, quality: int, base: int) -> Optional[Tuple[tuple, Callable[[], bytes]]]:
+    """
+    (cache key, hàm encode blocking) cho viewer đang ở `base` trên rend.latest;
+    None nếu viewer không thiếu ô nào (thay đổi nhỏ tới mức mất khi thu nhỏ).
+    """
+    frame = rend.latest
+    if codec == "tiles":
+        tracker = rend.tracker
+        keyframe = tracker.is_keyframe(base)
+        tiles = tracker.tiles_since(base)  # lấy ngay: cùng trạng thái với rend.latest
+        if not tiles:
+            return None
+        key = ("tiles", rend.scale, quality, frame.seq, -1 if keyframe else base)
+        return key, lambda: encode_tiles(frame.pixels, tiles, tracker.tile, frame.seq, base, keyframe, quality)
+    key = ("jpeg", rend.scale, quality, frame.seq)
+    return key, lambda: encode_jpeg(Image.fromarray(frame.pixels), quality)
+
+
+class BaseDeviceStream(abc.ABC):
+    """Quản lý viewer + vòng đời task _run() chung cho stream trong process và stream qua worker process."""
+
+    def __init__(self, device_id: str, quality: int = 70, idle_timeout: float = 10.0, tile: int = DEFAULT_TILE):
+        self.device_id = device_id
+        self.quality = quality
+        self.idle_timeout = idle_timeout
+        self.tile = tile
+        self.viewers: Set[Viewer] = set()
+        self.frames_captured = 0
+        self.frames_encoded = 0
+        self.encode_s = 0.0
+        # Cộng dồn từ các viewer đã rời đi
+        self.sent_total = 0
+        self.dropped_total = 0
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._has_viewers = asyncio.Event()
+        self.input = InputQueue()
+        self.input_latency = InputLatency()
+        self.input_ignored = 0  # không áp được: source không nhận input / lỗi khi áp
+        self.recorder: Optional[Recorder] = None
+        self._taps: Set[Viewer] = set()  # nhận frame như viewer nhưng không tính là người xem
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    @abc.abstractmethod
+    def latest(self) -> Optional[Frame]:
+        """Frame mới nhất đã chụp (None khi chưa có)."""
+
+    @property
+    @abc.abstractmethod
+    def size(self) -> Optional[Tuple[int, int]]:
+        """(width, height) khung gốc của thiết bị."""
+
+    def subscribe(self, viewer: Viewer):
+        self.viewers.add(viewer)
+        self._has_viewers.set()
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name=f"device-stream:{self.device_id}")
+
+    def unsubscribe(self, viewer: Viewer):
+        if viewer in self.viewers:
+            self.viewers.discard(viewer)
+            self.sent_total += viewer.sent
+            self.dropped_total += viewer.dropped
+            self.input_latency.forget(viewer)
+            if viewer.pointers_down:
+                # Rớt kết nối giữa lúc vuốt: không để thiết bị kẹt ngón tay đang chạm
+                now = time.time()
+                self.input.put(None, [InputEvent(UP, p, 0, 0, received_at=now) for p in sorted(viewer.pointers_down)])
+                viewer.pointers_down.clear()
+        if not self.viewers:
+            self._has_viewers.clear()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _wait_for_viewers(self) -> bool:
+        """False nếu hết idle_timeout mà vẫn không có viewer (vòng _run nên dừng)."""
+        if self.viewers:
+            return True
+        # Giữ source thêm một lúc: viewer bấm Reconnect không phải khởi động lại thiết bị
+        try:
+            await asyncio.wait_for(self._has_viewers.wait(), self.idle_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def send_input(self, viewer: Viewer, events: List[InputEvent]):
+        """Xếp lô input của viewer vào hàng đợi chung của thiết bị (không chờ)."""
+        for e in events:
+            if e.kind == DOWN:
+                viewer.pointers_down.add(e.pointer)
+            elif e.kind == UP:
+                viewer.pointers_down.discard(e.pointer)
+        self.input.put(viewer, events)
+
+    def _start_companions(self) -> List[asyncio.Task]:
+        """Task chạy cùng vòng đời source: áp input, ghi phiên (nếu hub bật recorder)."""
+        tasks = [asyncio.create_task(self._input_loop(), name=f"device-input:{self.device_id}")]
+        if self.recorder is not None:
+            tasks.append(asyncio.create_task(self._record_loop(), name=f"device-record:{self.device_id}"))
+        return tasks
+
+    def _stop_companions(self, tasks: List[asyncio.Task]):
+        for t in tasks:
+            t.cancel()
+        self.input.clear()
+
+    async def _record_loop(self):
+        """Viewer ngầm: frame gốc, JPEG nguyên khung -> Recorder. Ghi chậm thì bỏ frame, không chặn ai."""
+        tap = Viewer(0, "jpeg", None, None, self.quality)
+        self._taps.add(tap)
+        try:
+            while True:
+                await tap.get()
+                rendered = await self.render(tap)
+                if rendered is None:
+                    continue
+                frame, data = rendered
+                try:
+                    data = bytes(data)  # memoryview vào shared memory: copy trước khi trả slot
+                finally:
+                    self.release(rendered[1])
+                self.recorder.put(self.device_id, frame.captured_at, data)
+                tap.mark_sent(frame, len(data))
+        finally:
+            self._taps.discard(tap)
+            self.recorder.end(self.device_id)
+
+    async def _input_loop(self):
+        """Chạy cùng vòng đời source: áp từng lô theo thứ tự; lô sau chờ lô trước áp xong."""
+        while True:
+            batch = await self.input.get_batch()
+            try:
+                applied_at = await self._apply_input([e for _, e in batch])
+            except Exception:
+                applied_at = None  # thiết bị lỗi giữa chừng: bỏ lô này, lô sau vẫn thử tiếp
+            if applied_at is None:
+                self.input_ignored += len(batch)
+            else:
+                self.input_latency.applied_batch([(v, e) for v, e in batch if v is not None], applied_at)
+
+    @abc.abstractmethod
+    async def _apply_input(self, events: List[InputEvent]) -> Optional[float]:
+        """Áp vào thiết bị, trả time.time() lúc áp xong; None nếu source không nhận input."""
+
+    def _publish(self, frame: Frame, grabbed_at: Optional[float] = None):
+        """grabbed_at: lúc BẮT ĐẦU chụp frame — chỉ input áp trước mốc này mới chắc có trong frame."""
+        for viewer, note in self.input_latency.on_frame(frame.seq, grabbed_at or frame.captured_at):
+            if viewer in self.viewers:
+                viewer.add_input_note(frame.seq, note)
+        for v in list(self.viewers) + list(self._taps):
+            v.push(frame)
+
+    @abc.abstractmethod
+    async def _run(self):
+        """Vòng capture của thiết bị (task chạy khi có viewer)."""
+
+    @abc.abstractmethod
+    async def render(self, viewer: Viewer) -> Optional[Tuple[Frame, bytes]]:
+        """Bản encode frame mới nhất cho viewer (None nếu viewer không thiếu gì)."""
+
+    def release(self, data):
+        """Gọi sau khi gửi xong `data` lấy từ render() (stream dùng shared memory trả slot ở đây)."""
+
+    def stats(self) -> dict:
+        n = self.frames_encoded
+        return {
+            "running": self.running,
+            "viewers": len(self.viewers),
+            "frames_captured": self.frames_captured,
+            "frames_changed": self._seq,
+            "frames_encoded": n,
+            "avg_encode_ms": round(self.encode_s * 1000 / n, 2) if n else None,
+            "sent_total": self.sent_total + sum(v.sent for v in self.viewers),
+            "dropped_total": self.dropped_total + sum(v.dropped for v in self.viewers),
+            "input": {
+                "received": self.input.received,
+                "coalesced": self.input.coalesced,
+                "queued": len(self.input),
+                "dropped": self.input.dropped,
+                "ignored": self.input_ignored,
+                **self.input_latency.stats(),
+            },
+            "viewer_stats": [v.stats() for v in self.viewers],
+        }
+
+
+class DeviceStream(BaseDeviceStream):
+    """Capture + encode ngay trong process này (encode trên thread pool)."""
+
+    RESTART_DELAY = 1.0
+
+    def __init__(self, device_id: str, source_factory: Callable[[str], FrameSource],
+                 quality: int = 70, idle_timeout: float = 10.0, tile: int = DEFAULT_TILE):
+        super().__init__(device_id, quality, idle_timeout, tile)
+        self.source_factory = source_factory
+        self.full = Rendition(1.0, tile)  # khung gốc: dò thay đổi ngay trong vòng capture
+        self._renditions: Dict[float, Rendition] = {1.0: self.full}
+        self._renders: Dict[tuple, asyncio.Task] = {}  # chỉ giữ bản encode của frame mới nhất
+        self._source: Optional[FrameSource] = None
+        self.restarts = 0
+
+    @property
+    def latest(self) -> Optional[Frame]:
+        return self.full.latest
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        return self.full.tracker.size if self.full.latest is not None else None
+
+    async def _run(self):
+        while await self._wait_for_viewers():
+            try:
+                await self._capture()
+                return  # dừng vì hết người xem
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("source %s lỗi, khởi động lại", self.device_id)
+            if not self.viewers:
+                continue
+            # Source lỗi khi vẫn còn người xem (thiết bị rớt kết nối...): dựng lại như ProcessDeviceStream
+            self.restarts += 1
+            await asyncio.sleep(self.RESTART_DELAY)
+
+    async def _capture(self):
+        source = self._source = self.source_factory(self.device_id)
+        await source.start()
+        companions = self._start_companions()
+        try:
+            while await self._wait_for_viewers():
+                img = await source.read()
+                captured_at = time.time()
+                pixels = np.asarray(img.convert("RGB"))
+                self.frames_captured += 1
+                if not self.full.tracker.update(pixels, self._seq + 1):
+                    continue  # không ô nào đổi
+                self._seq += 1
+                self.full.latest = Frame(self._seq, captured_at, pixels)
+                self._renders.clear()
+                self._prune_renditions()
+                self._publish(self.full.latest, source.grabbed_at)
+        finally:
+            self._stop_companions(companions)
+            self._source = None
+            await source.close()
+
+    async def _apply_input(self, events: List[InputEvent]) -> Optional[float]:
+        source = self._source
+        if source is None or not source.supports_input:
+            return None
+        await asyncio.to_thread(source.inject, events)
+        source.expedite()
+        return time.time()
+
+    async def render(self, viewer: Viewer) -> Optional[Tuple[Frame, bytes]]:
+        """
+        Bản encode của frame mới nhất cho viewer (None nếu viewer không thiếu gì).
+        Viewer cùng codec + scale + quality + base dùng chung một task encode; viewer bị huỷ
+        giữa chừng không huỷ task đó (shield).
+        """
+        full = self.latest
+        if full is None or full.seq <= viewer.base:
+            return None
+        scale = choose_scale(self.size, viewer)
+        rend = self._renditions.get(scale)
+        if rend is None:
+            rend = self._renditions[scale] = Rendition(scale, self.tile)
+        await rend.sync(full)
+        # Đổi scale: canvas client đang ở kích thước khác -> coi như viewer mới (keyframe)
+        base = viewer.base if viewer.scale_sent == scale else 0
+        job = render_job(rend, viewer.codec, viewer.quality, base)
+        if job is None:
+            return None
+        key, encode = job
+        task = self._renders.get(key)
+        if task is None:
+            task = self._renders[key] = asyncio.create_task(self._encode(encode))
+        return rend.latest, await asyncio.shield(task)
+
+    async def _encode(self, job: Callable[[], bytes]) -> bytes:
+        t0 = time.perf_counter()
+        data = await asyncio.to_thread(job)
+        self.encode_s += time.perf_counter() - t0
+        self.frames_encoded += 1
+        return data
+
+    def _prune_renditions(self, max_idle: float = 5.0):
+        cutoff = time.monotonic() - max_idle
+        for scale in [s for s, r in self._renditions.items() if r is not self.full and r.used_at < cutoff]:
+            del self._renditions[scale]
+
+    def stats(self) -> dict:
+        return {**super().stats(), "renditions": sorted(self._renditions), "source_restarts": self.restarts}
+
+
+@dataclass
+class Session:
+    session_id: str
+    device_id: str
+    created_at: float = field(default_factory=time.time)
+    viewers: int = 0
+
+
+class StreamHub:
+    """Session -> thiết bị. Nhiều session cùng device_id dùng chung một DeviceStream."""
+
+    def __init__(self, source_factory: Callable[[str], FrameSource], default_device: str = "local",
+                 quality: int = 70, idle_timeout: float = 10.0, session_ttl: float = 300.0,
+                 tile: int = DEFAULT_TILE, recorder: Optional[Recorder] = None):
+        self.source_factory = source_factory
+        self.default_device = default_device
+        self.quality = quality
+        self.tile = tile
+        self.idle_timeout = idle_timeout
+        self.session_ttl = session_ttl
+        self.recorder = recorder
+        self.sessions: Dict[str, Session] = {}
+        self.devices: Dict[str, BaseDeviceStream] = {}
+
+    def create_session(self, device_id: Optional[str] = None) -> Session:
+        self._prune_sessions()
+        session = Session(secrets.token_urlsafe(12), device_id or self.default_device)
+        self.sessions[session.session_id] = session
+        return session
+
+    def session(self, session_id: str) -> Optional[Session]:
+        return self.sessions.get(session_id)
+
+    def stream(self, device_id: str) -> BaseDeviceStream:
+        ds = self.devices.get(device_id)
+        if ds is None:
+            ds = self.devices[device_id] = self._new_stream(device_id)
+            ds.recorder = self.recorder
+        return ds
+
+    def _new_stream(self, device_id: str) -> BaseDeviceStream:
+        return DeviceStream(device_id, self.source_factory, self.quality, self.idle_timeout, self.tile)
+
+    def attach(self, session: Session, viewer: Viewer) -> BaseDeviceStream:
+        ds = self.stream(session.device_id)
+        session.viewers += 1
+        ds.subscribe(viewer)
+        return ds
+
+    def detach(self, session: Session, viewer: Viewer):
+        session.viewers -= 1
+        self.stream(session.device_id).unsubscribe(viewer)
+
+    async def close(self):
+        await asyncio.gather(*(ds.close() for ds in self.devices.values()))
+        if self.recorder is not None:
+            await asyncio.to_thread(self.recorder.close)
+
+    def _prune_sessions(self):
+        # Session không còn viewer và đã quá TTL thì bỏ (client nào cũng POST connect mỗi lần bấm)
+        cutoff = time.time() - self.session_ttl
+        for sid in [sid for sid, s in self.sessions.items() if not s.viewers and s.created_at < cutoff]:
+            del self.sessions[sid]
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "devices": {d: ds.stats() for d, ds in self.devices.items()},
+            "recording": self.recorder.stats() if self.recorder is not None else None,
+        }
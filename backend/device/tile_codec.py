@@ -0,0 +1,126 @@
+# tile_codec.py
+# Tile-diff codec cho device stream: chỉ gửi các ô (tile) màn hình đã đổi
+# - TileTracker: so khung mới với khung trước theo từng ô tile x tile (numpy), ghi seq
+#   lần cuối mỗi ô đổi -> viewer đang ở seq `base` chỉ cần các ô có version > base
+# - encode_tiles(): gom các ô cần gửi vào MỘT ảnh atlas, encode JPEG 1 lần, kèm header nhị phân
+# - TileCanvas: decoder tham chiếu (Python) — client JS trong Test_device_ui.txt làm y hệt
+#
+# Message (little-endian):
+#   0  4s  magic b"DVT1"
+#   4  u8  flags (1 = keyframe: chứa mọi ô, client reset canvas theo width/height)
+#   5  u8  (dự phòng)
+#   6  u32 seq        10 u32 base
+#   14 u16 width      16 u16 height     (kích thước màn hình đầy đủ)
+#   18 u16 tile       20 u16 count      22 u16 cols (số cột của atlas)
+#   24 count x (u16 tx, u16 ty)          toạ độ ô trên màn hình (đơn vị: ô)
+#   .. JPEG atlas: ô thứ i nằm ở (i % cols, i // cols) * tile, ô ở mép có thể nhỏ hơn tile
+
+import io
+import math
+import struct
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+MAGIC = b"DVT1"
+FLAG_KEYFRAME = 1
+HEADER = struct.Struct("<4sBxIIHHHHH")
+COORD = struct.Struct("<HH")
+DEFAULT_TILE = 64  # bội của 16 -> block JPEG (kể cả chroma 4:2:0) không vắt qua 2 ô trong atlas
+
+
+class TileTracker:
+    """Trạng thái màn hình mới nhất + seq lần cuối từng ô thay đổi."""
+
+    def __init__(self, tile: int = DEFAULT_TILE):
+        self.tile = tile
+        self.frame: Optional[np.ndarray] = None  # HxWx3 uint8, không sửa tại chỗ (chỉ gán mảng mới)
+        self.version: Optional[np.ndarray] = None  # rows x cols, seq lần cuối ô đổi
+        self.reset_seq = 0  # seq lần gần nhất đổi kích thước (mọi ô đều mới)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        h, w = self.frame.shape[:2]
+        return w, h
+
+    def update(self, frame: np.ndarray, seq: int) -> int:
+        """Nạp khung mới; trả về số ô đã đổi (0: màn hình đứng yên, không cần gửi gì)."""
+        prev = self.frame
+        if prev is None or prev.shape != frame.shape:
+            h, w = frame.shape[:2]
+            self.version = np.full((math.ceil(h / self.tile), math.ceil(w / self.tile)), seq, dtype=np.int64)
+            self.frame = frame
+            self.reset_seq = seq
+            return self.version.size
+
+        diff = np.any(frame != prev, axis=2)
+        h, w = diff.shape
+        # OR theo từng dải tile (reduceat xử lý luôn ô lẻ ở mép, không cần pad)
+        changed = np.logical_or.reduceat(np.logical_or.reduceat(diff, np.arange(0, h, self.tile), axis=0),
+                                         np.arange(0, w, self.tile), axis=1)
+        n = int(changed.sum())
+        if n:
+            self.version[changed] = seq
+            self.frame = frame
+        return n
+
+    def tiles_since(self, base: int) -> List[Tuple[int, int]]:
+        """Các ô (tx, ty) viewer đang ở `base` còn thiếu. base cũ hơn lần đổi kích thước -> mọi ô."""
+        if base < self.reset_seq:
+            base = -1
+        ty, tx = np.nonzero(self.version > base)
+        return list(zip(tx.tolist(), ty.tolist()))
+
+    def is_keyframe(self, base: int) -> bool:
+        return base < self.reset_seq
+
+
+def encode_tiles(frame: np.ndarray, tiles: List[Tuple[int, int]], tile: int, seq: int, base: int,
+                 keyframe: bool, quality: int = 70) -> bytes:
+    h, w = frame.shape[:2]
+    n = len(tiles)
+    cols = max(1, math.ceil(math.sqrt(n)))
+    rows = max(1, math.ceil(n / cols))
+    atlas = np.zeros((rows * tile, cols * tile, 3), dtype=np.uint8)
+    for i, (tx, ty) in enumerate(tiles):
+        x, y = tx * tile, ty * tile
+        block = frame[y:y + tile, x:x + tile]
+        ax, ay = (i % cols) * tile, (i // cols) * tile
+        atlas[ay:ay + block.shape[0], ax:ax + block.shape[1]] = block
+
+    buf = io.BytesIO()
+    buf.write(HEADER.pack(MAGIC, FLAG_KEYFRAME if keyframe else 0, seq, base, w, h, tile, n, cols))
+    for tx, ty in tiles:
+        buf.write(COORD.pack(tx, ty))
+    Image.fromarray(atlas).save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def is_tile_message(data: bytes) -> bool:
+    return data[:4] == MAGIC
+
+
+class TileCanvas:
+    """Decoder tham chiếu: ghép các message DVT1 lên một ảnh RGB."""
+
+    def __init__(self):
+        self.image: Optional[Image.Image] = None
+        self.seq = 0
+
+    def apply(self, data: bytes) -> Image.Image:
+        magic, flags, seq, base, w, h, tile, n, cols = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("không phải message tile (DVT1)")
+        if flags & FLAG_KEYFRAME or self.image is None or self.image.size != (w, h):
+            self.image = Image.new("RGB", (w, h))
+        off = HEADER.size
+        coords = [COORD.unpack_from(data, off + i * COORD.size) for i in range(n)]
+        atlas = Image.open(io.BytesIO(data[off + n * COORD.size:]))
+        atlas.load()
+        for i, (tx, ty) in enumerate(coords):
+            tw, th = min(tile, w - tx * tile), min(tile, h - ty * tile)
+            ax, ay = (i % cols) * tile, (i // cols) * tile
+            self.image.paste(atlas.crop((ax, ay, ax + tw, ay + th)), (tx * tile, ty * tile))
+        self.seq = seq
+        return self.image
@@ -0,0 +1,105 @@
+# bench_startup.py
+# Đo cold start của các app Qt: spawn -> vào app.exec() -> frame đầu tiên -> event loop rảnh
+#   python bench_startup.py                      # mặc định: test.py + tool-to/test2..5.py
+#   python bench_startup.py tool-to/test5.py --runs 10
+#   QT_QPA_PLATFORM=offscreen python bench_startup.py ...   (máy không có màn hình)
+# Mỗi lần chạy là một process mới (import lạnh từ đầu); app không cần sửa gì:
+# script được chạy qua runpy với QApplication.exec được bọc để bắt paint đầu tiên rồi thoát.
+
+import argparse
+import json
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TARGETS = ["test.py"] + [os.path.join("tool-to", f"test{i}.py") for i in range(2, 6)]
+MARK = "@@startup "
+PHASES = ("exec", "first_paint", "settled")
+
+
+# --------------------------- Child ---------------------------
+
+def _child(script: str):
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    marks = {}
+
+    def report():
+        marks["settled"] = time.time()
+        print(MARK + json.dumps(marks), flush=True)
+        QApplication.instance().quit()
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if "first_paint" not in marks and event.type() == QEvent.Paint and obj.isWidgetType() and obj.isWindow():
+                marks["first_paint"] = time.time()
+                # Hai vòng singleShot: các việc app hẹn "sau frame đầu" (dựng trang lazy) chạy xong trước
+                QTimer.singleShot(0, lambda: QTimer.singleShot(0, report))
+            return False
+
+    real_exec = QApplication.exec
+
+    def exec_(*args):
+        marks["exec"] = time.time()
+        app = QApplication.instance()
+        app._startupProbe = FirstPaint()
+        app.installEventFilter(app._startupProbe)
+        return real_exec()
+
+    QApplication.exec = exec_
+
+    script = os.path.abspath(script)
+    sys.argv = [script]
+    sys.path.insert(0, os.path.dirname(script))
+    runpy.run_path(script, run_name="__main__")
+
+
+# --------------------------- Parent ---------------------------
+
+def _run_once(script: str, timeout: float) -> dict:
+    t0 = time.time()
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", script],
+        capture_output=True, text=True, timeout=timeout, cwd=os.path.dirname(os.path.abspath(script)),
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(MARK):
+            marks = json.loads(line[len(MARK):])
+            return {k: (v - t0) * 1000 for k, v in marks.items()}
+    raise RuntimeError(f"{script}: không nhận được mốc thời gian (exit {proc.returncode})\n{proc.stderr[-2000:]}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cold start benchmark cho các app Qt")
+    ap.add_argument("scripts", nargs="*", help="mặc định: " + ", ".join(DEFAULT_TARGETS))
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--child", metavar="SCRIPT", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        _child(args.child)
+        return
+
+    scripts = args.scripts or [os.path.join(HERE, p) for p in DEFAULT_TARGETS]
+    print(f"{'script':<24}" + "".join(f"{p + ' ms':>18}" for p in PHASES) + "   (median / min)")
+    for script in scripts:
+        try:
+            runs = [_run_once(script, args.timeout) for _ in range(args.runs)]
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"{os.path.relpath(script):<24}  lỗi: {e}")
+            continue
+        cols = []
+        for p in PHASES:
+            vals = [r[p] for r in runs if p in r]
+            cols.append(f"{statistics.median(vals):>9.0f} / {min(vals):<6.0f}" if vals else f"{'-':>18}")
+        print(f"{os.path.relpath(script):<24}" + "".join(cols))
+
+
+if __name__ == "__main__":
+    main()
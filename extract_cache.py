@@ -0,0 +1,173 @@
+# extract_cache.py
+# Shared extraction cache for the downloader UIs (tool_hub.py, toolhub_downloader_ui.py).
+# - canonical_url(): one key per link (scheme/host case, fragments, tracking params)
+# - ExtractionCache: canonical URL -> Future of the extraction result, so a speculative
+#   run started on paste and the later Analyze click share ONE extraction
+# - speculate(): resolve the host first (cheap, fails fast on typos) then run the job
+#   on a small worker pool; queued speculations for links the user already replaced
+#   are cancelled before they start
+# - split_urls(): a pasted block of links (whitespace separated, or a comma/semicolon directly
+#   followed by another http(s):// link) -> canonical, de-duplicated list, so several links can
+#   be analyzed side by side through one cache. Also used by tool-to/download.py.
+# Stdlib only - tool_hub.py imports this at startup.
+
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# "," and ";" are legal inside URLs (?list=1,2  /p;v=1): only split there when a new link starts
+URL_SEPARATOR = re.compile(r"\s+|[,;]+(?=\s*https?://)", re.IGNORECASE)
+TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "igsh", "si", "feature", "ref", "ref_src", "_r", "_t"}
+
+
+def _is_tracking(key: str) -> bool:
+    return key in TRACKING_PARAMS or key.startswith("utm_")
+
+
+def canonical_url(text: str) -> Optional[str]:
+    """Normalized http(s) URL, or None if `text` does not look like a link."""
+    text = (text or "").strip()
+    if not text or any(c.isspace() for c in text):
+        return None
+    if "://" not in text:
+        text = "https://" + text
+    try:
+        parts = urlsplit(text)
+    except ValueError:
+        return None
+    host = (parts.hostname or "").lower()
+    if parts.scheme.lower() not in ("http", "https") or "." not in host:
+        return None
+    netloc = host if parts.port is None else f"{host}:{parts.port}"
+    # Filter the raw query (no decode/re-encode): the link keeps its exact spelling
+    query = "&".join(p for p in parts.query.split("&")
+                     if p and not _is_tracking(p.split("=", 1)[0].lower()))
+    return urlunsplit(("https" if parts.scheme.lower() == "https" else "http", netloc, parts.path or "/", query, ""))
+
+
+def split_urls(text: str, require_scheme: bool = False) -> List[str]:
+    """
+    Every link in `text` (canonical, first occurrence order); non-link tokens are skipped.
+    require_scheme: only accept tokens written with http:// or https://.
+    """
+    seen, out = set(), []
+    for token in URL_SEPARATOR.split(text or ""):
+        token = token.strip("<>\"'()[]")
+        if require_scheme and not token.lower().startswith(("http://", "https://")):
+            continue
+        key = canonical_url(token)
+        if key and key not in seen:
+            seen.add(key)
+            out.append(key)
+    return out
+
+
+def resolve_host(url: str):
+    """DNS lookup for the URL's host (warms the resolver; raises socket.gaierror on bad hosts)."""
+    parts = urlsplit(url)
+    socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80),
+                       type=socket.SOCK_STREAM)
+
+
+class ExtractionCache:
+    """
+    Thread-safe LRU of canonical URL -> Future[result] with a TTL (direct media URLs expire).
+    Failed or cancelled extractions are dropped so the next request retries.
+    """
+
+    def __init__(self, job: Callable[[str], object], max_workers: int = 2, ttl: float = 300.0, maxsize: int = 16):
+        self.job = job
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.speculative_hits = 0
+        self._lock = threading.RLock()  # Future callbacks may fire synchronously under the lock
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (future, started_at, speculative)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract")
+        self._pending_spec: Optional[Future] = None
+
+    def get(self, url: str) -> Future:
+        """Future for `url` (canonical) - reuses a cached or in-flight extraction."""
+        with self._lock:
+            entry = self._lookup(url)
+            if entry is not None:
+                self.hits += 1
+                if entry[2]:
+                    self.speculative_hits += 1
+                    # Someone now waits on this future: it is no longer a cancellable speculation
+                    self._data[url] = (entry[0], entry[1], False)
+                if entry[0] is self._pending_spec:
+                    self._pending_spec = None
+                return entry[0]
+            self.misses += 1
+            return self._start(url, self.job, speculative=False)
+
+    def speculate(self, url: str) -> Future:
+        """Start extracting `url` ahead of the Analyze click (no-op if already cached/in flight)."""
+        with self._lock:
+            entry = self._lookup(url)
+            if entry is not None:
+                return entry[0]
+            # Only the latest typed/pasted link matters: drop a queued one that has not started
+            prev = self._pending_spec
+            if prev is not None and prev.cancel():
+                self._forget(prev)
+            fut = self._start(url, lambda u: (resolve_host(u), self.job(u))[1], speculative=True)
+            self._pending_spec = fut
+            return fut
+
+    def peek(self, url: str) -> Optional[Future]:
+        with self._lock:
+            entry = self._lookup(url)
+            return entry[0] if entry is not None else None
+
+    def discard(self, url: str):
+        with self._lock:
+            self._data.pop(url, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ---- internal (call with self._lock held) ----
+    def _lookup(self, url: str):
+        entry = self._data.get(url)
+        if entry is None:
+            return None
+        fut, started_at, _ = entry
+        if fut.cancelled() or (fut.done() and fut.exception() is not None) or time.monotonic() - started_at > self.ttl:
+            del self._data[url]
+            return None
+        self._data.move_to_end(url)
+        return entry
+
+    def _start(self, url: str, job: Callable[[str], object], speculative: bool) -> Future:
+        fut = self._pool.submit(job, url)
+        self._data[url] = (fut, time.monotonic(), speculative)
+        fut.add_done_callback(self._on_done)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return fut
+
+    def _forget(self, fut: Future):
+        for key in [k for k, e in self._data.items() if e[0] is fut]:
+            del self._data[key]
+
+    def _on_done(self, fut: Future):
+        if fut.cancelled() or fut.exception() is not None:
+            with self._lock:
+                self._forget(fut)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses,
+                    "speculative_hits": self.speculative_hits}
@@ -0,0 +1,262 @@
+# extract_workers.py
+# Process-isolated yt-dlp extraction for tool_hub.py
+# - ExtractorPool: N long-lived worker processes; each imports yt_dlp once and keeps ONE warm
+#   YoutubeDL (loaded extractors, compiled regexes, HTTP session) for every request it serves
+# - extract_info's regex/JSON work runs outside the GUI process, so it never holds the Tk
+#   thread's GIL, and N analyses run on N cores
+# - IPC: one Pipe per worker, small pickled tuples
+#     parent -> worker: (req_id, url) | None (stop)
+#     worker -> parent: (req_id, True, compact_info(info)) | (req_id, False, "ErrorType: message")
+#   compact_info() keeps only the fields the UI reads (a few KB instead of the full info dict)
+# - Each worker is driven by one parent thread blocked in conn.poll() (GIL released):
+#     timeout -> kill + respawn the worker, the request fails with TimeoutError
+#     crash (EOF) -> respawn and retry the request once
+#     process cannot be started (OSError, limits) -> that request fails, the thread keeps
+#     serving and tries to spawn again for the next one
+# Stdlib only; yt_dlp is imported inside the workers.
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import signal
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+_ctx = mp.get_context("spawn")  # never fork a process running Tk + threads
+
+INFO_KEYS = ("_type", "id", "title", "uploader", "uploader_id", "channel", "duration", "webpage_url",
+             "original_url", "extractor_key", "thumbnail", "url", "ext", "format_id", "http_headers")
+FORMAT_KEYS = ("format_id", "ext", "url", "protocol", "width", "height", "fps", "tbr", "vcodec", "acodec",
+               "filesize", "filesize_approx", "is_drm", "format_note", "http_headers")
+
+
+class ExtractError(Exception):
+    """extract_info failed inside a worker (message carries the original error)."""
+
+
+def compact_info(info):
+    """The subset of a yt-dlp info dict the downloader UI uses; plain, picklable values only."""
+    if info is None:
+        return None
+    out = {k: info[k] for k in INFO_KEYS if info.get(k) is not None}
+    thumbs = info.get("thumbnails") or []
+    if thumbs and thumbs[-1].get("url"):
+        out["thumbnails"] = [{"url": thumbs[-1]["url"]}]
+    if info.get("formats"):
+        out["formats"] = [{k: f[k] for k in FORMAT_KEYS if f.get(k) is not None} for f in info["formats"]]
+    if info.get("entries") is not None:
+        out["entries"] = [compact_info(e) for e in info["entries"] if e]
+    return out
+
+
+def worker_main(conn, opts: dict):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is handled by the GUI process
+    try:
+        import yt_dlp
+        ydl, load_error = yt_dlp.YoutubeDL(dict(opts)), None
+    except Exception as e:
+        ydl, load_error = None, f"{type(e).__name__}: {e}"
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+        req_id, url = msg
+        if ydl is None:
+            conn.send((req_id, False, load_error))
+            continue
+        try:
+            reply = (req_id, True, compact_info(ydl.extract_info(url, download=False)))
+        except Exception as e:
+            reply = (req_id, False, f"{type(e).__name__}: {e}")
+        conn.send(reply)
+    if ydl is not None:
+        ydl.close()
+
+
+class _Worker:
+    """One worker process + its pipe; only touched by the pool thread that owns it."""
+
+    def __init__(self, pool: "ExtractorPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.proc = None
+        self.conn = None
+        self._ids = itertools.count(1)
+
+    def spawn(self):
+        conn, child = _ctx.Pipe()
+        proc = _ctx.Process(target=worker_main, args=(child, self.pool.opts),
+                            name=f"extractor-{self.index}", daemon=True)
+        try:
+            proc.start()
+        except BaseException:
+            conn.close()
+            raise
+        finally:
+            child.close()
+        self.proc, self.conn = proc, conn
+
+    def call(self, url: str, timeout: float):
+        """(ok, payload); raises TimeoutError, or EOFError/OSError if the process died."""
+        req_id = next(self._ids)
+        self.conn.send((req_id, url))
+        while True:
+            if not self.conn.poll(timeout):
+                raise TimeoutError(f"extract_info took more than {timeout:.0f}s")
+            rid, ok, payload = self.conn.recv()
+            if rid == req_id:
+                return ok, payload
+
+    def restart(self):
+        """Replace the process; if the new one cannot start, leave it for the next request to retry."""
+        self.kill()
+        self.pool._count(restarts=1)
+        try:
+            self.spawn()
+        except Exception:
+            pass
+
+    def stop(self, timeout: float = 2.0):
+        if self.proc is None:
+            return
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.proc.join(timeout)
+        self.kill()
+
+    def kill(self):
+        if self.proc is not None and self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.proc = self.conn = None
+
+
+class ExtractorPool:
+    """
+    submit(url) -> Future of compact_info(); safe to call from any thread.
+    Workers start on first use (or start()) and stay alive until close().
+    """
+
+    def __init__(self, opts: dict, workers: Optional[int] = None, timeout: float = 90.0):
+        self.opts = dict(opts)
+        self.size = workers or max(1, min(4, os.cpu_count() or 1))
+        self.timeout = timeout
+        self.requests = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.restarts = 0
+        self.busy = 0
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        with self._lock:
+            self._start_threads()
+
+    def submit(self, url: str) -> Future:
+        fut = Future()
+        # Under the lock: a job can never land behind the stop sentinels queued by close()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ExtractorPool is closed")
+            self._start_threads()
+            self._jobs.put((fut, url))
+        return fut
+
+    def extract(self, url: str):
+        return self.submit(url).result()
+
+    def close(self):
+        """Stop every worker (pending requests are cancelled); does not wait for the processes."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        while True:
+            try:
+                fut, _ = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            fut.cancel()
+        for _ in self._threads:
+            self._jobs.put(None)
+
+    def _start_threads(self):
+        # call with self._lock held
+        if self._threads or self._closed:
+            return
+        for i in range(self.size):
+            t = threading.Thread(target=self._run, args=(_Worker(self, i),), name=f"extractor-io-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _count(self, **deltas):
+        # counters are bumped from every I/O thread; never call with self._lock already held
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def _run(self, worker: _Worker):
+        try:
+            worker.spawn()  # import yt_dlp + build YoutubeDL now, before the first request arrives
+        except Exception:
+            pass  # retried (and reported) by the first request this thread serves
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                fut, url = job
+                if fut.set_running_or_notify_cancel():
+                    self._count(requests=1, busy=1)
+                    try:
+                        self._serve(worker, fut, url)
+                    except Exception as e:
+                        # spawn failed: fail this request, keep the thread serving the queue
+                        if not fut.done():
+                            fut.set_exception(ExtractError(f"cannot start extractor process: {e}"))
+                    finally:
+                        self._count(busy=-1)
+        finally:
+            worker.stop()
+
+    def _serve(self, worker: _Worker, fut: Future, url: str):
+        for attempt in range(2):
+            if worker.proc is None:
+                worker.spawn()  # earlier spawn/restart failed; raises again if it still cannot start
+            try:
+                ok, payload = worker.call(url, self.timeout)
+            except TimeoutError as e:
+                # A hung extractor keeps its process busy forever: replace it
+                self._count(timeouts=1)
+                fut.set_exception(e)
+                worker.restart()
+                return
+            except (EOFError, OSError):
+                self._count(crashes=1)
+                worker.restart()
+                if attempt:
+                    fut.set_exception(ExtractError("extractor process crashed"))
+                    return
+                continue
+            if ok:
+                fut.set_result(payload)
+            else:
+                fut.set_exception(ExtractError(payload))
+            return
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"workers": self.size, "busy": self.busy, "queued": self._jobs.qsize(), "requests": self.requests,
+                    "timeouts": self.timeouts, "crashes": self.crashes, "restarts": self.restarts}
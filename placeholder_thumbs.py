@@ -0,0 +1,148 @@
+# placeholder_thumbs.py
+# Shared placeholder-thumbnail rendering for the CustomTkinter mock UIs.
+# - Fonts are loaded once per (name, size)
+# - Rendered placeholders are memoized in an LRU keyed by (platform, title, size, theme)
+# pip install pillow
+
+import random
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+PALETTES = {
+    "TikTok": (25, 25, 25),
+    "Douyin": (18, 20, 35),
+    "Facebook": (24, 119, 242),
+    "Instagram": (131, 58, 180),
+    "X (Twitter)": (0, 0, 0),
+    "YouTube": (204, 0, 0),
+    "Pinterest": (189, 8, 28),
+    "Reddit": (255, 69, 0),
+    "Unknown": (64, 64, 64),
+}
+
+THEMES = {
+    "dark": {"tint": None, "text": "white", "pill": (0, 0, 0), "pill_text": "white"},
+    "light": {"tint": (255, 255, 255), "text": "white", "pill": (255, 255, 255), "pill_text": (20, 20, 20)},
+}
+
+
+# --------------------------- Fonts ---------------------------
+
+@lru_cache(maxsize=32)
+def load_font(name: Optional[str] = None, size: int = 14):
+    """ImageFont.truetype is slow (reads the file every time) - load each (name, size) once."""
+    if name:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+def text_size(draw: ImageDraw.ImageDraw, text: str, font) -> Tuple[int, int]:
+    # ImageDraw.textsize was removed in Pillow 10
+    if hasattr(draw, "textbbox"):
+        x0, y0, x1, y1 = draw.textbbox((0, 0), text, font=font)
+        return x1 - x0, y1 - y0
+    return draw.textsize(text, font=font)
+
+
+def _shorten(text: str, n: int = 64) -> str:
+    return text if len(text) <= n else text[: n - 3] + "..."
+
+
+def _blend(c1, c2, t: float):
+    return tuple(int(a + (b - a) * t) for a, b in zip(c1, c2))
+
+
+# --------------------------- LRU ---------------------------
+
+class PlaceholderCache:
+    """Thread-safe LRU of rendered placeholder images."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[Image.Image]:
+        with self._lock:
+            img = self._data.get(key)
+            if img is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return img
+
+    def put(self, key: tuple, img: Image.Image):
+        with self._lock:
+            self._data[key] = img
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+_cache = PlaceholderCache()
+
+
+# --------------------------- Rendering ---------------------------
+
+def _draw_placeholder(platform: str, title: str, size: Tuple[int, int], theme: str) -> Image.Image:
+    t = THEMES.get(theme, THEMES["dark"])
+    bg = PALETTES.get(platform, PALETTES["Unknown"])
+    if t["tint"]:
+        bg = _blend(bg, t["tint"], 0.25)
+    img = Image.new("RGB", size, color=bg)
+    draw = ImageDraw.Draw(img)
+    font = load_font()
+
+    # Subtle diagonal overlay
+    draw.polygon([(0, size[1]), (size[0], 0), (size[0], size[1])], outline=None, fill=_blend(bg, (255, 255, 255), 0.06))
+
+    # Platform text
+    platform_text = platform.upper()
+    tw, th = text_size(draw, platform_text, font)
+    draw.text(((size[0] - tw) / 2, 16), platform_text, fill=t["text"], font=font)
+
+    # Title text (wrapped roughly)
+    wrapped = _shorten(title, 40)
+    tw2, th2 = text_size(draw, wrapped, font)
+    draw.text(((size[0] - tw2) / 2, size[1] // 2 - th2 // 2), wrapped, fill=t["text"], font=font)
+
+    # Duration pill - derived from the title so the image is a pure function of the cache key
+    m, s = divmod(random.Random(title).randint(7, 240), 60)
+    pill_w, pill_h = 48, 18
+    x, y = size[0] - pill_w - 8, size[1] - pill_h - 8
+    draw.rounded_rectangle([x, y, x + pill_w, y + pill_h], radius=9, fill=t["pill"])
+    draw.text((x + 8, y + 3), f"{m:02d}:{s:02d}", fill=t["pill_text"], font=font)
+
+    return img
+
+
+def render_placeholder(platform: str, title: str, size: Tuple[int, int] = (320, 180), theme: str = "dark") -> Image.Image:
+    """Memoized placeholder. The returned image is shared - don't draw on it."""
+    key = (platform, title, tuple(size), theme)
+    img = _cache.get(key)
+    if img is None:
+        img = _draw_placeholder(platform, title, tuple(size), theme)
+        _cache.put(key, img)
+    return img
+
+
+def cache_info() -> dict:
+    return _cache.stats()
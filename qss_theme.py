@@ -0,0 +1,138 @@
+# qss_theme.py
+# Theme manager cho các cửa sổ PySide6 dùng QSS theo palette LIGHT/DARK.
+# - Mỗi palette chỉ format + scope QSS đúng 1 lần (lru_cache)
+# - Cả hai bản nằm chung MỘT stylesheet, scope theo property qssTheme="light|dark" của cửa sổ,
+#   nên đổi theme không parse lại QSS: chỉ đổi property rồi re-polish widget bị ảnh hưởng
+# - Item widget trong QListWidget ngoài viewport được re-polish khi cuộn tới (watch_list)
+# - ThemeManager.install(window, ...): một dòng cho mỗi cửa sổ (tạo, áp theme, theo dõi đổi theme)
+# Bản duy nhất: tool-to/download.py import file này qua sys.path (thư mục gốc repo), đừng copy sang thư mục khác
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QListWidget, QWidget
+
+THEME_PROP = "qssTheme"
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_BLOCK_RE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+
+def scope_qss(qss: str, theme: str) -> str:
+    """Thêm tiền tố `*[qssTheme="<theme>"] ` cho mọi selector (QSS phẳng, không lồng block)."""
+    prefix = f'*[{THEME_PROP}="{theme}"] '
+    out = []
+    for sel, body in _BLOCK_RE.findall(_COMMENT_RE.sub("", qss)):
+        sels = ", ".join(prefix + s.strip() for s in sel.split(",") if s.strip())
+        out.append(f"{sels} {{{body}}}")
+    return "\n".join(out)
+
+
+@lru_cache(maxsize=16)
+def compile_qss(template: str, theme: str, palette_items: tuple) -> str:
+    """template.format(**palette) đã scope theo theme. palette_items = tuple(sorted(palette.items()))."""
+    return scope_qss(template.format(**dict(palette_items)), theme)
+
+
+def repolish(widget: QWidget):
+    st = widget.style()
+    st.unpolish(widget)
+    st.polish(widget)
+    widget.update()
+
+
+def repolish_tree(widget: QWidget):
+    repolish(widget)
+    for child in widget.findChildren(QWidget):
+        repolish(child)
+
+
+class ThemeManager:
+    """
+    Gắn QSS (LIGHT + DARK) lên `window` một lần; apply(dark) chỉ đổi property và re-polish:
+    - toàn bộ widget ngoài các QListWidget đã watch_list() (thanh điều khiển, header... — ít)
+    - item widget đang nằm trong viewport; phần còn lại đánh dấu stale, polish khi cuộn tới
+    """
+
+    def __init__(self, window: QWidget, template: str, palettes: Dict[str, dict]):
+        self.window = window
+        self.template = template
+        self.palettes = palettes
+        self.theme = None
+        self._lists: List[QListWidget] = []
+        self._stale: Dict[QListWidget, set] = {}
+
+    @classmethod
+    def install(cls, window: QWidget, template: str, palettes: Dict[str, dict],
+                is_dark: Callable[[], bool], changed=None) -> "ThemeManager":
+        """ThemeManager của `window` (tạo một lần) + áp theme hiện tại; signal `changed` -> apply lại."""
+        tm = getattr(window, "_themeManager", None)
+        if tm is None:
+            tm = window._themeManager = cls(window, template, palettes)
+            if changed is not None:
+                changed.connect(lambda *_: tm.apply(is_dark()))
+        tm.apply(is_dark())
+        return tm
+
+    def stylesheet(self) -> str:
+        return "\n".join(
+            compile_qss(self.template, name, tuple(sorted(pal.items())))
+            for name, pal in self.palettes.items()
+        )
+
+    def watch_list(self, lst: QListWidget):
+        if lst in self._lists:
+            return
+        self._lists.append(lst)
+        self._stale[lst] = set()
+        # Đợi scroll xong vòng event hiện tại rồi mới polish (không polish giữa lúc đang vẽ)
+        lst.verticalScrollBar().valueChanged.connect(lambda _=0, l=lst: QTimer.singleShot(0, lambda: self._polish_visible(l)))
+
+    def apply(self, dark: bool):
+        theme = "dark" if dark else "light"
+        if theme == self.theme:
+            return
+        first = self.theme is None
+        self.theme = theme
+        self.window.setProperty(THEME_PROP, theme)
+        if first:
+            # Lần đầu: stylesheet đủ cả hai palette, Qt tự polish khi widget hiện
+            self.window.setStyleSheet(self.stylesheet())
+            return
+
+        self.window.setUpdatesEnabled(False)
+        try:
+            for w in self._outside_lists(self.window):
+                repolish(w)
+            for lst in self._lists:
+                self._stale[lst] = {lst.itemWidget(lst.item(r)) for r in range(lst.count())} - {None}
+                self._polish_visible(lst)
+        finally:
+            self.window.setUpdatesEnabled(True)
+
+    # ---- internals ----
+    def _outside_lists(self, root: QWidget) -> Iterable[QWidget]:
+        viewports = {lst.viewport() for lst in self._lists}
+        stack = [root]
+        while stack:
+            w = stack.pop()
+            yield w
+            if w in viewports:
+                continue  # item widgets: để _polish_visible lo
+            stack.extend(c for c in w.children() if isinstance(c, QWidget))
+
+    def _polish_visible(self, lst: QListWidget):
+        stale = self._stale.get(lst)
+        if not stale:
+            return
+        # Item widget là con của viewport -> geometry() đã ở toạ độ viewport
+        area = lst.viewport().rect()
+        for w in list(stale):
+            try:
+                if w.geometry().intersects(area):
+                    stale.discard(w)
+                    repolish_tree(w)
+            except RuntimeError:  # widget C++ đã bị xoá
+                stale.discard(w)
@@ -2,6 +2,11 @@ import os
 import random
 import time
 import hashlib
+import io
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 import tkinter.filedialog as fd
@@ -9,17 +14,19 @@ import tkinter.filedialog as fd
 import customtkinter as ctk
 from PIL import Image, ImageDraw, ImageFont, ImageTk
 
+from placeholder_thumbs import load_font, text_size
+
 # -------------------------------
 # Model (fake)
 # -------------------------------
-@dataclass
+@dataclass(slots=True)
 class MediaItem:
     mid: str
     mtype: str            # "image" | "video"
     title: str
     size_kb: int
     duration_s: int       # 0 for image
-    thumb: Image.Image
+    thumb_seed: int       # thumbnail reference; pixels live in ThumbnailCache
     selected: bool = True
     status: str = "pending"  # pending|downloading|done|error
 
@@ -38,12 +45,9 @@ def make_thumb(seed: int, label: str, is_video: bool, w=320, h=180) -> Image.Ima
         color = (rnd.randint(80, 200), rnd.randint(80, 200), rnd.randint(80, 200))
         draw.rectangle([x0, y0, x1, y1], outline=color, width=2)
 
-    # label
-    try:
-        font = ImageFont.truetype("arial.ttf", 18)
-    except:
-        font = ImageFont.load_default()
-    tw, th = draw.textsize(label, font=font)
+    # label (font loaded once, see placeholder_thumbs.load_font)
+    font = load_font("arial.ttf", 18)
+    tw, th = text_size(draw, label, font)
     draw.rectangle([10, 10, 16+tw, 16+th], fill=(0, 0, 0, 128))
     draw.text((14, 14), label, fill=(255, 255, 255), font=font)
 
@@ -71,59 +75,114 @@ def gen_fake_items(url: str) -> list[MediaItem]:
         title = f"{'Video' if is_video else 'Image'} #{i+1}"
         size_kb = rnd.randint(300, 12000) if not is_video else rnd.randint(1500, 50000)
         duration_s = rnd.randint(5, 240) if is_video else 0
-        thumb = make_thumb(seed + i, title, is_video, 320, 180)
         items.append(MediaItem(
             mid=f"{mtype}-{i}",
             mtype=mtype,
             title=title,
             size_kb=size_kb,
             duration_s=duration_s,
-            thumb=thumb,
+            thumb_seed=seed + i,
             selected=True,
         ))
     return items
 
 
+# -------------------------------
+# Thumbnail cache (encoded bytes, byte-budgeted)
+# -------------------------------
+class ThumbnailCache:
+    """
+    Shared LRU of JPEG-encoded thumbnails, bounded by total bytes rather than count.
+    Items only carry a reference (thumb_seed); pixels are rendered on first use and
+    decoded only when a card actually needs to show them.
+    """
+
+    def __init__(self, budget_bytes: int = 8 * 1024 * 1024, size=(320, 180), quality: int = 80):
+        self.budget_bytes = budget_bytes
+        self.size = size
+        self.quality = quality
+        self._data: OrderedDict[tuple, bytes] = OrderedDict()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def _key(self, item: MediaItem) -> tuple:
+        return (item.thumb_seed, item.title, item.mtype)
+
+    def get_bytes(self, item: MediaItem) -> bytes:
+        key = self._key(item)
+        with self._lock:
+            data = self._data.get(key)
+            if data is not None:
+                self._data.move_to_end(key)
+                return data
+
+        img = make_thumb(item.thumb_seed, item.title, item.mtype == "video", *self.size)
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=self.quality)
+        data = buf.getvalue()
+
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = data
+                self._used += len(data)
+                while self._used > self.budget_bytes and len(self._data) > 1:
+                    _, old = self._data.popitem(last=False)
+                    self._used -= len(old)
+        return data
+
+    def get_image(self, item: MediaItem) -> Image.Image:
+        img = Image.open(io.BytesIO(self.get_bytes(item)))
+        img.load()
+        return img
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._used = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+
 # -------------------------------
 # UI
 # -------------------------------
 class MediaCard(ctk.CTkFrame):
-    def __init__(self, master, item: MediaItem, on_toggle, on_download_one):
+    """Reusable card: built once, then re-bound to whichever item it currently shows."""
+
+    STATUS_COLORS = {"pending": "#aaaaaa", "downloading": "#ffaa00", "done": "#22cc55", "error": "#ff4444"}
+
+    def __init__(self, master, on_toggle, on_download_one, image_for):
         super().__init__(master, corner_radius=12)
-        self.item = item
+        self.item: MediaItem | None = None
         self.on_toggle = on_toggle
         self.on_download_one = on_download_one
-
-        # Cache CTkImage
-        self.ctk_img = ctk.CTkImage(light_image=item.thumb, dark_image=item.thumb, size=(256, 144))
+        self.image_for = image_for
 
         # Layout
         self.grid_columnconfigure(1, weight=1)
+        self.grid_propagate(False)
 
         # Thumbnail
-        self.preview = ctk.CTkLabel(self, image=self.ctk_img, text="")
+        self.preview = ctk.CTkLabel(self, text="")
         self.preview.grid(row=0, column=0, columnspan=3, padx=8, pady=(8, 4), sticky="nsew")
 
         # Type tag
-        tag_text = "VIDEO" if item.mtype == "video" else "IMAGE"
-        self.tag = ctk.CTkLabel(self, text=tag_text, fg_color=("gray92", "gray22"),
+        self.tag = ctk.CTkLabel(self, text="", fg_color=("gray92", "gray22"),
                                 corner_radius=8, padx=8, pady=2)
         self.tag.place(x=12, y=12)
 
         # Title
-        self.title = ctk.CTkLabel(self, text=item.title, anchor="w", font=ctk.CTkFont(size=13, weight="bold"))
+        self.title = ctk.CTkLabel(self, text="", anchor="w", font=ctk.CTkFont(size=13, weight="bold"))
         self.title.grid(row=1, column=0, columnspan=2, padx=10, sticky="w")
 
         # Size / duration
-        meta = f"{item.size_kb} KB"
-        if item.mtype == "video":
-            m, s = divmod(item.duration_s, 60)
-            meta += f" • {m:02d}:{s:02d}"
-        self.meta = ctk.CTkLabel(self, text=meta, anchor="w")
+        self.meta = ctk.CTkLabel(self, text="", anchor="w")
         self.meta.grid(row=2, column=0, columnspan=2, padx=10, sticky="w")
 
         # Checkbox
-        self.var_sel = ctk.BooleanVar(value=item.selected)
+        self.var_sel = ctk.BooleanVar(value=False)
         self.chk = ctk.CTkCheckBox(self, text="Select", variable=self.var_sel, command=self._toggle)
         self.chk.grid(row=3, column=0, padx=10, pady=(4, 8), sticky="w")
 
@@ -132,9 +191,25 @@ class MediaCard(ctk.CTkFrame):
         self.btn_dl.grid(row=3, column=1, padx=10, pady=(4, 8), sticky="e")
 
         # Status bullet
-        self.status_lbl = ctk.CTkLabel(self, text="● pending", text_color="#aaaaaa")
+        self.status_lbl = ctk.CTkLabel(self, text="", text_color="#aaaaaa")
         self.status_lbl.grid(row=3, column=2, padx=(0, 10), pady=(4, 8), sticky="e")
 
+    def bind_item(self, item: MediaItem):
+        if item is not self.item:
+            self.item = item
+            self.preview.configure(image=self.image_for(item))
+            self.tag.configure(text="VIDEO" if item.mtype == "video" else "IMAGE")
+            self.title.configure(text=item.title)
+            meta = f"{item.size_kb} KB"
+            if item.mtype == "video":
+                m, s = divmod(item.duration_s, 60)
+                meta += f" • {m:02d}:{s:02d}"
+            self.meta.configure(text=meta)
+        # selection / status can change while the card is bound elsewhere
+        if self.var_sel.get() != item.selected:
+            self.var_sel.set(item.selected)
+        self._render_status(item.status)
+
     def _toggle(self):
         self.item.selected = self.var_sel.get()
         self.on_toggle(self.item)
@@ -144,8 +219,138 @@ class MediaCard(ctk.CTkFrame):
 
     def set_status(self, status: str):
         self.item.status = status
-        color = {"pending": "#aaaaaa", "downloading": "#ffaa00", "done": "#22cc55", "error": "#ff4444"}[status]
-        self.status_lbl.configure(text=f"● {status}", text_color=color)
+        self._render_status(status)
+
+    def _render_status(self, status: str):
+        text = f"● {status}"
+        if self.status_lbl.cget("text") != text:
+            self.status_lbl.configure(text=text, text_color=self.STATUS_COLORS[status])
+
+
+class VirtualMediaGrid(ctk.CTkFrame):
+    """
+    Virtualized grid: keeps only enough MediaCards to cover the viewport (+1 row)
+    and re-binds them to items as the user scrolls or the filter changes.
+    """
+
+    def __init__(self, master, on_toggle, on_download_one, image_for,
+                 columns: int = 3, row_height: int = 260, pad: int = 8, label_text: str = ""):
+        super().__init__(master)
+        self.columns = columns
+        self.row_height = row_height
+        self.pad = pad
+        self._card_args = (on_toggle, on_download_one, image_for)
+
+        self.items: list[MediaItem] = []
+        self.pool: list[MediaCard] = []
+        self.offset = 0  # scroll offset in pixels
+        self._col_w = 0
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        if label_text:
+            ctk.CTkLabel(self, text=label_text, fg_color=("gray78", "gray23"),
+                         corner_radius=6).grid(row=0, column=0, columnspan=2, padx=6, pady=(6, 0), sticky="ew")
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=1, column=0, sticky="nsew", padx=(6, 0), pady=6)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", padx=(0, 4), pady=6)
+
+        self.empty_lbl = ctk.CTkLabel(self.viewport, text="No results", text_color=("gray40", "gray60"))
+
+        self.viewport.bind("<Configure>", self._on_resize)
+        self.bind_all("<MouseWheel>", self._on_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_wheel, add="+")
+
+    # ---------- public ----------
+    def set_items(self, items: list[MediaItem]):
+        self.items = items
+        self.offset = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-bind pooled cards to the items under the viewport. Cheap: no widget churn."""
+        self._clamp_offset()
+        cols, rh, pad = self.columns, self.row_height, self.pad
+        first_row, shift = divmod(self.offset, rh)
+        base = first_row * cols
+        for slot, card in enumerate(self.pool):
+            idx = base + slot
+            if idx >= len(self.items):
+                card.place_forget()
+                card.item = None
+                continue
+            card.bind_item(self.items[idx])
+            r, c = divmod(slot, cols)
+            card.place(x=c * self._col_w + pad, y=r * rh - shift + pad)
+
+        if self.items:
+            self.empty_lbl.place_forget()
+        else:
+            self.empty_lbl.place(relx=0.5, rely=0.2, anchor="n")
+        self._update_scrollbar()
+
+    def card_for(self, item: MediaItem) -> MediaCard | None:
+        for card in self.pool:
+            if card.item is item and card.winfo_ismapped():
+                return card
+        return None
+
+    # ---------- geometry ----------
+    def _content_height(self) -> int:
+        rows = -(-len(self.items) // self.columns)
+        return rows * self.row_height
+
+    def _clamp_offset(self):
+        max_off = max(0, self._content_height() - self.viewport.winfo_height())
+        self.offset = max(0, min(int(self.offset), max_off))
+
+    def _on_resize(self, event):
+        self._col_w = max(1, event.width // self.columns)
+        card_w = max(1, self._col_w - 2 * self.pad)
+        card_h = self.row_height - 2 * self.pad
+        needed = (event.height // self.row_height + 2) * self.columns
+        while len(self.pool) < needed:
+            self.pool.append(MediaCard(self.viewport, *self._card_args))
+        for card in self.pool:
+            card.configure(width=card_w, height=card_h)
+        self.refresh()
+
+    def _update_scrollbar(self):
+        total = self._content_height()
+        view_h = self.viewport.winfo_height()
+        if total <= view_h or total == 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + view_h) / total)
+
+    # ---------- scrolling ----------
+    def _scroll_to(self, offset: int):
+        old = self.offset
+        self.offset = offset
+        self._clamp_offset()
+        if self.offset != old:
+            self.refresh()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(value) * self._content_height())
+        elif action == "scroll":
+            step = self.viewport.winfo_height() if unit == "pages" else self.row_height // 4
+            self._scroll_to(self.offset + int(value) * step)
+
+    def _on_wheel(self, event):
+        if not str(event.widget).startswith(str(self.viewport)):
+            return
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        else:
+            delta = -1 if event.delta > 0 else 1
+        self._scroll_to(self.offset + delta * self.row_height // 4)
 
 
 class SocialDownloaderApp(ctk.CTk):
@@ -157,12 +362,16 @@ class SocialDownloaderApp(ctk.CTk):
         ctk.set_default_color_theme("blue")
 
         self.items: list[MediaItem] = []
-        self.cards: list[MediaCard] = []
-        self.image_cache = []  # prevent GC
+        self.visible_items: list[MediaItem] = []
+        self.thumbs = ThumbnailCache()
+        self.image_cache: OrderedDict[str, ctk.CTkImage] = OrderedDict()  # mid -> CTkImage (LRU, decoded)
+        self.image_cache_size = 96
         self.filter_var = ctk.StringVar(value="All")
         self.select_all_var = ctk.BooleanVar(value=True)
         self.downloading = False
-        self.cancel_download = False
+        self.cancel_event = threading.Event()
+        self.download_events: queue.Queue = queue.Queue()  # (item, status, message) from workers
+        self.max_concurrency = 4
 
         # default output dir
         self.output_dir = os.path.join(Path.home(), "Downloads", "SocialDownloaderDemo")
@@ -211,10 +420,11 @@ class SocialDownloaderApp(ctk.CTk):
         self.out_label = ctk.CTkLabel(toolbar, text=self.output_dir, anchor="e")
         self.out_label.pack(side="right", padx=(0, 10))
 
-        # ---------- Main Grid (scrollable) ----------
-        self.scroll = ctk.CTkScrollableFrame(self, label_text="Results", height=460)
-        self.scroll.pack(fill="both", expand=True, padx=12, pady=10)
-        self.scroll.grid_columnconfigure((0, 1, 2), weight=1, uniform="col")
+        # ---------- Main Grid (virtualized) ----------
+        self.grid_view = VirtualMediaGrid(self, on_toggle=self.on_item_toggle,
+                                          on_download_one=self.download_one_item,
+                                          image_for=self.get_ctk_image, label_text="Results")
+        self.grid_view.pack(fill="both", expand=True, padx=12, pady=10)
 
         # ---------- Footer / Actions ----------
         footer = ctk.CTkFrame(self)
@@ -227,6 +437,12 @@ class SocialDownloaderApp(ctk.CTk):
         self.btn_dl_all.pack(side="left", padx=(0, 10), pady=10)
         self.btn_cancel.pack(side="left", padx=(0, 10), pady=10)
 
+        ctk.CTkLabel(footer, text="Parallel:").pack(side="left", padx=(10, 4))
+        self.concurrency_opt = ctk.CTkOptionMenu(footer, values=["1", "2", "4", "8"], width=64,
+                                                 command=self._change_concurrency)
+        self.concurrency_opt.set(str(self.max_concurrency))
+        self.concurrency_opt.pack(side="left", padx=(0, 10))
+
         self.progress = ctk.CTkProgressBar(footer, height=12)
         self.progress.pack(fill="x", expand=True, side="left", padx=(10, 10))
         self.progress.set(0)
@@ -251,15 +467,17 @@ class SocialDownloaderApp(ctk.CTk):
 
     def clear_results(self):
         self.items.clear()
+        self.image_cache.clear()
+        self.thumbs.clear()
         self.refresh_grid()
         self.log_write("Cleared results.")
         self.status.configure(text="Cleared")
 
     def on_select_all_toggle(self):
-        visible_cards = self.get_visible_cards()
-        for card in visible_cards:
-            card.var_sel.set(self.select_all_var.get())
-            card.item.selected = card.var_sel.get()
+        value = self.select_all_var.get()
+        for item in self.visible_items:
+            item.selected = value
+        self.grid_view.refresh()
 
     def on_search(self):
         url = self.url_entry.get().strip()
@@ -269,57 +487,51 @@ class SocialDownloaderApp(ctk.CTk):
         self.log_write(f"Searching: {url}")
         # Fake load
         self.items = gen_fake_items(url)
+        self.image_cache.clear()
+        self.thumbs.clear()
         self.status.configure(text=f"Found {len(self.items)} items (fake).")
         self.refresh_grid()
 
-    def refresh_grid(self, *_):
-        # clear
-        for w in self.scroll.winfo_children():
-            w.destroy()
-        self.cards.clear()
-        self.image_cache.clear()
+    def get_ctk_image(self, item: MediaItem) -> ctk.CTkImage:
+        img = self.image_cache.get(item.mid)
+        if img is not None:
+            self.image_cache.move_to_end(item.mid)
+            return img
+        pil = self.thumbs.get_image(item)
+        img = ctk.CTkImage(light_image=pil, dark_image=pil, size=(256, 144))
+        self.image_cache[item.mid] = img
+        while len(self.image_cache) > self.image_cache_size:
+            self.image_cache.popitem(last=False)
+        return img
 
-        # filter
+    def refresh_grid(self, *_):
+        # filter (cards are pooled by the grid, only the item list changes)
         mode = self.filter_var.get()
-        def visible(item: MediaItem):
-            return (mode == "All"
-                    or (mode == "Images" and item.mtype == "image")
-                    or (mode == "Videos" and item.mtype == "video"))
-
-        # rebuild
-        r, c = 0, 0
-        for item in self.items:
-            if not visible(item): 
-                continue
-            card = MediaCard(self.scroll, item,
-                             on_toggle=self.on_item_toggle,
-                             on_download_one=self.download_one_item)
-            card.grid(row=r, column=c, padx=8, pady=8, sticky="nsew")
-            self.cards.append(card)
-            c += 1
-            if c > 2:
-                c = 0
-                r += 1
+        if mode == "All":
+            self.visible_items = list(self.items)
+        else:
+            want = "image" if mode == "Images" else "video"
+            self.visible_items = [it for it in self.items if it.mtype == want]
+        self.grid_view.set_items(self.visible_items)
+        self._sync_select_all()
 
+    def _sync_select_all(self):
         # update select-all checkbox based on visible
-        vis_cards = self.get_visible_cards()
-        if vis_cards:
-            self.select_all_var.set(all(cd.item.selected for cd in vis_cards))
+        if self.visible_items:
+            self.select_all_var.set(all(it.selected for it in self.visible_items))
         else:
             self.select_all_var.set(False)
 
-    def get_visible_cards(self) -> list[MediaCard]:
-        mode = self.filter_var.get()
-        out = []
-        for cd in self.cards:
-            if mode == "All" or cd.item.mtype == ("image" if mode == "Images" else "video"):
-                out.append(cd)
-        return out
-
     def on_item_toggle(self, item: MediaItem):
-        vis_cards = self.get_visible_cards()
-        if vis_cards:
-            self.select_all_var.set(all(cd.item.selected for cd in vis_cards))
+        self._sync_select_all()
+
+    def _set_item_status(self, item: MediaItem, status: str):
+        # off-screen items just record the status; it is rendered when scrolled into view
+        card = self.grid_view.card_for(item)
+        if card:
+            card.set_status(status)
+        else:
+            item.status = status
 
     def log_write(self, text: str):
         self.log.insert("end", f"{text}\n")
@@ -330,58 +542,74 @@ class SocialDownloaderApp(ctk.CTk):
         if self.downloading or not items:
             return
         self.downloading = True
-        self.cancel_download = False
-        total = len(items)
-        self.status.configure(text=f"Downloading {total} item(s)... (demo)")
+        self.cancel_event.clear()
+        self._dl_total = len(items)
+        self._dl_finished = 0
+        self._dl_canceled = 0
+        self.status.configure(text=f"Downloading {self._dl_total} item(s) × {self.max_concurrency} parallel... (demo)")
         self.progress.set(0)
 
         # ensure folder exists
         os.makedirs(self.output_dir, exist_ok=True)
 
-        # make an iterator state we can step with after()
-        state = {"i": 0, "total": total, "items": items}
-
-        def step():
-            if self.cancel_download:
-                self.status.configure(text="Canceled")
-                self.downloading = False
-                self.progress.set(0)
-                self.log_write("Download canceled.")
-                return
-
-            i = state["i"]
-            if i >= state["total"]:
-                self.status.configure(text="Done")
-                self.downloading = False
-                self.progress.set(1)
-                self.log_write("All done.")
-                return
-
-            item = state["items"][i]
-            card = next((c for c in self.cards if c.item.mid == item.mid), None)
-            if card:
-                card.set_status("downloading")
-
-            # simulate "saving a file" by writing a small placeholder image (for demo)
-            fake_filename = f"{item.title.replace(' ', '_')}{'.mp4' if item.mtype=='video' else '.jpg'}"
-            target = os.path.join(self.output_dir, fake_filename)
-            try:
-                # for the demo, save thumbnail as the "downloaded file"
-                item.thumb.save(target)
-                time.sleep(0.05)  # tiny delay to visualize progress
-                if card:
-                    card.set_status("done")
-                self.log_write(f"Saved → {target}")
-            except Exception as e:
-                if card:
-                    card.set_status("error")
-                self.log_write(f"Error saving {target}: {e}")
-
-            state["i"] += 1
-            self.progress.set(state["i"] / state["total"])
-            self.after(80, step)  # schedule next
-
-        step()
+        # workers only emit status events; the Tk loop renders them in _poll_downloads
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="download")
+        for item in items:
+            pool.submit(self._download_worker, item, self.output_dir)
+        pool.shutdown(wait=False)
+        self.after(50, self._poll_downloads)
+
+    def _download_worker(self, item: MediaItem, out_dir: str):
+        # Runs on a pool thread: no Tk calls here.
+        if self.cancel_event.is_set():
+            self.download_events.put((item, "canceled", None))
+            return
+        self.download_events.put((item, "downloading", None))
+
+        # simulate "saving a file" by writing a small placeholder image (for demo)
+        fake_filename = f"{item.title.replace(' ', '_')}{'.mp4' if item.mtype=='video' else '.jpg'}"
+        target = os.path.join(out_dir, fake_filename)
+        try:
+            # for the demo, save thumbnail as the "downloaded file"
+            with open(target, "wb") as fh:
+                fh.write(self.thumbs.get_bytes(item))
+            time.sleep(0.05)  # simulated transfer time, off the UI thread
+            self.download_events.put((item, "done", f"Saved → {target}"))
+        except Exception as e:
+            self.download_events.put((item, "error", f"Error saving {target}: {e}"))
+
+    def _poll_downloads(self):
+        try:
+            while True:
+                item, status, message = self.download_events.get_nowait()
+                if status == "canceled":
+                    self._dl_canceled += 1
+                    self._dl_finished += 1
+                    continue
+                self._set_item_status(item, status)
+                if status in ("done", "error"):
+                    self._dl_finished += 1
+                    self.log_write(message)
+        except queue.Empty:
+            pass
+
+        self.progress.set(self._dl_finished / self._dl_total)
+        if self._dl_finished < self._dl_total:
+            self.after(50, self._poll_downloads)
+            return
+
+        self.downloading = False
+        if self._dl_canceled:
+            self.status.configure(text="Canceled")
+            self.progress.set(0)
+            self.log_write(f"Download canceled ({self._dl_canceled} item(s) skipped).")
+        else:
+            self.status.configure(text="Done")
+            self.progress.set(1)
+            self.log_write("All done.")
+
+    def _change_concurrency(self, val: str):
+        self.max_concurrency = int(val)
 
     def download_selected(self):
         items = [it for it in self.items if it.selected]
@@ -401,7 +629,7 @@ class SocialDownloaderApp(ctk.CTk):
 
     def cancel_all(self):
         if self.downloading:
-            self.cancel_download = True
+            self.cancel_event.set()
 
 
 if __name__ == "__main__":
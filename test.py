@@ -8,7 +8,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from PySide6.QtCore import (
-    Qt, QSize, QUrl, Signal, QObject, QRunnable, QThreadPool, QTimer
+    Qt, QSize, QUrl, Signal, QObject, QRunnable, QThreadPool, QTimer, QStandardPaths
 )
 from PySide6.QtGui import QPixmap, QIcon, QAction
 from PySide6.QtWidgets import (
@@ -257,6 +257,10 @@ class HomePage(QWidget):
         self.urlEdit.setText(cb.text())
 
 
+def default_save_dir() -> str:
+    return QStandardPaths.writableLocation(QStandardPaths.DownloadLocation)
+
+
 class SettingsPage(QWidget):
     saveDirChanged = Signal(str)
 
@@ -310,9 +314,7 @@ class SettingsPage(QWidget):
         v.addStretch(1)
 
         # Default save path
-        from PySide6.QtCore import QStandardPaths
-        default = QStandardPaths.writableLocation(QStandardPaths.DownloadLocation)
-        self.pathLabel.setText(default)
+        self.pathLabel.setText(default_save_dir())
 
     def _chooseFolder(self):
         d = QFileDialog.getExistingDirectory(self, "Chọn thư mục lưu", self.pathLabel.text())
@@ -335,17 +337,11 @@ class MainWindow(FluentWindow):
         self.setWindowTitle("Media Downloader")
         self.resize(1040, 700)
         self.threadPool = QThreadPool.globalInstance()
-        self.saveDir = SettingsPage().__class__  # just to satisfy type hints
+        self.saveDir = default_save_dir()
 
-        # Pages
-        self.homePage = HomePage()
-        self.downloadsPage = DownloadsPage()
-        self.settingsPage = SettingsPage()
-        self.saveDir = self.settingsPage.pathLabel.text()
-
-        # Wire signals
-        self.homePage.requestDownload.connect(self.handleDownload)
-        self.settingsPage.saveDirChanged.connect(self._updateSaveDir)
+        # Pages: route -> factory, widget chỉ được tạo ở lần đầu mở route đó
+        self._pageFactories = {}
+        self._pages = {}
 
         # Navigation
         self.initNavigation()
@@ -358,7 +354,7 @@ class MainWindow(FluentWindow):
     #     # Optional: add a “New Download” button on title bar
     #     btn = ToolButton(FIF.ADD)
     #     btn.setToolTip("Tải mới")
-    #     btn.clicked.connect(lambda: self.stackedWidget.setCurrentWidget(self.homePage))
+    #     btn.clicked.connect(lambda: self.showPage("home"))
     #     self.addTitleBarWidget(btn, align=Qt.AlignRight)
 
     # def initNavigation(self):
@@ -375,19 +371,45 @@ class MainWindow(FluentWindow):
     #     )
 
     def initNavigation(self):
-        self.addSubInterface(self.homePage, FIF.HOME, "Trang chủ")
-        self.addSubInterface(self.downloadsPage, FIF.DOWNLOAD, "Tải xuống",
+        self.addSubInterface("home", self._buildHomePage, FIF.HOME, "Trang chủ")
+        self.addSubInterface("downloads", DownloadsPage, FIF.DOWNLOAD, "Tải xuống",
                              position=NavigationItemPosition.BOTTOM)
-        self.addSubInterface(self.settingsPage, FIF.SETTING, "Cài đặt",
+        self.addSubInterface("settings", self._buildSettingsPage, FIF.SETTING, "Cài đặt",
                              position=NavigationItemPosition.BOTTOM)
+        # Trang chủ dựng sau frame đầu tiên để khung cửa sổ hiện ngay
+        QTimer.singleShot(0, lambda: self.showPage("home"))
 
     # FluentWindow API wrappers
-    def addSubInterface(self, widget: QWidget, icon: FIF, text: str, position=NavigationItemPosition.TOP):
+    def addSubInterface(self, routeKey: str, factory, icon: FIF, text: str, position=NavigationItemPosition.TOP):
+        self._pageFactories[routeKey] = factory
         self.navigationInterface.addItem(
-            routeKey=text, icon=icon, text=text, onClick=lambda: self.stackedWidget.setCurrentWidget(widget),
+            routeKey=routeKey, icon=icon, text=text, onClick=lambda: self.showPage(routeKey),
             position=position
         )
-        self.stackedWidget.addWidget(widget)
+
+    def page(self, routeKey: str) -> QWidget:
+        """Trang của route, tạo ở lần gọi đầu tiên."""
+        w = self._pages.get(routeKey)
+        if w is None:
+            w = self._pageFactories[routeKey]()
+            self._pages[routeKey] = w
+            self.stackedWidget.addWidget(w)
+        return w
+
+    def showPage(self, routeKey: str):
+        self.stackedWidget.setCurrentWidget(self.page(routeKey))
+        self.navigationInterface.setCurrentItem(routeKey)
+
+    def _buildHomePage(self) -> HomePage:
+        page = HomePage()
+        page.requestDownload.connect(self.handleDownload)
+        return page
+
+    def _buildSettingsPage(self) -> SettingsPage:
+        page = SettingsPage()
+        page.pathLabel.setText(self.saveDir)
+        page.saveDirChanged.connect(self._updateSaveDir)
+        return page
 
     # -------------------------- Download Handling --------------------------
 
@@ -409,8 +431,8 @@ class MainWindow(FluentWindow):
 
         # Create UI item
         itemWidget = DownloadItemWidget(task)
-        self.downloadsPage.addDownloadItem(itemWidget)
-        self.stackedWidget.setCurrentWidget(self.downloadsPage)
+        self.page("downloads").addDownloadItem(itemWidget)
+        self.showPage("downloads")
 
         # Build worker (replace with real download logic)
         worker = DownloadWorker(task, dest_dir=self.saveDir)
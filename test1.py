@@ -11,10 +11,12 @@ from PySide6.QtWidgets import (
     QListWidgetItem, QSizePolicy, QListWidget, QScrollBar, QAbstractItemView
 )
 from qfluentwidgets import (
-    FluentWindow, NavigationItemPosition, setTheme, Theme, setThemeColor,
+    FluentWindow, NavigationItemPosition, setTheme, Theme, setThemeColor, qconfig,
     BodyLabel, CaptionLabel, ProgressBar, FluentIcon as FIF, isDarkTheme
 )
 
+from qss_theme import ThemeManager
+
 # ----------------- Theme helpers -----------------
 ACCENT = "#2563EB"  # blue-600
 
@@ -28,34 +30,34 @@ DARK = {
 }
 def palette(): return DARK if isDarkTheme() else LIGHT
 
-def apply_global_styles(widget: QWidget):
-    c = palette()
-    widget.setStyleSheet(f"""
+# QSS cho str.format(**palette, accent=...) — ThemeManager compile & cache mỗi palette đúng 1 lần
+QSS_TEMPLATE = """
     QListWidget {{ background: transparent; }}
     #DownloadItem {{
         border-radius: 12px;
-        background-color: {c['bg_card']};
-        border: 1px solid {c['border']};
+        background-color: {bg_card};
+        border: 1px solid {border};
     }}
-    #DownloadItem:hover {{ background-color: {c['bg_card_alt']}; }}
-    BodyLabel, QLabel {{ color: {c['text']}; }}
-    CaptionLabel {{ color: {c['subtext']}; }}
+    #DownloadItem:hover {{ background-color: {bg_card_alt}; }}
+    BodyLabel, QLabel {{ color: {text}; }}
+    CaptionLabel {{ color: {subtext}; }}
 
     QProgressBar {{
-        border: 1px solid {c['border']};
+        border: 1px solid {border};
         border-radius: 9px;
-        background: {c['bg_track']};
+        background: {bg_track};
         text-align: center;
         height: 18px;
-        color: {c['text']};
+        color: {text};
         font-weight: 600;
     }}
     QProgressBar::chunk {{
-        background-color: {ACCENT};
+        background-color: {accent};
         border-radius: 9px;
         margin: 0px;
     }}
-    """)
+"""
+
 
 # ----------------- Thumbnails nguồn (path hoặc base64) -----------------
 PNG1 = r"C:\source_code\tool-hub\pexels-hazardos-1535244.jpg"
@@ -216,7 +218,8 @@ class MainWindow(FluentWindow):
 
         self.downloadsPage = DownloadsPage()
         self.initNavigation()
-        apply_global_styles(self)
+        ThemeManager.install(self, QSS_TEMPLATE, {"light": dict(LIGHT, accent=ACCENT), "dark": dict(DARK, accent=ACCENT)},
+                             isDarkTheme, qconfig.themeChanged).watch_list(self.downloadsPage.list)
 
         QTimer.singleShot(200, self._populate_fake)
 
@@ -1,6 +1,14 @@
+import argparse
+import csv
+import hashlib
 import json
+import os
 import random
-import pandas as pd
+import warnings
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
 import sys
 sys.stdout.reconfigure(encoding="utf-8")
 
@@ -49,12 +57,162 @@ PROMPTS = [
 # 2. Exam Generator Class
 # ==============================
 
+class InfeasibleExamError(ValueError):
+    """Bộ prompt không đáp ứng được ensure_modes / n_questions với topic, level, lang đã chọn."""
+
+    def __init__(self, message, unmet_modes, n_selected):
+        super().__init__(message)
+        self.unmet_modes = unmet_modes
+        self.n_selected = n_selected
+
+
+class PromptUsage:
+    """
+    Số lần mỗi prompt đã được ra đề, lưu dạng array('I') theo chỉ số prompt (4 byte/prompt,
+    không phụ thuộc số đề đã sinh). Gắn vào OPIcExamGenerator(usage=...) để ưu tiên prompt ít dùng
+    giữa các đề của cùng một cohort; save()/load() để giữ lại giữa các lần chạy.
+    choices: số ứng viên rút thử mỗi lần chọn — lấy ứng viên ít dùng nhất (power of d choices),
+    nên chi phí mỗi câu là O(choices) bất kể kích thước pool hay số đề.
+    """
+
+    def __init__(self, prompts, counts=None, choices: int = 2):
+        self.template_ids = [p["template_id"] for p in prompts]
+        self._pos = {t: i for i, t in enumerate(self.template_ids)}
+        self.counts = array("I", counts if counts is not None else [0] * len(prompts))
+        if len(self.counts) != len(prompts):
+            raise ValueError(f"counts có {len(self.counts)} phần tử, bộ prompt có {len(prompts)}")
+        self.choices = max(1, choices)
+        self.n_exams = 0
+
+    def record(self, prompt_idxs):
+        counts = self.counts
+        for i in prompt_idxs:
+            counts[i] += 1
+        self.n_exams += 1
+
+    def record_rows(self, rows):
+        """Ghi nhận các dòng của generate_exams_bulk (cột EXAM_COLUMNS)."""
+        counts, pos = self.counts, self._pos
+        for r in rows:
+            counts[pos[r[2]]] += 1
+        self.n_exams += len({r[0] for r in rows})
+
+    def count(self, template_id: str) -> int:
+        return self.counts[self._pos[template_id]]
+
+    def reset(self):
+        self.counts = array("I", [0] * len(self.counts))
+        self.n_exams = 0
+
+    def save(self, path: str):
+        """JSON theo template_id (chỉ prompt đã dùng) — thêm/bớt/sắp lại prompt trong bank vẫn load đúng."""
+        data = {
+            "n_exams": self.n_exams,
+            "counts": {t: c for t, c in zip(self.template_ids, self.counts) if c},
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, prompts, choices: int = 2):
+        """Đọc file của save(); file chưa có -> bộ đếm rỗng. template_id không còn trong bank bị bỏ qua."""
+        usage = cls(prompts, choices=choices)
+        if not os.path.exists(path):
+            return usage
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for t, c in data.get("counts", {}).items():
+            i = usage._pos.get(t)
+            if i is not None:
+                usage.counts[i] = c
+        usage.n_exams = data.get("n_exams", 0)
+        return usage
+
+
 class OPIcExamGenerator:
-    def __init__(self, topics, prompts, rng_seed=None):
+    """
+    Prompt được index sẵn theo (topic_id, level, lang, mode) lúc khởi tạo (mỗi thành phần
+    có thể là ANY), nên mỗi lần chọn chỉ tra dict + lấy mẫu ngẫu nhiên, không quét lại
+    toàn bộ self.prompts. RNG là của riêng instance (không đụng tới module random global).
+    usage (PromptUsage, tuỳ chọn): nhớ prompt đã ra đề để các đề sau ưu tiên prompt ít dùng.
+    """
+
+    ANY = "*"
+
+    def __init__(self, topics, prompts, rng_seed=None, usage: PromptUsage | None = None):
         self.topics = topics
         self.prompts = prompts
-        if rng_seed:
-            random.seed(rng_seed)
+        self.rng = random.Random(rng_seed)
+        self.usage = usage
+        self._index = self._build_index(prompts)
+        self._topic_pools = {}  # (topic_id, level, lang) -> (lang key, số prompt)
+        # Phần cố định của mỗi dòng đề (trừ q_no), dựng sẵn 1 lần
+        self._rows = [{
+            "template_id": p["template_id"],
+            "topic_id": p["topic_id"],
+            "level": p["level"],
+            "mode": p.get("mode"),
+            "lang": p.get("lang", "en"),
+            "prompt_text": p["prompt_text"],
+            "time_limit_s": p.get("time_limit_s", 60),
+        } for p in prompts]
+
+    @classmethod
+    def _build_index(cls, prompts):
+        """(topic_id|ANY, level, lang|ANY, mode|ANY) -> [chỉ số prompt]"""
+        index = {}
+        for i, p in enumerate(prompts):
+            topic, lang, mode = p["topic_id"], p.get("lang"), p.get("mode")
+            for key in product((topic, cls.ANY), (p["level"],), (lang, cls.ANY), (mode, cls.ANY)):
+                index.setdefault(key, []).append(i)
+        return index
+
+    def _pool(self, topic, level, lang, mode=ANY):
+        return self._index.get((topic, level, lang, mode), ())
+
+    def _lang_key(self, topic, level, lang, en_taken=0):
+        """
+        Tương đương match_lang cũ: có lang thì lọc đúng lang; không có thì ưu tiên 'en'
+        nếu còn prompt 'en' chưa dùng (ngoài en_taken câu đã dành cho slot khác), ngược lại lấy mọi lang.
+        """
+        if lang:
+            return lang
+        return "en" if len(self._pool(topic, level, "en")) > en_taken else self.ANY
+
+    def _pick(self, pool, used, rng):
+        """
+        Chọn ngẫu nhiên 1 prompt chưa dùng trong pool.
+        used luôn nhỏ (<= n_questions) nên thử rút ngẫu nhiên vài lần gần như luôn trúng;
+        chỉ khi pool gần cạn mới quét (O(k) trên pool đó).
+        Có usage: rút usage.choices ứng viên, lấy cái ít được ra đề nhất (hoà thì cái rút trước).
+        """
+        n = len(pool)
+        if not n:
+            return None
+        usage = self.usage
+        if usage is None:
+            for _ in range(8):
+                i = pool[rng.randrange(n)]
+                if i not in used:
+                    return i
+            cands = [i for i in pool if i not in used]
+            return rng.choice(cands) if cands else None
+
+        counts = usage.counts
+        best = None
+        for _ in range(usage.choices):
+            i = pool[rng.randrange(n)]
+            if i not in used and (best is None or counts[i] < counts[best]):
+                best = i
+        if best is not None:
+            return best
+        cands = [i for i in pool if i not in used]
+        if not cands:
+            return None
+        low = min(counts[i] for i in cands)
+        return rng.choice([i for i in cands if counts[i] == low])
 
     def generate_exam(
         self,
@@ -63,134 +221,292 @@ class OPIcExamGenerator:
         n_questions: int = 12,
         ensure_modes=None,
         lang: str | None = None,
+        seed=None,
+        strict: bool = False,
     ):
-        ensure_modes = ensure_modes or []
+        """
+        Chọn đề trong 1 lượt: round-robin topic -> slot, ensure_modes gán vào slot bằng matching,
+        rồi mới rút prompt. seed: RNG riêng cho đề này (tái lập được), mặc định dùng self.rng.
+        Ràng buộc không thoả được (thiếu mode / không đủ câu): warning, hoặc InfeasibleExamError nếu strict.
+        Có self.usage thì đề trả về được ghi nhận vào bộ đếm.
+        """
+        ensure_modes = list(dict.fromkeys(ensure_modes or []))
         level = level.upper()
+        rng = self.rng if seed is None else random.Random(seed)
 
-        # ---- 1) Build pools ----
-        def match_lang(pool):
-            if lang:
-                pool = [p for p in pool if p.get("lang") == lang]
-            else:
-                pref_en = [p for p in pool if p.get("lang") == "en"]
-                pool = pref_en or pool
-            return pool
-
-        pools_by_topic = {}
-        for tid in selected_topic_ids:
-            pool = [p for p in self.prompts if p["topic_id"] == tid and p["level"] == level]
-            pool = match_lang(pool)
-            if pool:
-                pools_by_topic[tid] = pool[:]  # copy
-
-        # Nếu không có topic nào còn prompt hợp lệ, sẽ backfill toàn bộ
-        rr_topics = list(pools_by_topic.keys())
-        random.shuffle(rr_topics)
-
-        chosen = []
-        used_ids = set()
-        used_modes = set()
-
-        # ---- 2) Round-robin w/ progress check ----
-        while len(chosen) < n_questions and rr_topics:
-            progress = False
-            # duyệt 1 vòng
-            for tid in rr_topics[:]:  # copy vì có thể remove
-                pool = pools_by_topic.get(tid, [])
-                if not pool:
-                    rr_topics.remove(tid)
-                    continue
+        # ---- 1) Pools theo topic (tra index) ----
+        topic_lang = {}
+        capacity = {}
+        for tid in dict.fromkeys(selected_topic_ids):
+            key = (tid, level, lang)
+            if key not in self._topic_pools:
+                lk = self._lang_key(tid, level, lang)
+                self._topic_pools[key] = (lk, len(self._pool(tid, level, lk)))
+            lk, n = self._topic_pools[key]
+            if n:
+                topic_lang[tid] = lk
+                capacity[tid] = n
 
-                # ưu tiên mode còn thiếu
-                need_modes = [m for m in ensure_modes if m not in used_modes]
-                pick = None
-                if need_modes:
-                    candidates = [p for p in pool if p.get("mode") in need_modes and p["template_id"] not in used_ids]
-                    if candidates:
-                        pick = random.choice(candidates)
-
-                if pick is None:
-                    # lấy ngẫu nhiên cái chưa dùng
-                    candidates = [p for p in pool if p["template_id"] not in used_ids]
-                    pick = random.choice(candidates) if candidates else None
-
-                if pick:
-                    chosen.append(pick)
-                    used_ids.add(pick["template_id"])
-                    if pick.get("mode"):
-                        used_modes.add(pick["mode"])
-                    # remove khỏi pool topic để không lặp
-                    pools_by_topic[tid] = [p for p in pool if p["template_id"] != pick["template_id"]]
-                    if not pools_by_topic[tid]:
-                        rr_topics.remove(tid)
-                    progress = True
-
-                if len(chosen) >= n_questions or not rr_topics:
+        # ---- 2) Lập slot: round-robin qua các topic (tới khi hết prompt), phần thiếu là backfill ----
+        rr_topics = list(capacity)
+        rng.shuffle(rr_topics)
+        slots = []  # topic_id hoặc ANY (backfill)
+        while len(slots) < n_questions and rr_topics:
+            for tid in rr_topics[:]:
+                slots.append(tid)
+                capacity[tid] -= 1
+                if not capacity[tid]:
+                    rr_topics.remove(tid)
+                if len(slots) >= n_questions:
                     break
+        # Backfill: 'en' nếu pool 'en' còn dư sau khi các slot topic 'en' đã lấy phần của mình
+        en_taken = sum(1 for t in slots if topic_lang[t] == "en")
+        backfill_lang = self._lang_key(self.ANY, level, lang, en_taken)
+        n_topic_slots = len(slots)
+        slots += [self.ANY] * (n_questions - len(slots))
+        topic_lang[self.ANY] = backfill_lang
+        slot_lang = [topic_lang[t] for t in slots]
+        index = self._index
 
-            # nếu 1 vòng không thêm được gì → thoát để backfill
-            if not progress:
-                break
+        def slot_pool(s, mode=self.ANY):
+            return index.get((slots[s], level, slot_lang[s], mode), ())
 
-        # ---- 3) Backfill nếu còn thiếu ----
-        if len(chosen) < n_questions:
-            pool_any = [p for p in self.prompts if p["level"] == level and p["template_id"] not in used_ids]
-            pool_any = match_lang(pool_any)
-            random.shuffle(pool_any)
-            for p in pool_any:
-                if len(chosen) >= n_questions:
-                    break
-                chosen.append(p)
-                used_ids.add(p["template_id"])
-                if p.get("mode"):
-                    used_modes.add(p["mode"])
-
-        # ---- 4) Ép ensure_modes bằng thay thế (giới hạn) ----
-        missing = [m for m in ensure_modes if m not in used_modes]
-        if missing:
-            pool_any = [p for p in self.prompts if p["level"] == level and p["template_id"] not in used_ids]
-            pool_any = match_lang(pool_any)
-            # giới hạn số thay thế để an toàn
-            swaps_left = min(len(missing), 5)
-            for m in missing:
-                if swaps_left <= 0:
-                    break
-                cands = [p for p in pool_any if p.get("mode") == m]
-                if not cands or not chosen:
+        # ---- 3) Gán mode bắt buộc vào slot (matching trên bitmask) ----
+        # eligible[m]: bit s bật nếu slot s có prompt mode m. Greedy mode hiếm trước,
+        # repair bằng augmenting path (Kuhn) khi slot ưng ý đã bị mode khác giữ.
+        slot_bits = {}
+        for s, t in enumerate(slots):
+            slot_bits[t] = slot_bits.get(t, 0) | (1 << s)
+        eligible = {}
+        for m in ensure_modes:
+            mask = 0
+            for t, bits in slot_bits.items():
+                if (t, level, topic_lang[t], m) in index:
+                    mask |= bits
+            eligible[m] = mask
+        # Slot topic trước slot backfill (backfill lấy mode từ topic đã chọn sẽ "cướp" prompt của topic đó);
+        # trong mỗi nhóm xoay vòng từ vị trí ngẫu nhiên để mode không luôn rơi vào Q1, Q2...
+        k = rng.randrange(n_topic_slots) if ensure_modes and n_topic_slots else 0
+        slot_order = [*range(k, n_topic_slots), *range(k), *range(n_topic_slots, len(slots))]
+        assign = {}  # slot -> mode
+
+        def augment(m, seen):
+            for s in slot_order:
+                bit = 1 << s
+                if eligible[m] & bit and not seen[0] & bit:
+                    seen[0] |= bit
+                    if s not in assign or augment(assign[s], seen):
+                        assign[s] = m
+                        return True
+            return False
+
+        unmet = []
+        for m in sorted(ensure_modes, key=lambda m: bin(eligible[m]).count("1")):
+            if not augment(m, [0]):
+                unmet.append(m)
+
+        # Repair: mode không có trong slot nào nhưng có ở pool chung -> đổi 1 slot tự do
+        # (lấy từ cuối, tức backfill rồi tới topic đang nhiều câu nhất) thành backfill mode đó.
+        # Không chỉ định lang thì 'en' chỉ là ưu tiên: được lấy mode đó ở lang khác.
+        for m in unmet[:]:
+            lk = backfill_lang
+            if not self._pool(self.ANY, level, lk, m):
+                lk = self.ANY
+                if lang or not self._pool(self.ANY, level, lk, m):
                     continue
-                newq = random.choice(cands)
-                # thay ngẫu nhiên 1 câu khác mode (hoặc bất kỳ)
-                for _ in range(20):
-                    idx = random.randrange(len(chosen))
-                    if chosen[idx]["template_id"] != newq["template_id"]:
-                        used_ids.discard(chosen[idx]["template_id"])
-                        chosen[idx] = newq
-                        used_ids.add(newq["template_id"])
-                        used_modes.add(m)
-                        swaps_left -= 1
-                        break
+            free = [s for s in range(len(slots) - 1, -1, -1) if s not in assign]
+            if not free:
+                break
+            s = free[0]
+            slots[s], slot_lang[s] = self.ANY, lk
+            assign[s] = m
+            unmet.remove(m)
+
+        # ---- 4) Điền prompt ----
+        # Thứ tự: slot topic có mode -> slot topic tự do (capacity đã đếm nên luôn đủ) -> slot backfill
+        picks = [None] * len(slots)
+        used = set()
+        fill_order = sorted(range(len(slots)), key=lambda s: (slots[s] == self.ANY, s not in assign))
+        for s in fill_order:
+            mode = assign.get(s)
+            pick = self._pick(slot_pool(s, mode or self.ANY), used, rng)
+            if pick is None and mode:
+                # mode đã bị slot trước lấy hết prompt -> vẫn điền câu, báo thiếu mode
+                unmet.append(mode)
+                pick = self._pick(slot_pool(s), used, rng)
+            if pick is not None:
+                picks[s] = pick
+                used.add(pick)
+        chosen = [i for i in picks if i is not None]
+        if self.usage is not None:
+            self.usage.record(chosen)
+
+        if unmet or len(chosen) < n_questions:
+            msg = (f"Không thoả được ràng buộc đề (level={level}, lang={lang}): "
+                   f"thiếu mode {unmet or '-'}, {len(chosen)}/{n_questions} câu")
+            if strict:
+                raise InfeasibleExamError(msg, unmet, len(chosen))
+            warnings.warn(msg, stacklevel=2)
 
         # ---- 5) Đánh số thứ tự & trả về ----
-        exam = []
-        for i, p in enumerate(chosen[:n_questions], start=1):
-            exam.append({
-                "q_no": i,
-                "template_id": p["template_id"],
-                "topic_id": p["topic_id"],
-                "level": p["level"],
-                "mode": p.get("mode"),
-                "lang": p.get("lang", "en"),
-                "prompt_text": p["prompt_text"],
-                "time_limit_s": p.get("time_limit_s", 60),
-            })
-        return exam
+        rows = self._rows
+        return [{"q_no": q_no, **rows[i]} for q_no, i in enumerate(chosen[:n_questions], start=1)]
+
+
+# ==============================
+# 3. Bulk generation (process pool + streaming writer)
+# ==============================
+
+EXAM_COLUMNS = ["exam_id", "q_no", "template_id", "topic_id", "level", "mode", "lang", "prompt_text", "time_limit_s"]
+
+
+def exam_seed(master_seed, exam_id: int) -> int:
+    """Seed của từng đề suy ra từ master seed — ổn định giữa các process/lần chạy/phiên bản Python."""
+    digest = hashlib.blake2b(f"{master_seed}:{exam_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+_worker_generator = None
+
+
+def _init_worker(topics, prompts, usage_counts=None):
+    # Mỗi process build index đúng 1 lần; usage_counts: bản chụp bộ đếm của process cha
+    global _worker_generator
+    usage = PromptUsage(prompts, usage_counts) if usage_counts is not None else None
+    _worker_generator = OPIcExamGenerator(topics, prompts, usage=usage)
+
+
+def _generate_rows(start: int, stop: int, spec: dict, master_seed):
+    gen = _worker_generator
+    rows = []
+    for exam_id in range(start, stop):
+        for q in gen.generate_exam(**spec, seed=exam_seed(master_seed, exam_id)):
+            rows.append((exam_id, *(q[c] for c in EXAM_COLUMNS[1:])))
+    return rows
+
+
+def generate_exams_bulk(topics, prompts, spec: dict, n_exams: int, master_seed=0,
+                        workers: int | None = None, exams_per_task: int = 500,
+                        usage: PromptUsage | None = None):
+    """
+    Sinh n_exams đề theo spec (tham số của generate_exam) trên process pool.
+    Yield từng chunk list[tuple] theo thứ tự exam_id (cột = EXAM_COLUMNS). Đề thứ i luôn
+    giống nhau với cùng master_seed, bất kể số worker. Chỉ giữ tối đa ~2 task/worker
+    trong bộ nhớ nên RAM phẳng dù sinh hàng triệu câu.
+    usage: bộ đếm dùng chung cho cả lô. Mỗi worker bắt đầu từ bản chụp lúc mở pool cộng phần
+    nó tự sinh (cân bằng gần đúng giữa các worker); mọi đề đều được ghi vào usage ở process cha.
+    Có usage thì đề thứ i phụ thuộc cả trạng thái bộ đếm (và số worker), không chỉ master_seed.
+    """
+    ranges = ((a, min(a + exams_per_task, n_exams)) for a in range(0, n_exams, exams_per_task))
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        _init_worker(topics, prompts)
+        _worker_generator.usage = usage
+        for a, b in ranges:
+            yield _generate_rows(a, b, spec, master_seed)
+        return
+
+    def collect(fut):
+        rows = fut.result()
+        if usage is not None:
+            usage.record_rows(rows)
+        return rows
+
+    initargs = (topics, prompts, usage.counts if usage is not None else None)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+        pending = deque()
+        for a, b in ranges:
+            pending.append(pool.submit(_generate_rows, a, b, spec, master_seed))
+            if len(pending) >= workers * 2:
+                yield collect(pending.popleft())
+        while pending:
+            yield collect(pending.popleft())
+
+
+def write_exam_rows(path: str, chunks, fmt: str | None = None) -> int:
+    """Ghi chunk ra CSV hoặc Parquet (theo đuôi file hoặc fmt), không dựng DataFrame. Trả về số dòng."""
+    fmt = fmt or ("parquet" if path.lower().endswith(".parquet") else "csv")
+    n = 0
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(EXAM_COLUMNS)
+            for rows in chunks:
+                w.writerows(rows)
+                n += len(rows)
+        return n
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Ghi Parquet cần pyarrow: pip install pyarrow") from None
+    schema = pa.schema([
+        ("exam_id", pa.int64()), ("q_no", pa.int16()), ("template_id", pa.string()), ("topic_id", pa.string()),
+        ("level", pa.string()), ("mode", pa.string()), ("lang", pa.string()), ("prompt_text", pa.string()),
+        ("time_limit_s", pa.int32()),
+    ])
+    with pq.ParquetWriter(path, schema) as w:
+        for rows in chunks:
+            cols = list(zip(*rows)) if rows else [[] for _ in EXAM_COLUMNS]
+            w.write_table(pa.Table.from_arrays([pa.array(c, type=t) for c, t in zip(cols, schema.types)], schema=schema))
+            n += len(rows)
+    return n
+
+
+def load_bank(path: str | None):
+    """(topics, prompts) từ file JSON {"topics": [...], "prompts": [...]}; mặc định là bộ dữ liệu mẫu."""
+    if not path:
+        return TOPICS, PROMPTS
+    with open(path, encoding="utf-8") as f:
+        bank = json.load(f)
+    return bank.get("topics", []), bank["prompts"]
+
+
+def main_bulk(argv=None):
+    ap = argparse.ArgumentParser(prog="test_opic.py bulk", description="Sinh hàng loạt đề OPIc ra CSV/Parquet")
+    ap.add_argument("-n", "--n-exams", type=int, required=True)
+    ap.add_argument("-o", "--out", required=True, help="*.csv hoặc *.parquet")
+    ap.add_argument("--bank", help='JSON {"topics": [...], "prompts": [...]} (mặc định: dữ liệu mẫu)')
+    ap.add_argument("--topics", required=True, help="topic_id, cách nhau bởi dấu phẩy")
+    ap.add_argument("--level", required=True)
+    ap.add_argument("--n-questions", type=int, default=12)
+    ap.add_argument("--ensure-modes", default="", help="mode, cách nhau bởi dấu phẩy")
+    ap.add_argument("--lang")
+    ap.add_argument("--seed", type=int, default=0, help="master seed")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--exams-per-task", type=int, default=500)
+    ap.add_argument("--usage", metavar="FILE", help="bộ đếm prompt đã ra đề (JSON): đọc nếu có, ưu tiên prompt ít dùng, ghi lại khi xong")
+    args = ap.parse_args(argv)
+
+    topics, prompts = load_bank(args.bank)
+    spec = {
+        "selected_topic_ids": [t for t in args.topics.split(",") if t],
+        "level": args.level,
+        "n_questions": args.n_questions,
+        "ensure_modes": [m for m in args.ensure_modes.split(",") if m],
+        "lang": args.lang,
+    }
+    usage = PromptUsage.load(args.usage, prompts) if args.usage else None
+    chunks = generate_exams_bulk(topics, prompts, spec, args.n_exams, args.seed, args.workers, args.exams_per_task, usage)
+    try:
+        n = write_exam_rows(args.out, chunks)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    if usage is not None:
+        usage.save(args.usage)
+    print(f"Đã ghi {n} câu hỏi ({args.n_exams} đề) vào {args.out}")
 
 
 # ==============================
-# 3. Demo Usage
+# 4. Demo Usage
 # ==============================
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["bulk"]:
+        main_bulk(sys.argv[2:])
+        sys.exit(0)
+
     generator = OPIcExamGenerator(TOPICS, PROMPTS, rng_seed=42)
     selected_topics = ["prof_job_office","ft_movies_cinema","hb_cooking","hb_pets","tr_overseas_trip"]
     exam = generator.generate_exam(selected_topics, level="AL", n_questions=8, ensure_modes=["narrative","compare","roleplay"])
@@ -200,5 +516,6 @@ if __name__ == "__main__":
         print(f"Q{q['q_no']} [{q['mode']}]: {q['prompt_text']}")
 
     # Xuất ra CSV
+    import pandas as pd  # chỉ demo cần; worker của bulk không phải import pandas
     pd.DataFrame(exam).to_csv("opic_sample_exam.csv", index=False, encoding="utf-8")
     print("\nĐề thi mẫu đã được lưu vào opic_sample_exam.csv")
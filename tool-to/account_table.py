@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+# Shared account/target table model + search filter for the AutoComment demos (test2..test5)
+# - AccountTableController: model + proxy + debounced search + CSV import/export for one page
+# pip install PySide6 numpy (InfoBar notifications: PySide6-Fluent-Widgets)
+
+import csv
+import unicodedata
+
+import numpy as np
+from PySide6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QObject, QRunnable, Signal, QTimer, QThreadPool
+)
+from PySide6.QtWidgets import QFileDialog
+
+# -------------------------------
+# Search key normalization
+# -------------------------------
+
+# "đ" is a separate letter, not d + combining mark, so NFD alone doesn't fold it
+_VI_FOLD = str.maketrans({"đ": "d", "Đ": "D"})
+
+
+def normalize_search_text(text) -> str:
+    """casefold + strip diacritics: 'Nguyễn Hải Anh' -> 'nguyen hai anh'."""
+    s = unicodedata.normalize("NFD", str(text).translate(_VI_FOLD))
+    return "".join(ch for ch in s if not unicodedata.combining(ch)).casefold()
+
+
+# -------------------------------
+# Model
+# -------------------------------
+
+class CheckableTableModel(QAbstractTableModel):
+    """
+    Checkable first column + text columns, stored column-wise.
+
+    - check column: NumPy bool array, with a running checked counter (count_checked is O(1))
+    - text columns: one Python list per column (cheap scalar access from data())
+    Bulk operations are vectorized and emit a single range-based dataChanged.
+    """
+    def __init__(self, headers, rows, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        # rows: list of [checked(bool), STT, Live, Username, Name, UID]
+        self._checked = np.fromiter((bool(r[0]) for r in rows), dtype=bool, count=len(rows))
+        self._cols = [[r[c] for r in rows] for c in range(1, len(headers))]
+        self._n_checked = int(self._checked.sum())
+        # UID column (relative to self._cols) + hash set for O(1) dedupe on import
+        self._uid_col = (headers.index("UID") if "UID" in headers else len(headers) - 1) - 1
+        self._uids = set(str(u) for u in self._cols[self._uid_col])
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._checked)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+
+        if col == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if self._checked[row] else Qt.Unchecked
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return ""
+            return None
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._cols[col - 1][row]
+
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        row, col = index.row(), index.column()
+
+        if col == 0 and role == Qt.CheckStateRole:
+            new = (value == Qt.Checked)
+            if new != self._checked[row]:
+                self._checked[row] = new
+                self._n_checked += 1 if new else -1
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            return True
+
+        if role == Qt.EditRole and col > 0:
+            self._cols[col - 1][row] = value
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+            return True
+        return False
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable | Qt.ItemIsSelectable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return section + 1
+
+    # ----- check column (vectorized) -----
+    def _emit_checks(self, first: int, last: int):
+        if last >= first:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, 0), [Qt.CheckStateRole])
+
+    def set_all_checked(self, checked: bool):
+        self._checked[:] = checked
+        self._n_checked = len(self._checked) if checked else 0
+        self._emit_checks(0, self.rowCount() - 1)
+
+    def invert_checked(self):
+        np.logical_not(self._checked, out=self._checked)
+        self._n_checked = len(self._checked) - self._n_checked
+        self._emit_checks(0, self.rowCount() - 1)
+
+    def set_rows_checked(self, rows, checked: bool):
+        """Check/uncheck a set of source rows (e.g. the rows passing the current filter)."""
+        idx = np.asarray(rows, dtype=np.intp)
+        if idx.size == 0:
+            return
+        before = int(np.count_nonzero(self._checked[idx]))
+        self._checked[idx] = checked
+        self._n_checked += (idx.size - before) if checked else -before
+        self._emit_checks(int(idx.min()), int(idx.max()))
+
+    def count_checked(self):
+        return self._n_checked
+
+    def checked_rows(self) -> np.ndarray:
+        return np.flatnonzero(self._checked)
+
+    def row_text(self, row: int) -> str:
+        """All text columns of a row joined - used to build the search key."""
+        return " ".join(str(col[row]) for col in self._cols)
+
+    # ----- bulk rows -----
+    def uid_snapshot(self) -> frozenset:
+        return frozenset(self._uids)
+
+    def append_rows(self, records, checked: bool = False) -> int:
+        """
+        Append records (dicts keyed by header name, STT is generated) in ONE
+        beginInsertRows/endInsertRows. Rows whose UID already exists are skipped.
+        Returns the number of rows added.
+        """
+        names = self.headers[1:]
+        fresh = []
+        for rec in records:
+            uid = str(rec.get("UID", ""))
+            if not uid or uid in self._uids:
+                continue
+            self._uids.add(uid)
+            fresh.append(rec)
+        if not fresh:
+            return 0
+
+        first = self.rowCount()
+        last = first + len(fresh) - 1
+        self.beginInsertRows(QModelIndex(), first, last)
+        for c, name in enumerate(names):
+            col = self._cols[c]
+            if name == "STT":
+                col.extend(range(first + 1, last + 2))
+            else:
+                col.extend(rec.get(name, "") for rec in fresh)
+        self._checked = np.concatenate((self._checked, np.full(len(fresh), checked, dtype=bool)))
+        if checked:
+            self._n_checked += len(fresh)
+        self.endInsertRows()
+        return len(fresh)
+
+    def iter_rows(self, rows=None):
+        """Yield [STT, Live, ...] lists for export without building a second table."""
+        n = self.rowCount()
+        cols = self._cols
+        for r in (range(n) if rows is None else rows):
+            yield [col[r] for col in cols]
+
+
+# -------------------------------
+# Filter proxy
+# -------------------------------
+
+class AccountFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filters rows by a substring of the normalized row text.
+
+    Each source row's search key is normalized once (on load/insert/edit), and
+    setFilterText() computes a match mask in one pass. When the new needle extends
+    the previous one (typing), only rows that matched before are re-tested.
+    filterAcceptsRow() is then a list lookup.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys: list = []
+        self._mask: list = []
+        self._needle = ""
+
+    # ----- source wiring -----
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            old.modelReset.disconnect(self._rebuild_keys)
+            old.rowsInserted.disconnect(self._on_rows_inserted)
+            old.rowsRemoved.disconnect(self._rebuild_keys)
+            old.dataChanged.disconnect(self._on_data_changed)
+        super().setSourceModel(model)
+        model.modelReset.connect(self._rebuild_keys)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsRemoved.connect(self._rebuild_keys)
+        model.dataChanged.connect(self._on_data_changed)
+        self._rebuild_keys()
+
+    def _source_key(self, row: int) -> str:
+        src = self.sourceModel()
+        if hasattr(src, "row_text"):
+            return normalize_search_text(src.row_text(row))
+        return normalize_search_text(" ".join(
+            str(src.index(row, c).data(Qt.DisplayRole) or "") for c in range(1, src.columnCount())
+        ))
+
+    def _rebuild_keys(self, *_):
+        src = self.sourceModel()
+        n = src.rowCount() if src is not None else 0
+        self._keys = [self._source_key(r) for r in range(n)]
+        self._recompute_mask(full=True)
+
+    def _ensure_keys(self, upto: int):
+        # rowsInserted reaches the base proxy before our slot; compute missing keys on demand
+        while len(self._keys) <= upto:
+            row = len(self._keys)
+            key = self._source_key(row)
+            self._keys.append(key)
+            self._mask.append(self._needle in key)
+
+    def _on_rows_inserted(self, parent, first, last):
+        if len(self._keys) == self.sourceModel().rowCount():
+            return  # appended rows were already keyed on demand by filterAcceptsRow
+        if first >= len(self._keys):
+            self._ensure_keys(last)
+            return
+        # inserted mid-table: row numbers shifted, the base proxy filtered with stale keys
+        self._rebuild_keys()
+        if self._needle:
+            self.invalidateFilter()
+
+    def _on_data_changed(self, topLeft, bottomRight, roles=()):
+        if roles and Qt.DisplayRole not in roles and Qt.EditRole not in roles:
+            return  # check-state toggles don't change the search key
+        for r in range(topLeft.row(), bottomRight.row() + 1):
+            if r < len(self._keys):
+                self._keys[r] = self._source_key(r)
+                self._mask[r] = self._needle in self._keys[r]
+        if self._needle:
+            self.invalidateFilter()
+
+    # ----- filtering -----
+    def _recompute_mask(self, full: bool):
+        needle = self._needle
+        if not needle:
+            self._mask = [True] * len(self._keys)
+        elif full or len(self._mask) != len(self._keys):
+            self._mask = [needle in k for k in self._keys]
+        else:
+            keys = self._keys
+            self._mask = [m and needle in keys[i] for i, m in enumerate(self._mask)]
+
+    def setFilterText(self, text: str):
+        needle = normalize_search_text(text.strip())
+        if needle == self._needle:
+            return
+        narrowing = bool(self._needle) and needle.startswith(self._needle)
+        self._needle = needle
+        self._recompute_mask(full=not narrowing)
+        self.invalidateFilter()
+
+    def filterText(self) -> str:
+        return self._needle
+
+    def accepted_source_rows(self) -> np.ndarray:
+        """Source row numbers currently passing the filter."""
+        if not self._needle:
+            return np.arange(len(self._keys), dtype=np.intp)
+        return np.flatnonzero(np.fromiter(self._mask, dtype=bool, count=len(self._mask)))
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        if source_row >= len(self._keys):
+            self._ensure_keys(source_row)
+        return self._mask[source_row]
+
+
+# -------------------------------
+# Bulk import / export (streaming, on QThreadPool)
+# -------------------------------
+
+IMPORT_CHUNK = 5000
+TXT_FIELDS = ("UID", "Username", "Name", "Live")  # headerless lines: uid|username|name|live
+
+
+def _sniff_delimiter(line: str) -> str:
+    for d in ("|", "\t", ",", ";"):
+        if d in line:
+            return d
+    return ","
+
+
+def iter_account_records(path: str):
+    """
+    Stream account records from a CSV/TXT file, one dict per line.
+    - A first line containing a "uid" column is treated as a header (columns mapped by name).
+    - Otherwise lines are positional: uid|username|name|live (any of | , ; or tab).
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        first = fh.readline()
+        if not first:
+            return
+        delim = _sniff_delimiter(first)
+        head = next(csv.reader([first], delimiter=delim))
+        lowered = [h.strip().lower() for h in head]
+        if "uid" in lowered:
+            canon = {"uid": "UID", "username": "Username", "name": "Name", "live": "Live"}
+            fields = [canon.get(h, h) for h in lowered]
+        else:
+            fields = list(TXT_FIELDS)
+            fh.seek(0)
+        for row in csv.reader(fh, delimiter=delim):
+            if not row:
+                continue
+            rec = {f: v.strip() for f, v in zip(fields, row)}
+            rec.setdefault("Live", "Live")
+            yield rec
+
+
+class AccountImportSignals(QObject):
+    chunk = Signal(list)          # list[dict] – append on the GUI thread via model.append_rows
+    finished = Signal(int, int)   # (rows read, duplicates skipped in file)
+    error = Signal(str)
+
+
+class AccountImportWorker(QRunnable):
+    """
+    Worker: đọc file tài khoản theo từng chunk (không nạp cả file vào RAM),
+    loại trùng UID bằng hash set, gửi từng chunk về GUI thread.
+    """
+    def __init__(self, path: str, known_uids=frozenset(), chunk_size: int = IMPORT_CHUNK):
+        super().__init__()
+        self.path = path
+        self.known_uids = known_uids
+        self.chunk_size = chunk_size
+        self.s = AccountImportSignals()
+        self._canceled = False
+
+    def cancel(self):
+        self._canceled = True
+
+    def run(self):
+        try:
+            seen = set()
+            buf, read, dupes = [], 0, 0
+            for rec in iter_account_records(self.path):
+                if self._canceled:
+                    break
+                read += 1
+                uid = rec.get("UID", "")
+                if not uid or uid in seen or uid in self.known_uids:
+                    dupes += 1
+                    continue
+                seen.add(uid)
+                buf.append(rec)
+                if len(buf) >= self.chunk_size:
+                    self.s.chunk.emit(buf)
+                    buf = []
+            if buf and not self._canceled:
+                self.s.chunk.emit(buf)
+            self.s.finished.emit(read, dupes)
+        except Exception as e:
+            self.s.error.emit(str(e))
+
+
+class AccountExportSignals(QObject):
+    finished = Signal(int)        # rows written
+    error = Signal(str)
+
+
+class AccountExportWorker(QRunnable):
+    """Worker: ghi bảng ra CSV theo luồng (writerows trên generator, không dựng bản sao)."""
+    def __init__(self, model: CheckableTableModel, path: str, rows=None):
+        super().__init__()
+        self.model = model
+        self.path = path
+        # snapshot of row numbers to export (e.g. checked_rows()); None = all rows present now
+        self.rows = list(range(model.rowCount())) if rows is None else list(rows)
+        self.s = AccountExportSignals()
+
+    def run(self):
+        try:
+            written = 0
+            with open(self.path, "w", encoding="utf-8", newline="") as fh:
+                w = csv.writer(fh)
+                w.writerow(self.model.headers[1:])
+                it = self.model.iter_rows(self.rows)
+                while True:
+                    batch = [row for _, row in zip(range(IMPORT_CHUNK), it)]
+                    if not batch:
+                        break
+                    w.writerows(batch)
+                    written += len(batch)
+            self.s.finished.emit(written)
+        except Exception as e:
+            self.s.error.emit(str(e))
+
+
+# -------------------------------
+# Page controller
+# -------------------------------
+
+class AccountTableController(QObject):
+    """
+    Phần dùng chung của các trang AutoComment: model + proxy lọc gắn vào `table`,
+    ô tìm kiếm debounce, nhập/xuất file trên QThreadPool. Trang giữ controller làm
+    `self.accounts` và nối nút/checkbox header vào các method bên dưới.
+    """
+    SEARCH_DEBOUNCE_MS = 150
+
+    def __init__(self, table, headers, rows, page):
+        super().__init__(page)
+        self.page = page
+        self.model = CheckableTableModel(headers, rows, page)
+        # Filter qua proxy: key tìm kiếm (bỏ dấu) được tính sẵn cho từng dòng
+        self.proxy = AccountFilterProxyModel(page)
+        self.proxy.setSourceModel(self.model)
+        table.setModel(self.proxy)
+        self._pendingSearch = ""
+        self._searchTimer = QTimer(self)
+        self._searchTimer.setSingleShot(True)
+        self._searchTimer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._searchTimer.timeout.connect(lambda: self.proxy.setFilterText(self._pendingSearch))
+        # QRunnable đang chạy: giữ tham chiếu để signals không bị thu hồi giữa chừng
+        self._importWorker = None
+        self._exportWorker = None
+
+    def set_search_text(self, text: str, immediate: bool = False):
+        """Lọc bảng sau khi ngừng gõ SEARCH_DEBOUNCE_MS (immediate: lọc ngay)."""
+        self._pendingSearch = text
+        if immediate:
+            self._searchTimer.stop()
+            self.proxy.setFilterText(text)
+        else:
+            self._searchTimer.start()
+
+    def set_visible_checked(self, checked: bool):
+        """Chọn/bỏ chọn các dòng đang hiển thị (theo bộ lọc), vector hoá trên model."""
+        if self.proxy.filterText():
+            self.model.set_rows_checked(self.proxy.accepted_source_rows(), checked)
+        else:
+            self.model.set_all_checked(checked)
+
+    def import_accounts(self):
+        """Nhập CSV/TXT lớn: đọc theo chunk ở worker, model chèn từng lô (beginInsertRows)."""
+        path, _ = QFileDialog.getOpenFileName(self.page, "Nhập danh sách tài khoản", "", "Accounts (*.csv *.txt);;Tất cả (*)")
+        if not path:
+            return
+        worker = AccountImportWorker(path, self.model.uid_snapshot())
+        worker.s.chunk.connect(self.model.append_rows)
+        worker.s.finished.connect(lambda read, dupes: self._notify(
+            "success", "Đã nhập", f"Đọc {read} dòng • bỏ qua {dupes} UID trùng"))
+        worker.s.error.connect(lambda msg: self._notify("error", "Lỗi nhập file", msg))
+        self._importWorker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def export_accounts(self):
+        """Xuất các dòng đã chọn (hoặc toàn bộ nếu chưa chọn dòng nào) ra CSV."""
+        path, _ = QFileDialog.getSaveFileName(self.page, "Xuất danh sách tài khoản", "accounts.csv", "CSV (*.csv)")
+        if not path:
+            return
+        rows = self.model.checked_rows() if self.model.count_checked() else None
+        worker = AccountExportWorker(self.model, path, rows)
+        worker.s.finished.connect(lambda n: self._notify("success", "Đã xuất", f"{n} dòng → {path}"))
+        worker.s.error.connect(lambda msg: self._notify("error", "Lỗi xuất file", msg))
+        self._exportWorker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _notify(self, kind: str, title: str, content: str):
+        from qfluentwidgets import InfoBar, InfoBarPosition
+        getattr(InfoBar, kind)(
+            title=title, content=content,
+            orient=Qt.Horizontal, isClosable=True, position=InfoBarPosition.TOP_RIGHT,
+            duration=3000 if kind == "success" else 4000, parent=self.page
+        )
@@ -15,16 +15,22 @@ from PySide6.QtWidgets import (
 )
 
 from qfluentwidgets import (
-    FluentWindow, NavigationItemPosition, setTheme, Theme, setThemeColor,
+    FluentWindow, NavigationItemPosition, setTheme, Theme, setThemeColor, qconfig,
     BodyLabel, CaptionLabel, ProgressBar, FluentIcon as FIF, isDarkTheme,
     LineEdit, PrimaryPushButton, InfoBar, InfoBarPosition,
     IndeterminateProgressBar
 )
 
+# qss_theme.py, extract_cache.py dùng chung ở thư mục gốc repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extract_cache import split_urls
+from qss_theme import ThemeManager
+
 from PySide6.QtWidgets import QScrollArea
 
 MAX_VISIBLE_ITEMS = 4
 CARD_HEIGHT = 120  # chiều cao thực tế 1 card ~120px → bạn có thể chỉnh lại nếu khác
+MAX_PARALLEL_FETCH = 8  # dán nhiều URL: số worker phân tích chạy cùng lúc (chủ yếu chờ mạng)
 
 
 # ----------------- Theme & Styles -----------------
@@ -44,42 +50,41 @@ DARK = {
 def palette(): return DARK if isDarkTheme() else LIGHT
 
 
-def apply_global_styles(widget: QWidget):
-    c = palette()
-    widget.setStyleSheet(f"""
+# QSS cho str.format(**palette, accent=...) — ThemeManager compile & cache mỗi palette đúng 1 lần
+QSS_TEMPLATE = """
     QListWidget {{ background: transparent; border: none; }}
     #ControlBar {{
         border-radius: 12px;
-        background-color: {c['bg_card']};
-        border: 1px solid {c['border']};
+        background-color: {bg_card};
+        border: 1px solid {border};
     }}
     #DownloadItem {{
         border-radius: 12px;
-        background-color: {c['bg_card']};
-        border: 1px solid {c['border']};
+        background-color: {bg_card};
+        border: 1px solid {border};
     }}
-    #DownloadItem:hover {{ background-color: {c['bg_card_alt']}; }}
+    #DownloadItem:hover {{ background-color: {bg_card_alt}; }}
 
     #LoadingCard {{
         border-radius: 14px;
-        background-color: {c['bg_card']};
-        border: 1px solid {c['border']};
+        background-color: {bg_card};
+        border: 1px solid {border};
     }}
 
-    BodyLabel, QLabel {{ color: {c['text']}; }}
-    CaptionLabel {{ color: {c['subtext']}; }}
+    BodyLabel, QLabel {{ color: {text}; }}
+    CaptionLabel {{ color: {subtext}; }}
 
     QProgressBar {{
-        border: 1px solid {c['border']};
+        border: 1px solid {border};
         border-radius: 9px;
-        background: {c['bg_track']};
+        background: {bg_track};
         text-align: center;
         height: 18px;
-        color: {c['text']};
+        color: {text};
         font-weight: 600;
     }}
     QProgressBar::chunk {{
-        background-color: {ACCENT};
+        background-color: {accent};
         border-radius: 9px;
         margin: 0px;
     }}
@@ -87,10 +92,10 @@ def apply_global_styles(widget: QWidget):
     QPushButton, QToolButton {{
         cursor: pointinghand;
     }}
-    """)
+"""
+
 
 # ----------------- Helpers -----------------
-URL_RE = re.compile(r"^https?://", re.IGNORECASE)
 
 THUMB_W, THUMB_H = 160, 90
 THUMB_RADIUS = 10  # bo góc nhẹ
@@ -415,12 +420,19 @@ class DownloadItemWidget(QFrame):
 
 # ----------------- Dialog chọn video -----------------
 class VideoSelectionDialog(QDialog):
-    def __init__(self, options: List[VideoOption], parent=None):
+    """
+    pending > 0: mở ngay khi bắt đầu phân tích nhiều URL, card của từng URL được thêm dần
+    qua addOptions()/addError() khi worker tương ứng xong.
+    """
+    def __init__(self, options: List[VideoOption], parent=None, pending: int = 0):
         super().__init__(parent)
         self.setWindowTitle("Chọn video để tải")
         self.resize(720, 480)
-        self.options = options
+        self.options = list(options)
         self.selected_options: List[VideoOption] = []
+        self.total = pending
+        self.pending = pending
+        self.failed = 0
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(16, 16, 16, 16)
@@ -430,11 +442,15 @@ class VideoSelectionDialog(QDialog):
         titleLbl.setStyleSheet("font-size:16px; font-weight:700;")
         layout.addWidget(titleLbl)
 
+        self.statusLbl = CaptionLabel("")
+        self.statusLbl.setVisible(pending > 0)
+        layout.addWidget(self.statusLbl)
+
         # ----------------------------
         # 1) Tạo widget wrap chứa list
         # ----------------------------
         contentWidget = QFrame()
-        contentLayout = QVBoxLayout(contentWidget)
+        contentLayout = self.contentLayout = QVBoxLayout(contentWidget)
         contentLayout.setContentsMargins(0, 0, 0, 0)
         contentLayout.setSpacing(8)
 
@@ -459,8 +475,8 @@ class VideoSelectionDialog(QDialog):
         # Cuộn mượt
         scroll.verticalScrollBar().setSingleStep(20)
 
-        # Giới hạn chiều cao: hiển thị tối đa 4 items
-        visible_items = min(MAX_VISIBLE_ITEMS, len(options))
+        # Giới hạn chiều cao: hiển thị tối đa 4 items (thêm dần thì giữ sẵn chỗ, khỏi nhảy kích thước)
+        visible_items = MAX_VISIBLE_ITEMS if pending else min(MAX_VISIBLE_ITEMS, len(options))
         scroll.setFixedHeight(visible_items * CARD_HEIGHT + 10)
 
         # add vào layout
@@ -468,12 +484,55 @@ class VideoSelectionDialog(QDialog):
 
         # Nút
         btnBox = QDialogButtonBox()
-        btnBox.addButton("Download", QDialogButtonBox.AcceptRole)
+        self.downloadBtn = btnBox.addButton("Download", QDialogButtonBox.AcceptRole)
         btnBox.addButton("Hủy", QDialogButtonBox.RejectRole)
         btnBox.accepted.connect(self._on_accept)
         btnBox.rejected.connect(self.reject)
 
         layout.addWidget(btnBox)
+        self._update_status()
+
+    # ----------------------------
+    # Kết quả của từng URL đổ về dần
+    # ----------------------------
+    def addOptions(self, url: str, options: List[VideoOption]):
+        self.pending -= 1
+        if not options:
+            self.addNote(f"{url} — API không trả về video nào")
+            self.failed += 1
+        else:
+            self.addNote(url)
+            for opt in options:
+                self.options.append(opt)
+                self._insert(self._create_card(opt))
+        self._update_status()
+
+    def addError(self, url: str, msg: str):
+        self.pending -= 1
+        self.failed += 1
+        self.addNote(f"{url} — lỗi: {msg}")
+        self._update_status()
+
+    def addNote(self, text: str):
+        lbl = CaptionLabel(text)
+        lbl.setWordWrap(True)
+        self._insert(lbl)
+
+    def _insert(self, widget: QWidget):
+        # trước stretch cuối
+        self.contentLayout.insertWidget(self.contentLayout.count() - 1, widget)
+
+    def _update_status(self):
+        self.downloadBtn.setEnabled(bool(self.checkboxes))
+        if not self.total:
+            return
+        done = self.total - self.pending
+        text = f"Đã phân tích {done}/{self.total} URL"
+        if self.failed:
+            text += f" · {self.failed} lỗi"
+        if self.pending:
+            text += " · đang phân tích tiếp, có thể chọn tải ngay"
+        self.statusLbl.setText(text)
 
     # ----------------------------
     # Tạo 1 card video như cũ
@@ -561,6 +620,7 @@ class VideoSelectionDialog(QDialog):
 class DownloadsPage(QWidget):
     """Trang chính: ControlBar (nhập URL) + Danh sách tải."""
     addTaskRequested = Signal(str)
+    addTasksRequested = Signal(list)  # nhiều URL (đã chuẩn hoá, bỏ trùng)
 
     def __init__(self):
         super().__init__()
@@ -581,8 +641,8 @@ class DownloadsPage(QWidget):
         cb.setContentsMargins(14, 12, 14, 12)
         cb.setSpacing(10)
 
-        self.urlEdit = LineEdit(self)
-        self.urlEdit.setPlaceholderText("Dán URL video/ảnh… (YouTube, TikTok, Facebook, …)")
+        self.urlEdit = UrlLineEdit(self)
+        self.urlEdit.setPlaceholderText("Dán một hay nhiều URL video/ảnh, hoặc kéo thả file .txt… (YouTube, TikTok, Facebook, …)")
         self.urlEdit.setMinimumWidth(420)
         self.urlEdit.returnPressed.connect(self._emit_add_task)
 
@@ -617,8 +677,7 @@ class DownloadsPage(QWidget):
         v.addWidget(self.list, 1)
 
     def _emit_add_task(self):
-        url = self.urlEdit.text().strip()
-        urls = user_url_parser(url)
+        urls = user_url_parser(self.urlEdit.text())
         if not urls:
             InfoBar.error(
                 title="URL không hợp lệ",
@@ -629,8 +688,10 @@ class DownloadsPage(QWidget):
             )
             return
 
-        # hiện tại chỉ xử lý URL đơn lẻ
-        self.addTaskRequested.emit(url)
+        if len(urls) == 1:
+            self.addTaskRequested.emit(urls[0])
+        else:
+            self.addTasksRequested.emit(urls)
         self.urlEdit.clear()
 
     def addDownloadItem(self, widget: DownloadItemWidget):
@@ -643,14 +704,50 @@ class DownloadsPage(QWidget):
         self.list.setItemWidget(item, widget)
 
 # ----------------- URL parser -----------------
-def user_url_parser(user_url: str):
+def user_url_parser(user_url: str) -> Optional[List[str]]:
     """
-    Đơn giản: chỉ chấp nhận URL http/https.
-    Sau này nếu muốn hỗ trợ file .txt chứa nhiều URL thì mở rộng thêm.
+    Nhận một hoặc nhiều URL http/https, ngăn cách bằng xuống dòng / dấu cách (dấu phẩy chỉ khi ngay
+    sau là http(s):// — bên trong URL dấu phẩy/chấm phẩy là hợp lệ).
+    Chuẩn hoá rồi bỏ trùng (giữ thứ tự dán) bằng extract_cache.split_urls; chữ không phải URL thì bỏ qua.
+    Không có URL nào -> None.
     """
-    if not user_url or not URL_RE.search(user_url):
-        return None
-    return [user_url]
+    return split_urls(user_url, require_scheme=True) or None
+
+
+def read_url_file(path: str, limit: int = 1 << 20) -> str:
+    """Nội dung file .txt (danh sách URL) được kéo thả vào ô nhập; file hỏng/quá lớn -> ""."""
+    try:
+        if os.path.getsize(path) > limit:
+            return ""
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+class UrlLineEdit(LineEdit):
+    """Ô nhập URL nhận kéo thả: link từ trình duyệt hoặc file .txt chứa danh sách URL."""
+
+    def dragEnterEvent(self, e):
+        if e.mimeData().hasUrls():
+            e.acceptProposedAction()
+        else:
+            super().dragEnterEvent(e)
+
+    def dropEvent(self, e):
+        md = e.mimeData()
+        if not md.hasUrls():
+            return super().dropEvent(e)
+        parts = []
+        for u in md.urls():
+            if u.isLocalFile():
+                parts.append(read_url_file(u.toLocalFile()))
+            else:
+                parts.append(u.toString())
+        # nối thêm vào nội dung đang có, mỗi URL cách nhau một dấu cách
+        text = " ".join([self.text().strip()] + [" ".join(p.split()) for p in parts]).strip()
+        self.setText(text)
+        e.acceptProposedAction()
 
 # ----------------- Main Window -----------------
 class MainWindow(FluentWindow):
@@ -665,6 +762,12 @@ class MainWindow(FluentWindow):
 
         self.downloadsPage = DownloadsPage()
         self.downloadsPage.addTaskRequested.connect(self.add_task_from_url)
+        self.downloadsPage.addTasksRequested.connect(self.add_tasks_from_urls)
+
+        # pool riêng cho phân tích nhiều URL: giới hạn song song, không tranh slot với các task tải
+        self.fetchPool = QThreadPool(self)
+        self.fetchPool.setMaxThreadCount(MAX_PARALLEL_FETCH)
+        self.fetchWorkers = set()  # giữ worker (autoDelete=False) sống tới khi run() trả về
 
         # dialog loading riêng cho việc load URL
         self.loadingDialog = UrlLoadingDialog(self, "Đang phân tích URL…")
@@ -672,7 +775,8 @@ class MainWindow(FluentWindow):
         self.currentFetchWorker: Optional[FetchVideoListWorker] = None
 
         self.initNavigation()
-        apply_global_styles(self)
+        ThemeManager.install(self, QSS_TEMPLATE, {"light": dict(LIGHT, accent=ACCENT), "dark": dict(DARK, accent=ACCENT)},
+                             isDarkTheme, qconfig.themeChanged).watch_list(self.downloadsPage.list)
 
     def initNavigation(self):
         self.addSubInterface(self.downloadsPage, FIF.DOWNLOAD, "Tải xuống",
@@ -777,6 +881,50 @@ class MainWindow(FluentWindow):
 
         self.threadPool.start(worker)
 
+    def add_tasks_from_urls(self, urls: List[str]):
+        """
+        Nhiều URL: mỗi URL một FetchVideoListWorker trên fetchPool (tối đa MAX_PARALLEL_FETCH chạy
+        cùng lúc), dialog chọn mở ngay và URL nào xong trước thì card hiện trước -> tổng thời gian
+        xấp xỉ URL chậm nhất thay vì cộng dồn.
+        """
+        dlg = VideoSelectionDialog([], parent=self, pending=len(urls))
+        pending = {}  # url -> worker chưa xong
+
+        for url in urls:
+            worker = FetchVideoListWorker(url)
+            worker.setAutoDelete(False)  # còn giữ để cancel/tryTake sau khi dialog đóng
+            pending[url] = worker
+            self.fetchWorkers.add(worker)
+
+            def on_finished(options: List[VideoOption], u=url, w=worker):
+                self.fetchWorkers.discard(w)
+                if pending.pop(u, None) is not None:
+                    dlg.addOptions(u, options)
+
+            def on_error(msg: str, u=url, w=worker):
+                self.fetchWorkers.discard(w)
+                if pending.pop(u, None) is not None:
+                    dlg.addError(u, msg)
+
+            worker.s.finished.connect(on_finished)
+            worker.s.error.connect(on_error)
+            worker.s.canceled.connect(lambda w=worker: self.fetchWorkers.discard(w))
+            self.fetchPool.start(worker)
+
+        accepted = dlg.exec() == QDialog.Accepted
+
+        # Đóng dialog (tải luôn hoặc Hủy): URL còn đang phân tích thì dừng, chưa chạy thì rút khỏi hàng đợi
+        for worker in pending.values():
+            if self.fetchPool.tryTake(worker):
+                self.fetchWorkers.discard(worker)
+            else:
+                worker.cancel()
+        pending.clear()
+
+        if accepted and dlg.selected_options:
+            for opt in dlg.selected_options:
+                self.start_download_task_from_option(opt)
+
     def _on_loading_canceled(self):
         """User bấm Dừng trên dialog."""
         if self.currentFetchWorker is not None:
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Lazy page registry cho các MainWindow (test2..test5)
+# - Mỗi route đăng ký một factory; widget chỉ được tạo ở lần điều hướng đầu tiên
+# - Factory tự import module nặng (account_table -> numpy, ...) nên cold start không phải trả giá đó
+# - run_after_first_paint(): dựng trang đầu tiên SAU khi cửa sổ đã vẽ khung (nav + topbar)
+
+from typing import Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QEvent, QTimer
+from PySide6.QtWidgets import QStackedWidget, QWidget
+
+
+class PageRegistry:
+    """route_key -> factory. Widget được build một lần rồi giữ trong QStackedWidget."""
+
+    def __init__(self, stack: QStackedWidget, fallback: Optional[str] = None):
+        self.stack = stack
+        self.fallback = fallback
+        self._factories: Dict[str, Callable[[], QWidget]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._pages: Dict[str, QWidget] = {}
+
+    def register(self, route_key: str, factory: Callable[[], QWidget]):
+        self._factories[route_key] = factory
+
+    def alias(self, route_key: str, target: str):
+        """Nhiều route dùng chung một trang (vd. các route demo chưa có trang riêng)."""
+        self._aliases[route_key] = target
+
+    def resolve(self, route_key: str) -> Optional[str]:
+        key = self._aliases.get(route_key, route_key)
+        if key in self._factories:
+            return key
+        return self.fallback if self.fallback in self._factories else None
+
+    def peek(self, route_key: str) -> Optional[QWidget]:
+        """Trang đã build (hoặc None) — không bao giờ build."""
+        key = self.resolve(route_key)
+        return self._pages.get(key) if key else None
+
+    def page(self, route_key: str) -> Optional[QWidget]:
+        key = self.resolve(route_key)
+        if key is None:
+            return None
+        w = self._pages.get(key)
+        if w is None:
+            w = self._factories[key]()
+            self._pages[key] = w
+            self.stack.addWidget(w)
+        return w
+
+    def show(self, route_key: str) -> Optional[QWidget]:
+        w = self.page(route_key)
+        if w is not None and self.stack.currentWidget() is not w:
+            self.stack.setCurrentWidget(w)
+        return w
+
+    def built(self):
+        return list(self._pages)
+
+
+class _FirstPaintFilter(QObject):
+    def __init__(self, target: QWidget, callback: Callable[[], None]):
+        super().__init__(target)
+        self._callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # Không chạy trong paintEvent — để vòng lặp sự kiện trả khung hình trước
+            QTimer.singleShot(0, self._callback)
+            self.deleteLater()
+        return False
+
+
+def run_after_first_paint(window: QWidget, callback: Callable[[], None]):
+    window.installEventFilter(_FirstPaintFilter(window, callback))
@@ -18,6 +18,8 @@ from qfluentwidgets import (
     CardWidget, TitleLabel, SubtitleLabel, setTheme, Theme
 )
 
+from account_table import normalize_search_text
+
 # ===============================
 # Helpers
 # ===============================
@@ -54,6 +56,8 @@ class AutoCommentPage(QWidget):
         super().__init__(parent)
         self.setObjectName("AutoCommentPage")  # ✅ BẮT BUỘC cho addSubInterface
 
+        self._rowKeys: List[str] = []   # key tìm kiếm đã chuẩn hoá (bỏ dấu) cho từng dòng
+        self._hidden: List[bool] = []
         self._build_ui()
         self._bind()
 
@@ -185,22 +189,31 @@ class AutoCommentPage(QWidget):
         root.addLayout(mid)
 
     def _bind(self):
-        self.search.textChanged.connect(self._filter_table)
+        self._searchTimer = QTimer(self)
+        self._searchTimer.setSingleShot(True)
+        self._searchTimer.setInterval(150)
+        self._searchTimer.timeout.connect(lambda: self._filter_table(self.search.text()))
+        self.search.textChanged.connect(lambda _: self._searchTimer.start())
         self.table.itemSelectionChanged.connect(self._update_sel_hint)
         self.btnStart.clicked.connect(self.start_run)
         self.btnStop.clicked.connect(self.stop_run)
 
     # ---------- Data & Behaviors ----------
     def _populate_table(self, rows: List[tuple[str, str, str, str]]):
+        # cấp phát số dòng một lần + tắt repaint, thay vì insertRow từng dòng
+        self.table.setUpdatesEnabled(False)
         self.table.setRowCount(0)
-        for i, (live, username, name, uid) in enumerate(rows, start=1):
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-            self.table.setItem(r, 0, QTableWidgetItem(str(i)))
+        self.table.setRowCount(len(rows))
+        for r, (live, username, name, uid) in enumerate(rows):
+            self.table.setItem(r, 0, QTableWidgetItem(str(r + 1)))
             self.table.setItem(r, 1, QTableWidgetItem(live))
             self.table.setItem(r, 2, QTableWidgetItem(username))
             self.table.setItem(r, 3, QTableWidgetItem(name))
             self.table.setItem(r, 4, QTableWidgetItem(uid))
+        self.table.setUpdatesEnabled(True)
+        self._rowKeys = [normalize_search_text(" ".join((str(i), live, username, name, uid)))
+                         for i, (live, username, name, uid) in enumerate(rows, start=1)]
+        self._hidden = [False] * len(self._rowKeys)
         self._update_sel_hint()
 
     def _update_sel_hint(self):
@@ -209,13 +222,13 @@ class AutoCommentPage(QWidget):
         self.selHint.setText(f"{count} dòng được chọn.")
 
     def _filter_table(self, text: str):
-        t = text.lower().strip()
-        for r in range(self.table.rowCount()):
-            visible = any(
-                t in (self.table.item(r, c).text().lower() if self.table.item(r, c) else "")
-                for c in range(self.table.columnCount())
-            ) if t else True
-            self.table.setRowHidden(r, not visible)
+        t = normalize_search_text(text.strip())
+        # chỉ gọi setRowHidden cho những dòng thay đổi trạng thái
+        for r, key in enumerate(self._rowKeys):
+            hide = bool(t) and t not in key
+            if hide != self._hidden[r]:
+                self._hidden[r] = hide
+                self.table.setRowHidden(r, hide)
 
     def _pick_files(self):
         files, _ = QFileDialog.getOpenFileNames(
@@ -2,13 +2,13 @@
 # Full demo: PySide6 + qfluentwidgets (tối giản icon, căn font)
 # pip install PySide6 qfluentwidgets
 
-from PySide6.QtCore import Qt, QRect, QAbstractTableModel, QModelIndex, QSize, Signal
+from PySide6.QtCore import Qt, QRect, QModelIndex, QSize, Signal
 from PySide6.QtGui import QAction, QFont
 from PySide6.QtWidgets import (
     QApplication, QWidget, QMainWindow, QHBoxLayout, QVBoxLayout, QGridLayout,
     QSplitter, QFrame, QLabel, QTableView, QHeaderView,
     QStyledItemDelegate, QStyleOptionButton, QStyle, QStyleOptionViewItem,
-    QAbstractItemView, QToolButton, QSpinBox, QTextEdit, QMenu, QFileDialog
+    QAbstractItemView, QToolButton, QSpinBox, QTextEdit, QMenu, QFileDialog, QStackedWidget
 )
 
 from qfluentwidgets import (
@@ -18,83 +18,13 @@ from qfluentwidgets import (
     CardWidget, TitleLabel, SubtitleLabel, BodyLabel, ComboBox
 )
 
+# account_table (kéo theo numpy) được import trễ trong AutoCommentPage
+from page_registry import PageRegistry, run_after_first_paint
+
 # -------------------------------
 # Helpers & custom components
 # -------------------------------
 
-class CheckableTableModel(QAbstractTableModel):
-    """Simple model with checkable first column and text data for the rest."""
-    def __init__(self, headers, rows, parent=None):
-        super().__init__(parent)
-        self.headers = headers
-        # rows: list of [checked(bool), STT, Live, Username, Name, UID]
-        self.rows = [[bool(r[0])] + r[1:] for r in rows]
-
-    def rowCount(self, parent=QModelIndex()):
-        return len(self.rows)
-
-    def columnCount(self, parent=QModelIndex()):
-        return len(self.headers)
-
-    def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
-            return None
-        row, col = index.row(), index.column()
-
-        if col == 0:
-            if role == Qt.CheckStateRole:
-                return Qt.Checked if self.rows[row][0] else Qt.Unchecked
-            if role in (Qt.DisplayRole, Qt.EditRole):
-                return ""
-            return None
-
-        if role in (Qt.DisplayRole, Qt.EditRole):
-            return self.rows[row][col]
-
-        return None
-
-    def setData(self, index, value, role=Qt.EditRole):
-        if not index.isValid():
-            return False
-        row, col = index.row(), index.column()
-
-        if col == 0 and role == Qt.CheckStateRole:
-            self.rows[row][0] = (value == Qt.Checked)
-            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
-            return True
-
-        if role == Qt.EditRole and col > 0:
-            self.rows[row][col] = value
-            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
-            return True
-        return False
-
-    def flags(self, index):
-        if not index.isValid():
-            return Qt.NoItemFlags
-        if index.column() == 0:
-            return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable | Qt.ItemIsSelectable
-        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
-
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role != Qt.DisplayRole:
-            return None
-        if orientation == Qt.Horizontal:
-            return self.headers[section]
-        return section + 1
-
-    def set_all_checked(self, checked: bool):
-        for r in range(len(self.rows)):
-            self.rows[r][0] = checked
-        if self.rowCount() > 0:
-            topLeft = self.index(0, 0)
-            bottomRight = self.index(self.rowCount()-1, 0)
-            self.dataChanged.emit(topLeft, bottomRight, [Qt.CheckStateRole])
-
-    def count_checked(self):
-        return sum(1 for r in self.rows if r[0])
-
-
 class HeaderSelectAll(QHeaderView):
     """Tri-state checkbox in header section 0 (select all / none / partial)."""
     stateChanged = Signal(Qt.CheckState)
@@ -270,6 +200,12 @@ class AutoCommentPage(QWidget):
             b.setFixedHeight(28)
         headRow.addWidget(self.actAll)
         headRow.addWidget(self.actNone)
+        self.importBtn = PushButton("Nhập file")
+        self.exportBtn = PushButton("Xuất file")
+        for b in (self.importBtn, self.exportBtn):
+            b.setFixedHeight(28)
+        headRow.addWidget(self.importBtn)
+        headRow.addWidget(self.exportBtn)
         cLay.addLayout(headRow)
 
         # Bảng
@@ -301,8 +237,12 @@ class AutoCommentPage(QWidget):
             [False, 2, "Live", "maihoa_2103",          "Mai Hoa",        "1029384756"],
             [True,  3, "Live", "user_alpha",           "User Alpha",     "5566778899"],
         ]
-        self.model = CheckableTableModel(headers, rows, self)
-        self.table.setModel(self.model)
+        from account_table import AccountTableController
+        # model + proxy lọc + tìm kiếm debounce + nhập/xuất file: dùng chung trong account_table.py
+        self.accounts = AccountTableController(self.table, headers, rows, self)
+        self.model, self.proxy = self.accounts.model, self.accounts.proxy
+        self.importBtn.clicked.connect(self.accounts.import_accounts)
+        self.exportBtn.clicked.connect(self.accounts.export_accounts)
 
         header = HeaderSelectAll(Qt.Horizontal, self.table)
         self.table.setHorizontalHeader(header)
@@ -325,11 +265,11 @@ class AutoCommentPage(QWidget):
             self.badgeSelected.setText(f"{checked} / {total} đã chọn")
 
         update_header_state()
-        header.stateChanged.connect(lambda st: (self.model.set_all_checked(st == Qt.Checked), update_header_state()))
+        header.stateChanged.connect(lambda st: (self.accounts.set_visible_checked(st == Qt.Checked), update_header_state()))
         self.model.dataChanged.connect(lambda *_: update_header_state())
 
-        self.actAll.clicked.connect(lambda: (self.model.set_all_checked(True), update_header_state()))
-        self.actNone.clicked.connect(lambda: (self.model.set_all_checked(False), update_header_state()))
+        self.actAll.clicked.connect(lambda: (self.accounts.set_visible_checked(True), update_header_state()))
+        self.actNone.clicked.connect(lambda: (self.accounts.set_visible_checked(False), update_header_state()))
 
         cLay.addWidget(self.table)
 
@@ -648,12 +588,10 @@ class MainWindow(QMainWindow):
         rightLay.addWidget(topBar)
 
         # Stack
-        self.stack = QFrame()
-        self.stackLay = QVBoxLayout(self.stack)
-        self.stackLay.setContentsMargins(0, 0, 0, 0)
-        self.stackLay.setSpacing(0)
-        self.autoCommentPage = AutoCommentPage()
-        self.stackLay.addWidget(self.autoCommentPage)
+        # Trang được dựng ở lần điều hướng đầu tiên (route chưa có trang riêng -> auto-comment)
+        self.stack = QStackedWidget()
+        self.pages = PageRegistry(self.stack, fallback="auto-comment")
+        self.pages.register("auto-comment", self._buildAutoCommentPage)
         rightLay.addWidget(self.stack, 1)
 
         splitter.addWidget(self.nav)
@@ -662,11 +600,13 @@ class MainWindow(QMainWindow):
 
         # Hooks
         actLogout.triggered.connect(self._logout)
-        self.searchEdit.textChanged.connect(self._debouncedSearchText)
+        self.searchEdit.textChanged.connect(self._onSearchText)
 
         # chọn mặc định
         self.nav.setCurrentItem("auto-comment")
-        self.stack_set("auto-comment")
+        self._route = "auto-comment"
+        # Khung (nav + topbar) hiện trước, trang đầu dựng ngay sau frame đầu tiên
+        run_after_first_paint(self, lambda: self.stack_set(self._route))
 
     def _logout(self):
         InfoBar.info(
@@ -675,26 +615,25 @@ class MainWindow(QMainWindow):
             orient=Qt.Horizontal, isClosable=True, position=InfoBarPosition.TOP_RIGHT, duration=2500, parent=self
         )
 
-    def _debouncedSearchText(self, text: str):
-        if not text:
-            return
-        InfoBar.success(
-            title="Tìm kiếm",
-            content=f"Từ khóa: “{text}” (fake)",
-            orient=Qt.Horizontal, isClosable=True, position=InfoBarPosition.TOP_RIGHT, duration=1200, parent=self
-        )
+    def _onSearchText(self, text: str):
+        """Lọc bảng tài khoản của trang hiện tại (debounce nằm trong AccountTableController)."""
+        page = self.pages.peek("auto-comment")
+        if page is not None:
+            page.accounts.set_search_text(text)
 
     def stack_set(self, route_key: str):
-        """Chuyển trang theo route_key. Demo: luôn hiển thị AutoCommentPage."""
+        """Chuyển trang theo route_key (dựng lazy qua PageRegistry; route chưa có trang riêng -> AutoCommentPage)."""
         # đặt tiêu đề theo route_key
         self.titleLabel.setText(self.ROUTE_TITLES.get(route_key, route_key))
-
-        # Nếu có nhiều trang, xử lý if/elif theo route_key ở đây.
-        while self.stackLay.count():
-            w = self.stackLay.takeAt(0).widget()
-            if w:
-                w.setParent(None)
-        self.stackLay.addWidget(self.autoCommentPage)
+        self._route = route_key
+        self.pages.show(route_key)
+
+    def _buildAutoCommentPage(self):
+        page = AutoCommentPage()
+        # Người dùng có thể đã gõ tìm kiếm trước khi trang kịp dựng
+        if self.searchEdit.text():
+            page.accounts.set_search_text(self.searchEdit.text(), immediate=True)
+        return page
 
 
 # -------------------------------
@@ -13,6 +13,26 @@ Tool Hub - All-in-one Social Media Downloader (CustomTkinter + yt-dlp)
 📦 Phụ thuộc
     pip install customtkinter yt-dlp pillow requests
 
+⏱ Khởi động
+- yt-dlp / Pillow / requests chỉ được import ở lần Phân tích đầu tiên
+  (và được nạp trước ở thread nền ngay sau khi cửa sổ hiện; tắt bằng --no-prewarm)
+- python tool_hub.py --profile-startup  -> bảng thời gian import tới lúc cửa sổ hiện
+
+⚡ Phân tích sớm (tuỳ chọn: công tắc "Phân tích sớm" hoặc --speculative)
+- Dán / gõ xong URL hợp lệ (debounce) là bắt đầu: chuẩn hoá URL, phân giải DNS, extract_info
+  + tải thumbnail ở nền; kết quả vào ExtractionCache (extract_cache.py)
+- Bấm Phân tích: dùng luôn kết quả đã có, hoặc chờ tiếp lần extract đang chạy (không chạy lại)
+
+🧩 Extractor process (extract_workers.py)
+- extract_info chạy trong ANALYZE_PARALLEL worker process sống lâu, mỗi process giữ sẵn một YoutubeDL;
+  GUI chỉ nhận lại bản info rút gọn qua pipe -> cửa sổ không khựng, nhiều link dàn ra nhiều core
+- Quá ANALYZE_TIMEOUT giây thì giết + dựng lại worker; worker chết thì dựng lại và thử lại một lần
+- --extract-workers N  (0 = chạy trong process GUI như trước)
+
+📋 Nhiều link một lần
+- Dán nhiều URL vào ô (xuống dòng / dấu cách; dấu phẩy chỉ khi ngay sau là http(s)://): chuẩn hoá + bỏ trùng, phân tích song song
+  (ANALYZE_PARALLEL cùng lúc); link nào xong trước hiện trước, chọn qua menu "Kết quả"
+
 📌 Khuyến nghị
 - Nên cài đặt FFmpeg trong PATH để hợp nhất audio+video chất lượng cao hơn:
   https://ffmpeg.org/download.html
@@ -22,35 +42,110 @@ Tool Hub - All-in-one Social Media Downloader (CustomTkinter + yt-dlp)
 - Tôn trọng bản quyền và Điều khoản Dịch vụ của từng nền tảng.
 """
 
+import time
+_T0 = time.perf_counter()
+
 import os
+import io
 import sys
 import re
 import json
 import queue
 import threading
 import webbrowser
+from importlib.util import find_spec
 from urllib.parse import urlparse
 from datetime import datetime
+from concurrent.futures import as_completed
+from functools import partial
+from typing import Optional
+
+from extract_cache import ExtractionCache, canonical_url, split_urls
+from extract_workers import ExtractorPool
 
 # GUI
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
 
-# Optional preview
-try:
-    from PIL import Image
-    import io
-    import requests
-    PIL_AVAILABLE = True
-except Exception:
-    PIL_AVAILABLE = False
-
-# Downloader
-import yt_dlp as ytdlp
+# Optional preview — chỉ kiểm tra có cài hay không, import thật ở load_preview_deps()
+PIL_AVAILABLE = find_spec("PIL") is not None and find_spec("requests") is not None
 
 APP_NAME = "Tool Hub - Social Downloader"
 VERSION = "1.0.0"
+SPECULATE_DEBOUNCE_MS = 600  # gõ tay: chờ ngừng gõ chừng này rồi mới phân tích sớm
+ANALYZE_PARALLEL = 4  # dán nhiều link: số extract_info chạy cùng lúc (chủ yếu chờ mạng)
+ANALYZE_TIMEOUT = 90.0  # extractor process treo quá lâu -> giết, dựng lại, báo lỗi
+
+# ---------------------------- Lazy deps ----------------------------
+# yt_dlp nạp hàng trăm extractor khi import; PIL + requests cũng mất vài trăm ms.
+# Import lặp lại chỉ là tra sys.modules, và import lock của Python đã lo trường hợp
+# thread prewarm và thread Analyze cùng import một lúc.
+
+def load_ytdlp():
+    import yt_dlp
+    return yt_dlp
+
+def load_preview_deps():
+    """(Image, requests) hoặc None nếu thiếu Pillow/requests."""
+    if not PIL_AVAILABLE:
+        return None
+    try:
+        from PIL import Image
+        import requests
+    except Exception:
+        return None
+    return Image, requests
+
+def prewarm_deps(ytdlp: bool = True):
+    """Nạp trước các module nặng ở thread nền để lần Phân tích đầu không phải chờ."""
+    def _run():
+        try:
+            if ytdlp:
+                load_ytdlp()
+            load_preview_deps()
+        except Exception:
+            pass  # Analyze sẽ báo lỗi thật nếu thiếu yt-dlp
+    threading.Thread(target=_run, name="prewarm-deps", daemon=True).start()
+
+# ---------------------------- Extract ----------------------------
+
+ANALYZE_OPTS = {
+    "skip_download": True,
+    "quiet": True,
+    "nocheckcertificate": True,
+    "cachedir": False,
+    "extract_flat": False,
+}
+
+def extract_media(url: str, extractors: Optional[ExtractorPool] = None) -> dict:
+    """
+    Job của ExtractionCache (chạy ở thread nền, không đụng widget):
+    {"info": dict yt-dlp, "thumb": bytes thumbnail | None}
+    extractors: extract_info chạy trong worker process (extract_workers.py), thread này chỉ chờ pipe;
+    None -> chạy ngay trong process GUI như cũ.
+    """
+    if extractors is not None:
+        info = extractors.extract(url)
+    else:
+        with load_ytdlp().YoutubeDL(ANALYZE_OPTS) as ydl:
+            info = ydl.extract_info(url, download=False)
+    thumb = None
+    preview = load_preview_deps()
+    if info is not None and preview:
+        _, requests = preview
+        entry = info
+        if info.get("_type") == "playlist" and info.get("entries"):
+            entry = info["entries"][0]
+        thumb_url = (entry.get("thumbnail") or (entry.get("thumbnails") or [{}])[-1].get("url"))
+        if thumb_url:
+            try:
+                resp = requests.get(thumb_url, timeout=10)
+                resp.raise_for_status()
+                thumb = resp.content
+            except Exception:
+                pass
+    return {"info": info, "thumb": thumb}
 
 # ---------------------------- Utils ----------------------------
 
@@ -72,6 +167,13 @@ def detect_domain(url: str) -> str:
     except Exception:
         return ""
 
+def first_entry(info):
+    """Playlist -> mục đầu tiên (cho đơn giản); None nếu không có gì."""
+    if info and info.get("_type") == "playlist":
+        entries = info.get("entries") or []
+        return entries[0] if entries else None
+    return info
+
 def default_download_dir():
     home = os.path.expanduser("~")
     for d in ("Downloads", "Download", "Tải về"):
@@ -87,7 +189,7 @@ def sanitize_filename(name: str) -> str:
 # ---------------------------- App ----------------------------
 
 class ToolHubApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, prewarm: bool = True, speculative: bool = False, extract_workers: int = ANALYZE_PARALLEL):
         super().__init__()
         self.title(APP_NAME)
         self.geometry("980x720")
@@ -103,11 +205,26 @@ class ToolHubApp(ctk.CTk):
         self.format_map = {}  # label -> format_id
         self.selected_format = tk.StringVar(value="best")
         self.info_json = None
+        self.current_url = ""
+        self.results = {}  # dán nhiều link: label -> (url, info, thumb)
+        self.result_var = tk.StringVar(value="")
         self.stop_flag = threading.Event()
         self.progress_queue = queue.Queue()
+        self.speculative_var = tk.BooleanVar(value=speculative)
+        # extract_info chạy ở các process riêng: regex/JSON của yt-dlp không giành GIL với Tk
+        self.extractors = ExtractorPool(ANALYZE_OPTS, extract_workers, ANALYZE_TIMEOUT) if extract_workers > 0 else None
+        self.extract_cache = ExtractionCache(partial(extract_media, extractors=self.extractors),
+                                             max_workers=ANALYZE_PARALLEL, maxsize=64)
+        self._speculate_after = None
+        self.url_var.trace_add("write", self._on_url_changed)
 
         self._build_ui()
         self._poll_progress()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        if prewarm:
+            # Đợi cửa sổ vẽ xong rồi mới nạp yt-dlp (tốn CPU/GIL) ở nền; có worker process thì
+            # yt-dlp nạp bên đó, process GUI chỉ nạp khi bấm Tải về
+            self.after(300, lambda: self._prewarm())
 
     # ---------------------------- UI ----------------------------
     def _build_ui(self):
@@ -137,7 +254,11 @@ class ToolHubApp(ctk.CTk):
         clear_btn.pack(side="left", padx=6)
 
         analyze_btn = ctk.CTkButton(url_row, text="Phân tích", width=120, command=self._analyze_url_threaded)
-        analyze_btn.pack(side="left", padx=(6,12))
+        analyze_btn.pack(side="left", padx=6)
+
+        spec_switch = ctk.CTkSwitch(url_row, text="Phân tích sớm", variable=self.speculative_var,
+                                    command=self._on_url_changed)
+        spec_switch.pack(side="left", padx=(6,12))
 
         # Directory row
         dir_row = ctk.CTkFrame(self, corner_radius=16)
@@ -161,7 +282,14 @@ class ToolHubApp(ctk.CTk):
         # Left: meta + formats + actions
         meta_frame = ctk.CTkFrame(left, corner_radius=16)
         meta_frame.pack(fill="x", padx=12, pady=(12, 8))
-        ctk.CTkLabel(meta_frame, textvariable=self.title_var, font=("Inter", 16, "bold"), anchor="w", justify="left").pack(fill="x", padx=12, pady=(10,4))
+        # Chọn kết quả (chỉ hiện khi dán nhiều link)
+        self.result_row = ctk.CTkFrame(meta_frame, fg_color="transparent")
+        ctk.CTkLabel(self.result_row, text="Kết quả:").pack(side="left", padx=(0, 6))
+        self.result_menu = ctk.CTkOptionMenu(self.result_row, values=[""], variable=self.result_var,
+                                             command=self._on_result_selected, dynamic_resizing=False)
+        self.result_menu.pack(side="left", fill="x", expand=True)
+        self.title_label = ctk.CTkLabel(meta_frame, textvariable=self.title_var, font=("Inter", 16, "bold"), anchor="w", justify="left")
+        self.title_label.pack(fill="x", padx=12, pady=(10,4))
         ctk.CTkLabel(meta_frame, textvariable=self.meta_var, font=("Inter", 13), text_color=("gray70", "gray80"), anchor="w", justify="left").pack(fill="x", padx=12, pady=(0,10))
 
         # Thumbnail (optional)
@@ -215,6 +343,17 @@ class ToolHubApp(ctk.CTk):
 
     # ---------------------------- Handlers ----------------------------
 
+    def _prewarm(self):
+        if self.extractors is not None:
+            self.extractors.start()
+        prewarm_deps(ytdlp=self.extractors is None)
+
+    def _on_close(self):
+        if self.extractors is not None:
+            self.extractors.close()
+        self.extract_cache.shutdown()
+        self.destroy()
+
     def _switch_theme(self, mode: str):
         ctk.set_appearance_mode(mode)
 
@@ -223,13 +362,33 @@ class ToolHubApp(ctk.CTk):
             txt = self.clipboard_get()
             self.url_var.set(txt.strip())
         except Exception:
-            pass
+            return
+        # Dán là đã có URL trọn vẹn: không cần chờ debounce
+        self._speculate()
+
+    def _on_url_changed(self, *_):
+        if self._speculate_after is not None:
+            self.after_cancel(self._speculate_after)
+            self._speculate_after = None
+        if self.speculative_var.get():
+            self._speculate_after = self.after(SPECULATE_DEBOUNCE_MS, self._speculate)
+
+    def _speculate(self):
+        self._speculate_after = None
+        if not self.speculative_var.get():
+            return
+        key = canonical_url(self.url_var.get())
+        if key and self.extract_cache.peek(key) is None:
+            self.extract_cache.speculate(key)
+            self._log(f"[Speculate] {key}\n")
 
     def _clear_url(self):
         self.url_var.set("")
         self.title_var.set("")
         self.meta_var.set("")
         self.info_json = None
+        self.current_url = ""
+        self._set_results([])
         self.format_map.clear()
         self.format_menu.configure(values=["best"])
         self.format_menu.set("best")
@@ -269,53 +428,112 @@ class ToolHubApp(ctk.CTk):
         t.start()
 
     def _analyze_url(self):
-        url = (self.url_var.get() or "").strip()
-        if not url:
+        text = (self.url_var.get() or "").strip()
+        if not text:
             messagebox.showwarning("Thiếu URL", "Vui lòng dán URL cần tải.")
             return
+        # Một ô nhận nhiều link (xuống dòng / dấu cách, xem split_urls); link trùng sau chuẩn hoá chỉ phân tích một lần
+        urls = split_urls(text) or [text]
+        if len(urls) > 1:
+            self._analyze_many(urls)
+            return
+        url = urls[0]
 
         self._log(f"\n[Analyze] URL: {url}\n")
         self.status_var.set("Đang phân tích URL…")
         self.progress.set(0.1)
         self.download_btn.configure(state="disabled")
         self.copy_link_btn.configure(state="disabled")
+        self._set_results([])
 
         # Show domain
         domain = detect_domain(url)
         if domain:
             self.domain_label.configure(text=f"Nền tảng: {domain}")
 
-        ydl_opts = {
-            "skip_download": True,
-            "quiet": True,
-            "nocheckcertificate": True,
-            "cachedir": False,
-            "extract_flat": False,
-        }
+        # Cùng URL đã được phân tích sớm (xong hoặc đang chạy) -> dùng chung, không extract lại
+        fut = self.extract_cache.get(url)
+        if fut.done():
+            self._log("[Analyze] Dùng kết quả đã phân tích sớm.\n")
+        elif self.extractors is None and "yt_dlp" not in sys.modules:
+            self.status_var.set("Đang nạp yt-dlp (lần đầu)…")
 
         try:
-            with ytdlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+            result = fut.result()
+            info, thumb = result["info"], result["thumb"]
         except Exception as e:
             self.status_var.set("Phân tích thất bại.")
             self._log(f"[Error] {e}\n")
             messagebox.showerror("Lỗi phân tích", f"Không thể trích xuất thông tin.\n\n{e}")
             return
 
-        # Handle playlist vs single video/post
+        info = first_entry(info)
         if info is None:
             self.status_var.set("Không tìm thấy thông tin.")
-            self._log("[Warn] info = None\n")
+            self._log("[Warn] info = None / danh sách trống\n")
             return
+        self._show_info(url, info, thumb)
+        self._log("[Info] Đã trích xuất thông tin & định dạng.\n")
 
-        if info.get("_type") == "playlist":
-            # Pick first entry for simplicity
-            entries = info.get("entries") or []
-            if not entries:
-                self.status_var.set("Danh sách trống.")
-                return
-            info = entries[0]
+    def _analyze_many(self, urls):
+        """Phân tích song song (tối đa ANALYZE_PARALLEL cùng lúc), link nào xong trước hiện trước."""
+        n = len(urls)
+        self._log(f"\n[Analyze] {n} URL, song song tối đa {ANALYZE_PARALLEL}\n")
+        self.status_var.set(f"Đang phân tích {n} URL…")
+        self.progress.set(0.0)
+        self.download_btn.configure(state="disabled")
+        self.copy_link_btn.configure(state="disabled")
+        self._set_results([])
+
+        futures = {self.extract_cache.get(u): u for u in urls}
+        done = failed = 0
+        for fut in as_completed(futures):
+            url = futures[fut]
+            done += 1
+            try:
+                result = fut.result()
+                info = first_entry(result["info"])
+                if info is None:
+                    raise ValueError("không tìm thấy thông tin")
+            except Exception as e:
+                failed += 1
+                self._log(f"[Error] {url}: {e}\n")
+            else:
+                title = info.get("title") or url
+                label = f"{len(self.results) + 1}. {title[:60]}"
+                self.results[label] = (url, info, result["thumb"])
+                self._set_results(list(self.results))
+                self._log(f"[Analyze] {done}/{n} {title}\n")
+                if len(self.results) == 1:
+                    self.result_var.set(label)
+                    self._show_info(url, info, result["thumb"])
+            self.progress.set(done / n)
+            self.status_var.set(f"Đã phân tích {done}/{n} URL" + (f" · {failed} lỗi" if failed else "") + "…")
+
+        if self.results:
+            self.status_var.set(f"Xong {len(self.results)}/{n} URL" + (f" ({failed} lỗi)" if failed else "")
+                                + ". Chọn kết quả + định dạng rồi bấm Tải về.")
+        else:
+            self.status_var.set("Phân tích thất bại.")
+            messagebox.showerror("Lỗi phân tích", f"Không trích xuất được URL nào trong {n} URL.")
+        self.progress.set(0.0)
+
+    def _set_results(self, labels):
+        if not labels:
+            self.results.clear()
+            self.result_row.pack_forget()
+            return
+        self.result_menu.configure(values=labels)
+        if not self.result_row.winfo_ismapped():
+            self.result_row.pack(fill="x", padx=12, pady=(10, 0), before=self.title_label)
+
+    def _on_result_selected(self, label: str):
+        if label in self.results:
+            self._show_info(*self.results[label])
 
+    def _show_info(self, url, info, thumb):
+        """Hiện tiêu đề/thumbnail/định dạng của MỘT kết quả; Tải về dùng URL của kết quả này."""
+        self.current_url = url
         self.info_json = info
         title = info.get("title") or "Không tiêu đề"
         uploader = info.get("uploader") or info.get("uploader_id") or info.get("channel") or ""
@@ -330,14 +548,13 @@ class ToolHubApp(ctk.CTk):
         if webpage_url: meta_bits.append(f"URL nguồn: {webpage_url}")
         self.meta_var.set("   ·   ".join(meta_bits))
 
-        # Thumbnail preview (optional)
-        if PIL_AVAILABLE:
-            thumb_url = (info.get("thumbnail") or (info.get("thumbnails") or [{}])[-1].get("url"))
-            if thumb_url:
+        # Thumbnail preview (optional) — bytes đã tải sẵn trong extract_media
+        preview = load_preview_deps()
+        if preview:
+            Image, _ = preview
+            if thumb:
                 try:
-                    resp = requests.get(thumb_url, timeout=10)
-                    resp.raise_for_status()
-                    image = Image.open(io.BytesIO(resp.content))
+                    image = Image.open(io.BytesIO(thumb))
                     # Resize to fit
                     image.thumbnail((420, 420))
                     cimg = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
@@ -406,8 +623,6 @@ class ToolHubApp(ctk.CTk):
         self.status_var.set("Phân tích xong. Chọn định dạng rồi bấm Tải về.")
         self.progress.set(0.0)
 
-        self._log("[Info] Đã trích xuất thông tin & định dạng.\n")
-
     # ---------------------------- Download ----------------------------
 
     def _download_threaded(self):
@@ -448,7 +663,7 @@ class ToolHubApp(ctk.CTk):
             messagebox.showwarning("Chưa phân tích", "Hãy bấm Phân tích trước khi tải.")
             return
 
-        url = self.url_var.get().strip()
+        url = self.current_url or self.url_var.get().strip()
         dstdir = self.dir_var.get().strip() or default_download_dir()
         os.makedirs(dstdir, exist_ok=True)
 
@@ -481,7 +696,7 @@ class ToolHubApp(ctk.CTk):
         }
 
         try:
-            with ytdlp.YoutubeDL(ydl_opts) as ydl:
+            with load_ytdlp().YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
             self.status_var.set("Tải xong ✔")
             self._log("[Done] Tải xong.\n")
@@ -528,10 +743,63 @@ class ToolHubApp(ctk.CTk):
         self._log("[Info] Đã copy link trực tiếp vào clipboard.\n")
         self.status_var.set("Đã copy link trực tiếp vào clipboard.")
 
+# ---------------------------- Startup profile ----------------------------
+
+def _report_window_shown(app):
+    """--profile-child: in thời gian tới lúc cửa sổ map xong rồi thoát."""
+    def on_map(event):
+        if event.widget is app:
+            app.unbind("<Map>")
+            # after_idle: đợi lượt vẽ đầu tiên xử lý xong
+            app.after_idle(lambda: (print(f"@@window_ms {(time.perf_counter() - _T0) * 1000:.1f}", flush=True),
+                                    app.destroy()))
+    app.bind("<Map>", on_map)
+
+def profile_startup(top: int = 20):
+    """
+    Chạy lại chính file này với `python -X importtime` và in:
+    - thời gian tới lúc cửa sổ hiện
+    - các package top-level tốn thời gian import nhất (cumulative)
+    """
+    import subprocess
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--profile-child"],
+        capture_output=True, text=True,
+    )
+    totals = {}
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package" — module con thụt thêm 2 space
+        m = re.match(r"import time:\s*\d+\s*\|\s*(\d+)\s*\| (\s*)(\S+)", line)
+        if not m or m.group(2):  # module con đã nằm trong cumulative của module cha
+            continue
+        pkg = m.group(3).split(".")[0]
+        totals[pkg] = totals.get(pkg, 0) + int(m.group(1))
+
+    window = re.search(r"@@window_ms ([\d.]+)", proc.stdout)
+    print(f"{APP_NAME} {VERSION} — startup profile")
+    print(f"  Cửa sổ hiện sau: {window.group(1) + ' ms' if window else '? (xem stderr)'}")
+    print(f"  Tổng import:     {sum(totals.values()) / 1000:.1f} ms\n")
+    print(f"  {'package':<28}{'ms':>10}")
+    for pkg, us in sorted(totals.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {pkg:<28}{us / 1000:>10.1f}")
+    if proc.returncode and not window:
+        print(proc.stderr[-2000:], file=sys.stderr)
+
 # ---------------------------- main ----------------------------
 
 def main():
-    app = ToolHubApp()
+    args = sys.argv[1:]
+    if "--profile-startup" in args:
+        profile_startup()
+        return
+    workers = ANALYZE_PARALLEL
+    if "--extract-workers" in args:
+        # 0 = extract_info ngay trong process GUI (như trước)
+        workers = int(args[args.index("--extract-workers") + 1])
+    app = ToolHubApp(prewarm="--no-prewarm" not in args and "--profile-child" not in args,
+                     speculative="--speculative" in args, extract_workers=workers)
+    if "--profile-child" in args:
+        _report_window_shown(app)
     app.mainloop()
 
 if __name__ == "__main__":
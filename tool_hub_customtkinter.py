@@ -46,6 +46,54 @@ TOOLS: List[Dict] = [
 
 CATEGORIES = ["All", "Media", "Design", "Developer", "Productivity", "Data", "Utility", "Security"]
 
+SEARCH_DEBOUNCE_MS = 120
+
+
+# ---------- Search index ----------
+class ToolIndex:
+    """
+    Prebuilt search index over the catalog.
+    - trigram -> tool ids, for queries of 3+ chars (candidates are then verified by substring)
+    - category -> tool ids
+    Results keep catalog order, same semantics as a plain substring filter.
+    """
+
+    def __init__(self, tools: List[Dict]):
+        self.tools = tools
+        self._haystacks = [
+            "\n".join((t["name"].lower(), t["desc"].lower(), t["category"].lower())) for t in tools
+        ]
+        self._trigrams: Dict[str, set] = {}
+        self._by_category: Dict[str, set] = {}
+        for i, hay in enumerate(self._haystacks):
+            for j in range(len(hay) - 2):
+                self._trigrams.setdefault(hay[j:j + 3], set()).add(i)
+            self._by_category.setdefault(tools[i]["category"], set()).add(i)
+
+    def _candidates(self, q: str) -> Optional[set]:
+        if len(q) < 3:
+            return None  # too short for trigrams: verify every tool (still cheap, haystacks are prebuilt)
+        grams = {q[j:j + 3] for j in range(len(q) - 2)}
+        sets = sorted((self._trigrams.get(g, set()) for g in grams), key=len)
+        out = set(sets[0])
+        for s in sets[1:]:
+            out &= s
+            if not out:
+                break
+        return out
+
+    def search(self, query: str, category: str = "All") -> List[Dict]:
+        q = query.lower().strip()
+        ids = self._candidates(q) if q else None
+        if category != "All":
+            cat_ids = self._by_category.get(category, set())
+            ids = cat_ids if ids is None else ids & cat_ids
+        if ids is None:
+            ids = range(len(self.tools))
+        if q:
+            ids = [i for i in ids if q in self._haystacks[i]]
+        return [self.tools[i] for i in sorted(ids)]
+
 
 # ---------- UI Components ----------
 class Sidebar(ctk.CTkFrame):
@@ -137,12 +185,20 @@ class TopBar(ctk.CTkFrame):
         self.search = ctk.CTkEntry(self, placeholder_text="Tìm kiếm công cụ… (gõ để lọc)")
         self.search.grid(row=0, column=0, padx=(16, 8), pady=12, sticky="we")
         self.search.bind("<KeyRelease>", self._on_key)
+        self._debounce_id: Optional[str] = None
 
         self.appearance = ctk.CTkOptionMenu(self, values=["System", "Light", "Dark"], command=self._on_appearance)
         self.appearance.set("System")
         self.appearance.grid(row=0, column=1, padx=(8, 16), pady=12)
 
     def _on_key(self, event=None):
+        # Debounce: only search once typing pauses
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+        self._debounce_id = self.after(SEARCH_DEBOUNCE_MS, self._fire_search)
+
+    def _fire_search(self):
+        self._debounce_id = None
         self.on_search(self.search.get().strip())
 
     @staticmethod
@@ -167,24 +223,41 @@ class CardGrid(ctk.CTkScrollableFrame):
         super().__init__(master, corner_radius=0, fg_color=("white", "#0f0f0f"))
         # 3 responsive columns
         self.grid_columnconfigure((0, 1, 2), weight=1, uniform="cards")
+        self.max_cols = 3
+        self.cards: Dict[str, ToolCard] = {}          # name -> card, created once and reused
+        self._positions: Dict[str, tuple] = {}        # name -> (row, col) currently shown
+        self._empty = ctk.CTkLabel(self, text="Không có công cụ nào khớp bộ lọc.", text_color=("gray40", "gray60"))
 
     def clear(self):
-        for child in list(self.children.values()):
-            child.destroy()
+        for card in self.cards.values():
+            card.destroy()
+        self.cards.clear()
+        self._positions.clear()
 
     def render(self, items: List[Dict], on_open: Callable[[str], None]):
-        self.clear()
-        if not items:
-            ctk.CTkLabel(self, text="Không có công cụ nào khớp bộ lọc.", text_color=("gray40", "gray60")).grid(
-                row=0, column=0, padx=24, pady=24, sticky="w"
-            )
-            return
-
-        max_cols = 3
+        """Diff-based: only hide, show or move cards whose slot changed."""
+        wanted: Dict[str, tuple] = {}
         for idx, tool in enumerate(items):
-            r, c = divmod(idx, max_cols)
-            card = ToolCard(self, tool["name"], tool["desc"], tool["category"], on_open=on_open)
-            card.grid(row=r, column=c, padx=12, pady=12, sticky="nsew")
+            wanted[tool["name"]] = divmod(idx, self.max_cols)
+
+        for name in self._positions.keys() - wanted.keys():
+            self.cards[name].grid_remove()
+
+        for tool in items:
+            name = tool["name"]
+            pos = wanted[name]
+            if self._positions.get(name) == pos:
+                continue
+            card = self.cards.get(name)
+            if card is None:
+                card = self.cards[name] = ToolCard(self, name, tool["desc"], tool["category"], on_open=on_open)
+            card.grid(row=pos[0], column=pos[1], padx=12, pady=12, sticky="nsew")
+
+        self._positions = wanted
+        if items:
+            self._empty.grid_remove()
+        else:
+            self._empty.grid(row=0, column=0, padx=24, pady=24, sticky="w")
 
 
 class App(ctk.CTk):
@@ -220,6 +293,7 @@ class App(ctk.CTk):
 
         # Initial render
         self.all_tools = TOOLS[:]  # copy
+        self.index = ToolIndex(self.all_tools)
         self.current_query = ""
         self.current_category = "All"
         self._apply_filters_and_render()
@@ -245,17 +319,7 @@ class App(ctk.CTk):
         self._apply_filters_and_render()
 
     def _apply_filters_and_render(self):
-        q = self.current_query.lower().strip()
-        cat = self.current_category
-
-        def include(tool: Dict) -> bool:
-            if cat != "All" and tool["category"] != cat:
-                return False
-            if q and (q not in tool["name"].lower() and q not in tool["desc"].lower() and q not in tool["category"].lower()):
-                return False
-            return True
-
-        filtered = [t for t in self.all_tools if include(t)]
+        filtered = self.index.search(self.current_query, self.current_category)
         self.card_grid.render(filtered, on_open=self.open_tool)
 
     # ----- Actions -----
@@ -16,7 +16,12 @@ try:
 except ImportError:
     raise SystemExit("Missing dependency: customtkinter. Run: pip install customtkinter pillow")
 
-from PIL import Image, ImageDraw, ImageFont, ImageTk
+from PIL import Image, ImageTk
+
+from placeholder_thumbs import render_placeholder
+from extract_cache import ExtractionCache, canonical_url
+
+SPECULATE_DEBOUNCE_MS = 600  # typed URLs: wait for a pause before analyzing ahead
 
 
 # --------------------------- Mock Data Models ---------------------------
@@ -35,8 +40,8 @@ class MediaResult:
     title: str
     author: str
     original_url: str
-    thumb_img: Image.Image
     options: List[MediaOption] = field(default_factory=list)
+    thumb_img: Optional[Image.Image] = None  # rendered off the UI thread, see App._fetch_with_thumb
 
 
 # --------------------------- Utilities ---------------------------
@@ -67,55 +72,8 @@ def _rand_size() -> str:
     size_mb = random.choice([6, 12, 18, 24, 36, 48, 64, 80, 96, 120])
     return f"{size_mb} MB"
 
-def _rand_duration() -> str:
-    s = random.randint(7, 240)
-    m, s = divmod(s, 60)
-    return f"{m:02d}:{s:02d}"
-
-def _palette_for(platform: str):
-    palettes = {
-        "TikTok": (25, 25, 25),
-        "Douyin": (18, 20, 35),
-        "Facebook": (24, 119, 242),
-        "Instagram": (131, 58, 180),
-        "X (Twitter)": (0, 0, 0),
-        "YouTube": (204, 0, 0),
-        "Pinterest": (189, 8, 28),
-        "Reddit": (255, 69, 0),
-        "Unknown": (64, 64, 64),
-    }
-    return palettes.get(platform, palettes["Unknown"])
-
-def make_placeholder_thumbnail(platform: str, title: str, size=(320, 180)) -> Image.Image:
-    bg = _palette_for(platform)
-    img = Image.new("RGB", size, color=bg)
-    draw = ImageDraw.Draw(img)
-
-    # Draw a subtle diagonal overlay
-    draw.polygon([(0, size[1]), (size[0], 0), (size[0], size[1])], outline=None, fill=(255, 255, 255, 16))
-
-    # Use default PIL font; avoid external dependencies
-    font1 = ImageFont.load_default()
-    font2 = ImageFont.load_default()
-
-    # Platform text
-    platform_text = platform.upper()
-    tw, th = draw.textsize(platform_text, font=font1)
-    draw.text(((size[0] - tw) / 2, 16), platform_text, fill="white", font=font1)
-
-    # Title text (wrapped roughly)
-    wrapped = _shorten(title, 40)
-    tw2, th2 = draw.textsize(wrapped, font=font2)
-    draw.text(((size[0] - tw2) / 2, size[1] // 2 - th2 // 2), wrapped, fill="white", font=font2)
-
-    # Duration pill
-    dur = _rand_duration()
-    pill_w, pill_h = 48, 18
-    x, y = size[0] - pill_w - 8, size[1] - pill_h - 8
-    draw.rounded_rectangle([x, y, x + pill_w, y + pill_h], radius=9, fill=(0, 0, 0))
-    draw.text((x + 8, y + 3), dur, fill="white", font=font2)
-
-    return img
+def _current_theme() -> str:
+    return "dark" if ctk.get_appearance_mode() == "Dark" else "light"
 
 def mock_fetch_media(url: str) -> MediaResult:
     platform = detect_platform(url) or "Unknown"
@@ -133,8 +91,6 @@ def mock_fetch_media(url: str) -> MediaResult:
     title = f"{base_title} · {_dt.datetime.now().strftime('%b %d')}"
     author = random.choice(["@alex", "@linh", "@minh", "@truong", "@hannah", "@kyle"])
 
-    thumb = make_placeholder_thumbnail(platform, title)
-
     # Build fake options
     options: List[MediaOption] = []
     if platform in ("TikTok", "Douyin", "Facebook", "Instagram", "X (Twitter)", "YouTube", "Reddit"):
@@ -174,7 +130,7 @@ def mock_fetch_media(url: str) -> MediaResult:
             )
         )
 
-    return MediaResult(platform=platform, title=title, author=author, original_url=url, thumb_img=thumb, options=options)
+    return MediaResult(platform=platform, title=title, author=author, original_url=url, options=options)
 
 
 # --------------------------- GUI Components ---------------------------
@@ -287,9 +243,11 @@ class Sidebar(ctk.CTkFrame):
 
 
 class Topbar(ctk.CTkFrame):
-    def __init__(self, master, on_analyze, on_settings):
+    def __init__(self, master, on_analyze, on_settings, on_speculate=None):
         super().__init__(master, corner_radius=0, height=56)
         self.grid_columnconfigure(2, weight=1)
+        self.on_speculate = on_speculate
+        self._speculate_after = None
 
         self.logo = ctk.CTkLabel(self, text="ToolHub Downloader", font=ctk.CTkFont(size=18, weight="bold"))
         self.logo.grid(row=0, column=0, padx=16, pady=12, sticky="w")
@@ -297,6 +255,7 @@ class Topbar(ctk.CTkFrame):
         self.url_entry = ctk.CTkEntry(self, placeholder_text="Paste any social media URL…", width=640)
         self.url_entry.grid(row=0, column=1, padx=8, pady=10, sticky="ew")
         self.url_entry.bind("<Return>", lambda e: on_analyze(self.url_entry.get()))
+        self.url_entry.bind("<KeyRelease>", self._on_typed, add="+")
 
         self.paste_btn = ctk.CTkButton(self, text="Paste", width=80, command=self._paste)
         self.paste_btn.grid(row=0, column=2, padx=(8, 4), pady=10, sticky="e")
@@ -313,14 +272,28 @@ class Topbar(ctk.CTkFrame):
             self.url_entry.delete(0, "end")
             self.url_entry.insert(0, txt)
         except tk.TclError:
-            pass
+            return
+        # A pasted link is complete - no need to wait for the debounce
+        self._speculate()
+
+    def _on_typed(self, event=None):
+        if self.on_speculate is None or (event is not None and event.keysym == "Return"):
+            return
+        if self._speculate_after is not None:
+            self.after_cancel(self._speculate_after)
+        self._speculate_after = self.after(SPECULATE_DEBOUNCE_MS, self._speculate)
+
+    def _speculate(self):
+        self._speculate_after = None
+        if self.on_speculate is not None:
+            self.on_speculate(self.url_entry.get())
 
 
 class SettingsDialog(ctk.CTkToplevel):
     def __init__(self, master):
         super().__init__(master)
         self.title("Settings")
-        self.geometry("380x200")
+        self.geometry("380x300")
         ctk.CTkLabel(self, text="Appearance", font=ctk.CTkFont(size=14, weight="bold")).pack(padx=16, pady=(16, 8), anchor="w")
 
         self.appearance_option = ctk.CTkOptionMenu(self, values=["System", "Light", "Dark"], command=self._change_appearance)
@@ -332,6 +305,10 @@ class SettingsDialog(ctk.CTkToplevel):
         self.scale_option.set("100%")
         self.scale_option.pack(padx=16, pady=8, anchor="w")
 
+        ctk.CTkLabel(self, text="Analysis", font=ctk.CTkFont(size=14, weight="bold")).pack(padx=16, pady=(16, 8), anchor="w")
+        ctk.CTkSwitch(self, text="Analyze links as soon as they are pasted",
+                      variable=master.speculative_var).pack(padx=16, pady=8, anchor="w")
+
     def _change_appearance(self, value):
         ctk.set_appearance_mode(value.lower())
 
@@ -350,12 +327,17 @@ class App(ctk.CTk):
         ctk.set_appearance_mode("system")
         ctk.set_default_color_theme("blue")
 
+        # Speculative analysis (opt-in, Settings): results land in extract_cache keyed by canonical URL
+        self.speculative_var = tk.BooleanVar(value=False)
+        self.extract_cache = ExtractionCache(self._fetch_with_thumb)
+
         # Layout: sidebar | main
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(2, weight=1)
 
         # Top bar
-        self.topbar = Topbar(self, on_analyze=self.on_analyze, on_settings=self.open_settings)
+        self.topbar = Topbar(self, on_analyze=self.on_analyze, on_settings=self.open_settings,
+                             on_speculate=self.on_speculate)
         self.topbar.grid(row=0, column=0, columnspan=2, sticky="nsew")
 
         # Separator
@@ -398,9 +380,31 @@ class App(ctk.CTk):
         self.status.configure(text=f"Detected: {platform}")
         self.sidebar.add_history(url, platform)
 
-        # Fetch mock data and render card
+        # Reuses a speculative fetch of the same link (done or in flight); card added when ready
+        future = self.extract_cache.get(canonical_url(url) or url)
+
+        def poll():
+            if not future.done():
+                self.after(15, poll)
+                return
+            try:
+                self._add_result_card(future.result())
+            except Exception as e:
+                Toast(self, f"Analyze failed: {e}")
+        poll()
+
+    def on_speculate(self, url: str):
+        if not self.speculative_var.get():
+            return
+        key = canonical_url(url)
+        if key:
+            self.extract_cache.speculate(key)
+
+    def _fetch_with_thumb(self, url: str) -> MediaResult:
+        # Runs on an extract_cache worker: fetch + thumbnail, so the card can be built instantly
         result = mock_fetch_media(url)
-        self._add_result_card(result)
+        result.thumb_img = render_placeholder(result.platform, result.title, (320, 180), _current_theme())
+        return result
 
     def on_filter_platform(self, name: str):
         self.filter_platform = name